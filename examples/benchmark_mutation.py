@@ -0,0 +1,65 @@
+"""
+Mutation operator benchmark: evaluations needed to reach a target fidelity
+
+Compares DEAP's mutFlipBit with the categorical gate mutation on a few
+benchmark problems, using the DEAP-based EAOptimizer.
+
+Run with: python -m examples.benchmark_mutation
+"""
+
+import argparse
+
+import numpy as np
+
+from quantum_ea.fitness import clear_fitness_cache
+from quantum_ea.operators import MUTATION_OPERATORS
+from quantum_ea.optimizers import EAOptimizer
+from quantum_ea.problems.definitions import bernstein_vazirani_problem, deutsch_jozsa_problem, grover_problem
+
+
+def evaluations_to_target(fitness_history: list[float], population_size: int, target: float) -> int | None:
+    """Evaluations spent when the population max first reaches target, or None."""
+    for generation, best in enumerate(fitness_history):
+        if best >= target:
+            return (generation + 1) * population_size
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark EA mutation operators")
+    parser.add_argument("--qubits", type=int, default=3)
+    parser.add_argument("--budget", type=int, default=5000)
+    parser.add_argument("--population", type=int, default=50)
+    parser.add_argument("--trials", type=int, default=10)
+    parser.add_argument("--target", type=float, default=0.99)
+    args = parser.parse_args()
+
+    problems = [
+        grover_problem(args.qubits),
+        deutsch_jozsa_problem(args.qubits),
+        bernstein_vazirani_problem(args.qubits),
+    ]
+
+    print(f"{'Problem':<20} {'Mutation':<12} {'Solved':>8} {'Median evals':>14} {'Mean evals*':>12}")
+    for problem in problems:
+        for mutation in reversed(MUTATION_OPERATORS):
+            evals = []
+            for trial in range(args.trials):
+                clear_fitness_cache()
+                optimizer = EAOptimizer(population_size=args.population, mutation=mutation)
+                result = optimizer.optimize(
+                    problem.input_set, problem.target_set, problem.num_qubits,
+                    problem.recommended_time_steps, args.budget, seed=trial,
+                )
+                evals.append(evaluations_to_target(result.fitness_history, args.population, args.target))
+
+            solved = [e for e in evals if e is not None]
+            median = f"{np.median(solved):.0f}" if solved else "-"
+            # Unsolved trials count as the full budget
+            mean = np.mean([args.budget if e is None else e for e in evals])
+            print(f"{problem.name:<20} {mutation:<12} {len(solved):>4}/{args.trials:<3} {median:>14} {mean:>12.0f}")
+    print("* unsolved trials count as the full budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -21,7 +21,7 @@ from quantum_ea.optimizers import (
     MAPElitesOptimizer,
 )
 from quantum_ea.optimizers.dl_optimizer import _TORCH_AVAILABLE
-from quantum_ea.fitness import clear_fitness_cache
+from quantum_ea.fitness import FITNESS_MODES, clear_fitness_cache
 from quantum_ea.problems.definitions import all_problems
 from quantum_ea.study.config import StudyConfig
 from quantum_ea.study.runner import ExperimentRunner
@@ -124,6 +124,15 @@ def _run_qd_detail(
 def main():
     parser = argparse.ArgumentParser(description="Quality-Diversity Quantum Circuit Optimization Study")
     parser.add_argument("--full", action="store_true", help="Run full study (2-5 qubits, 25000 budget, 20 trials)")
+    parser.add_argument(
+        "--persistent-cache", action="store_true",
+        help="Reuse simulated circuits across trials and reruns via study_results/fitness_cache.sqlite",
+    )
+    parser.add_argument("--workers", type=int, default=1, help="Number of worker processes for independent trials")
+    parser.add_argument(
+        "--fitness-mode", choices=FITNESS_MODES, default="first",
+        help="'mean' scores circuits on every input row of the flip/inverse/fourier training sets",
+    )
     args = parser.parse_args()
 
     if args.full:
@@ -149,6 +158,9 @@ def main():
         num_trials=num_trials,
         optimizers=optimizers,
         qubit_counts=qubit_counts,
+        num_workers=args.workers,
+        fitness_mode=args.fitness_mode,
+        fitness_cache_path="study_results/fitness_cache.sqlite" if args.persistent_cache else None,
     )
 
     runner = ExperimentRunner(config)
@@ -0,0 +1,130 @@
+"""Torch statevector simulator for batches of gate arrays.
+
+Mirrors quantum_ea.circuit (same gate set, LSB = qubit 0) on CPU tensors so
+that torch-based optimizers can sample, canonicalise and score circuits
+without converting to NumPy. Every (time step, qubit) slot is applied to
+the whole batch with a handful of tensor kernels, whatever mix of gates
+the batch holds there, so torch's intra-op threads do the work.
+"""
+import numpy as np
+from numpy import ndarray
+
+from quantum_ea.circuit import _H2, _T2, initialise_statevector, initialise_statevectors
+from quantum_ea.fitness import resolve_fitness_mode
+from quantum_ea.gates import GateType, cnot_two_gate_operation_batch, remove_redundant_gate_series_batch
+
+_TORCH_AVAILABLE = False
+try:
+    import torch
+    _TORCH_AVAILABLE = True
+except ImportError:
+    pass
+
+
+def _require_torch() -> None:
+    if not _TORCH_AVAILABLE:
+        raise ImportError("torch is required for quantum_ea.circuit_torch")
+
+
+def _apply_single_qubit_rows(
+    sv: "torch.Tensor", rows: "torch.Tensor", gate_2x2: "torch.Tensor", qubit_index: int,
+) -> None:
+    """Apply a 2x2 gate on qubit_index, in place, to the circuits listed in rows."""
+    subset = sv.index_select(0, rows)
+    view = subset.reshape((len(rows), -1, 2, 2 ** qubit_index))
+    zero, one = view[:, :, 0], view[:, :, 1]
+    if gate_2x2[0, 1] == 0 and gate_2x2[1, 0] == 0:
+        updated = torch.stack([zero, gate_2x2[1, 1] * one], dim=2)
+    else:
+        updated = torch.stack([
+            gate_2x2[0, 0] * zero + gate_2x2[0, 1] * one,
+            gate_2x2[1, 0] * zero + gate_2x2[1, 1] * one,
+        ], dim=2)
+    sv.index_copy_(0, rows, updated.reshape(subset.shape))
+
+
+def preprocess_gates_torch(gate_arrays: "torch.Tensor") -> "torch.Tensor":
+    """Canonicalise a (P, T, Q) integer tensor exactly like preprocess_gates_batch."""
+    _require_torch()
+    return remove_redundant_gate_series_batch(cnot_two_gate_operation_batch(gate_arrays.clone()))
+
+
+def _cnot_permutations(num_qubits: int, qubit_index: int) -> "torch.Tensor":
+    """(5, 2^n) source-index table: CNOT_DOWN/CNOT_UP rows permute, all others are identity."""
+    indices = np.arange(2 ** num_qubits)
+    perms = np.tile(indices, (len(GateType), 1))
+    if qubit_index + 1 < num_qubits:
+        control = (indices >> qubit_index) & 1
+        perms[GateType.CNOT_DOWN] = indices ^ (control << (qubit_index + 1))
+    if qubit_index > 0:
+        control = (indices >> (qubit_index - 1)) & 1
+        perms[GateType.CNOT_UP] = indices ^ (control << qubit_index)
+    return torch.as_tensor(perms)
+
+
+def apply_quantum_gates_torch(
+    statevectors: "torch.Tensor", num_qubits: int, gate_arrays: "torch.Tensor",
+) -> "torch.Tensor":
+    """Advance a (P, ..., 2^n) complex tensor through P gate arrays of shape (P, T, Q).
+
+    Equivalent to apply_quantum_gates_batch. For each slot the per-circuit
+    circuits holding T or H are updated elementwise on their amplitude
+    pairs, and both CNOT directions are applied in one gather with a
+    per-circuit permutation of the amplitudes.
+    """
+    _require_torch()
+    sv = statevectors.clone()
+    num_circuits, time_steps, row_length = gate_arrays.shape
+    singles = {
+        GateType.T_GATE: torch.as_tensor(_T2, dtype=sv.dtype),
+        GateType.HADAMARD: torch.as_tensor(_H2, dtype=sv.dtype),
+    }
+    permutations = [_cnot_permutations(num_qubits, qubit_index) for qubit_index in range(row_length)]
+    gate_arrays = gate_arrays.long()
+    for t in range(time_steps):
+        for qubit_index in range(row_length):
+            column = gate_arrays[:, t, qubit_index]
+            for gate_type, gate_2x2 in ((GateType.T_GATE, _T2), (GateType.HADAMARD, _H2)):
+                rows = torch.nonzero(column == gate_type).flatten()
+                if len(rows):
+                    _apply_single_qubit_rows(sv, rows, singles[gate_type], qubit_index)
+            cnot = (column == GateType.CNOT_DOWN) | (column == GateType.CNOT_UP)
+            rows = torch.nonzero(cnot).flatten()
+            if len(rows):
+                source = permutations[qubit_index][column[rows]]
+                source = source.reshape((len(rows),) + (1,) * (sv.dim() - 2) + (-1,))
+                source = source.expand((len(rows),) + sv.shape[1:])
+                sv.index_copy_(0, rows, torch.gather(sv.index_select(0, rows), -1, source))
+    return sv
+
+
+def evaluate_population_torch(
+    input_set: ndarray,
+    target_set: ndarray,
+    num_qubits: int,
+    gate_arrays: "torch.Tensor",
+    fitness_mode: str | None = None,
+) -> "torch.Tensor":
+    """Score a (P, T, Q) tensor of canonical gate arrays; matches evaluate_population.
+
+    The fitness cache is not consulted: the batch never leaves torch.
+    """
+    _require_torch()
+    fitness_mode = resolve_fitness_mode(fitness_mode)
+    num_circuits = gate_arrays.shape[0]
+    if fitness_mode == "mean":
+        sv = torch.as_tensor(initialise_statevectors(input_set, num_qubits))
+        sv = sv.unsqueeze(0).expand((num_circuits,) + sv.shape)
+        marked = torch.as_tensor(np.argmax(target_set, axis=1))
+        sv = apply_quantum_gates_torch(sv, num_qubits, gate_arrays)
+        scores = sv[:, torch.arange(len(marked)), marked].abs().pow(2).mean(dim=1)
+    else:
+        sv = torch.as_tensor(initialise_statevector(input_set[0, :], num_qubits))
+        sv = sv.unsqueeze(0).expand(num_circuits, -1)
+        sv = apply_quantum_gates_torch(sv, num_qubits, gate_arrays)
+        scores = sv[:, int(np.argmax(target_set[0]))].abs().pow(2)
+
+    num_blank_rows = (gate_arrays.sum(dim=2) == 0).sum(dim=1).to(scores.dtype)
+    penalised = (scores > 0.99) & (num_blank_rows > 0)
+    scores = torch.where(penalised, scores / (1.0 + num_blank_rows * 0.1), scores)
+    return torch.nan_to_num(scores, nan=0.0)
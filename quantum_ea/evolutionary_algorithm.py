@@ -8,7 +8,9 @@ from numpy import ndarray
 from quantum_ea.config import EAConfig
 from quantum_ea.gates import preprocess_gates
 from quantum_ea.fitness import run_quantum_algorithm_over_set
+from quantum_ea.operators import MUTATION_OPERATORS, register_mutation
 from quantum_ea.visualization import output_quantum_gates
+from quantum_ea.optimizers.evaluation import EvaluationBackend, GateArrayEvaluator
 
 if not hasattr(creator, "FitnessMax"):
     creator.create("FitnessMax", base.Fitness, weights=(1.0,))
@@ -28,9 +30,21 @@ def default_evaluate(individual: List[int], input_set: ndarray, target_set: ndar
 class EvolutionaryAlgorithm:
     config: EAConfig
 
-    def __init__(self, config: EAConfig, evaluate_fn: Optional[Callable] = None):
+    def __init__(
+        self,
+        config: EAConfig,
+        evaluate_fn: Optional[Callable] = None,
+        evaluation_backend: str = "builtin",
+        num_workers: Optional[int] = None,
+        mutation: str = "categorical",
+    ):
+        if mutation not in MUTATION_OPERATORS:
+            raise ValueError(f"Unknown mutation operator: {mutation!r}")
         self.config = config
         self.evaluate_fn = evaluate_fn
+        self.evaluation_backend = evaluation_backend
+        self.num_workers = num_workers
+        self.mutation = mutation
 
     def evolve_algorithm(self, input_set: ndarray, target_set: ndarray, num_qubits: int) -> tuple[ndarray, float]:
         toolbox = base.Toolbox()
@@ -47,15 +61,14 @@ class EvolutionaryAlgorithm:
 
         toolbox.register("population", tools.initRepeat, list, toolbox.individual)
 
-        evaluate = self.evaluate_fn if self.evaluate_fn is not None else default_evaluate
-        toolbox.register(
-            "evaluate", evaluate, input_set=input_set, target_set=target_set, num_qubits=num_qubits)
+        if self.evaluate_fn is None and self.evaluation_backend == "batched":
+            toolbox.register("evaluate", GateArrayEvaluator(input_set, target_set, num_qubits))
+        else:
+            evaluate = self.evaluate_fn if self.evaluate_fn is not None else default_evaluate
+            toolbox.register(
+                "evaluate", evaluate, input_set=input_set, target_set=target_set, num_qubits=num_qubits)
         toolbox.register("mate", tools.cxTwoPoint)
-        toolbox.register(
-            "mutate",
-            tools.mutFlipBit,
-            indpb=self.config.individual_swap_probability
-        )
+        register_mutation(toolbox, self.mutation, self.config.individual_swap_probability)
         toolbox.register(
             "select",
             tools.selTournament,
@@ -70,15 +83,17 @@ class EvolutionaryAlgorithm:
         stats.register("min", np.min)
         stats.register("max", np.max)
 
-        algorithms.eaSimple(
-            pop,
-            toolbox,
-            cxpb=self.config.breeding_probability,
-            mutpb=self.config.mutation_probability,
-            ngen=self.config.generations,
-            stats=stats,
-            halloffame=hof,
-            verbose=True)
+        with EvaluationBackend(self.evaluation_backend, self.num_workers) as backend:
+            toolbox.register("map", backend.map)
+            algorithms.eaSimple(
+                pop,
+                toolbox,
+                cxpb=self.config.breeding_probability,
+                mutpb=self.config.mutation_probability,
+                ngen=self.config.generations,
+                stats=stats,
+                halloffame=hof,
+                verbose=True)
 
         best_gates = dna_to_gates(list(hof[0]), num_qubits)
 
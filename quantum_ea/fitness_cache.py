@@ -0,0 +1,241 @@
+import hashlib
+import sqlite3
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Tuple
+
+from numpy import ndarray
+
+from quantum_ea.gates import canonical_digest, canonicalise_gates
+
+# Number of recent (input_set, target_set) pairs whose fingerprints are memoised
+_PROBLEM_KEY_SLOTS = 16
+
+
+def _digest(*arrays: ndarray, person: bytes = b"") -> bytes:
+    """Return an 8-byte digest of the arrays' shapes, dtypes and contents."""
+    h = hashlib.blake2b(digest_size=8, person=person)
+    for arr in arrays:
+        h.update(str((arr.shape, arr.dtype.str)).encode())
+        h.update(arr.tobytes())
+    return h.digest()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    disk_hits: int = 0
+    entries: int = 0
+    approx_bytes: int = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+
+class FitnessCache:
+    """Bounded LRU cache of fitness tuples keyed by problem and gate array.
+
+    Keys are 16 bytes: an 8-byte fingerprint of the problem (input and target
+    sets), computed once per problem object, followed by the 8-byte digest
+    of the gate array's canonical form, so gate arrays that differ only in
+    blank rows or in the order of gates on disjoint qubits share an entry.
+    Values are therefore the unpenalised marked-state probability; callers
+    apply the blank-row penalty of their own gate array. Entries beyond
+    max_entries, or beyond the approximate max_bytes footprint, are evicted
+    least-recently-used first.
+    """
+
+    def __init__(self, max_entries: int | None = 100_000, max_bytes: int | None = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[bytes, Tuple[float, ...]] = OrderedDict()
+        self._problem_keys: OrderedDict[tuple[int, int], tuple[ndarray, ndarray, bytes]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_hits = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: bytes) -> bool:
+        return key in self._entries
+
+    def problem_key(self, input_set: ndarray, target_set: ndarray) -> bytes:
+        """Return the problem fingerprint, hashing the arrays only on first sight."""
+        slot = (id(input_set), id(target_set))
+        with self._lock:
+            entry = self._problem_keys.get(slot)
+            # Holding the arrays keeps their ids from being reused while memoised
+            if entry is not None and entry[0] is input_set and entry[1] is target_set:
+                self._problem_keys.move_to_end(slot)
+                return entry[2]
+
+            fingerprint = _digest(input_set, target_set)
+            self._problem_keys[slot] = (input_set, target_set, fingerprint)
+            if len(self._problem_keys) > _PROBLEM_KEY_SLOTS:
+                self._problem_keys.popitem(last=False)
+            return fingerprint
+
+    def key(self, input_set: ndarray, target_set: ndarray, gate_array: ndarray, mode: str = "first") -> bytes:
+        """Return the 16-byte key; each fitness mode gets a separate key space."""
+        return self.canonical_key(input_set, target_set, canonicalise_gates(gate_array), mode=mode)
+
+    def canonical_key(self, input_set: ndarray, target_set: ndarray, canonical: ndarray, mode: str = "first") -> bytes:
+        """Like key() for a gate array already in canonicalise_gates form."""
+        return self.problem_key(input_set, target_set) + canonical_digest(canonical, person=mode.encode())
+
+    def get(self, key: bytes) -> Tuple[float, ...] | None:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: bytes, value: Tuple[float, ...]) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return
+            self._entries[key] = value
+            self._bytes += self._entry_bytes(key, value)
+            self._evict()
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._problem_keys.clear()
+            self._bytes = 0
+            self.reset_stats()
+
+    def flush(self) -> None:
+        """Write pending entries to backing storage; a no-op for in-memory caches."""
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_hits = 0
+
+    @property
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            disk_hits=self.disk_hits,
+            entries=len(self._entries),
+            approx_bytes=self._bytes,
+        )
+
+    @staticmethod
+    def _entry_bytes(key: bytes, value: Tuple[float, ...]) -> int:
+        return sys.getsizeof(key) + sys.getsizeof(value) + sum(sys.getsizeof(v) for v in value)
+
+    def _evict(self) -> None:
+        while self._entries and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            key, value = self._entries.popitem(last=False)
+            self._bytes -= self._entry_bytes(key, value)
+            self.evictions += 1
+
+
+class PersistentFitnessCache(FitnessCache):
+    """FitnessCache backed by an SQLite file shared across trials and runs.
+
+    The in-memory LRU acts as a front; misses fall through to the database,
+    and new entries are written back in batches of commit_interval. Keys are
+    content digests, so they are stable across processes and invocations.
+    clear() only drops the in-memory front and the counters; the file is
+    kept so later trials and reruns are served from disk.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int | None = 100_000,
+        max_bytes: int | None = None,
+        commit_interval: int = 1000,
+    ):
+        super().__init__(max_entries=max_entries, max_bytes=max_bytes)
+        self.path = path
+        self.commit_interval = commit_interval
+        self._pending: list[tuple[bytes, bytes]] = []
+        # Thread-pool evaluation shares the connection; access is serialised by _lock
+        self._db = sqlite3.connect(path, timeout=60.0, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS fitness (key BLOB PRIMARY KEY, value BLOB NOT NULL)")
+        self._db.commit()
+
+    def __contains__(self, key: bytes) -> bool:
+        if super().__contains__(key):
+            return True
+        with self._lock:
+            return self._db.execute("SELECT 1 FROM fitness WHERE key = ?", (key,)).fetchone() is not None
+
+    def get(self, key: bytes) -> Tuple[float, ...] | None:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return value
+
+            row = self._db.execute("SELECT value FROM fitness WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self.disk_hits += 1
+            value = tuple(array("d", row[0]))
+            super().put(key, value)
+            return value
+
+    def put(self, key: bytes, value: Tuple[float, ...]) -> None:
+        with self._lock:
+            if key not in self._entries:
+                self._pending.append((key, array("d", value).tobytes()))
+                if len(self._pending) >= self.commit_interval:
+                    self.flush()
+            super().put(key, value)
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._pending:
+                return
+            self._db.executemany("INSERT OR IGNORE INTO fitness (key, value) VALUES (?, ?)", self._pending)
+            self._db.commit()
+            self._pending.clear()
+
+    def clear(self) -> None:
+        """Drop the in-memory front and reset counters; persisted entries are kept."""
+        with self._lock:
+            self.flush()
+            super().clear()
+
+    def disk_entries(self) -> int:
+        self.flush()
+        return self._db.execute("SELECT COUNT(*) FROM fitness").fetchone()[0]
+
+    def close(self) -> None:
+        self.flush()
+        self._db.close()
@@ -1,3 +1,4 @@
+import hashlib
 from enum import IntEnum
 
 import numpy as np
@@ -60,3 +61,149 @@ def remove_redundant_gate(gate_array: ndarray, idx_1: int, idx_2: int, column_le
 def preprocess_gates(gate_array: ndarray) -> ndarray:
     processed = gate_array.copy()
     return remove_redundant_gate_series(cnot_two_gate_operation(processed))
+
+
+def cnot_two_gate_operation_batch(gate_arrays: ndarray) -> ndarray:
+    """Vectorised cnot_two_gate_operation over a (P, T, Q) population, in place.
+
+    The per-row scan runs left to right over qubit columns, each step
+    updating every row of every individual at once.
+    """
+    row_length = gate_arrays.shape[-1]
+    for i in range(row_length):
+        cnot_down = gate_arrays[..., i] == GateType.CNOT_DOWN
+        if i < row_length - 1:
+            gate_arrays[..., i + 1][cnot_down] = GateType.IDENTITY
+        else:
+            gate_arrays[..., i][cnot_down] = GateType.IDENTITY
+
+        cnot_up = gate_arrays[..., i] == GateType.CNOT_UP
+        if i > 0:
+            gate_arrays[..., i - 1][cnot_up] = GateType.CNOT_UP
+        gate_arrays[..., i][cnot_up] = GateType.IDENTITY
+    return gate_arrays
+
+
+def remove_redundant_gate_series_batch(gate_arrays: ndarray) -> ndarray:
+    """Vectorised remove_redundant_gate_series over a (P, T, Q) population, in place.
+
+    Columns are independent, so each time step is processed for all
+    qubits of all individuals at once.
+    """
+    col_length = gate_arrays.shape[1]
+    for k in range(col_length):
+        current = gate_arrays[:, k, :]
+        if k > 0:
+            previous = gate_arrays[:, k - 1, :]
+            redundant = (current >= GateType.HADAMARD) & (current == previous)
+            current[redundant] = GateType.IDENTITY
+            previous[redundant] = GateType.IDENTITY
+        if k < col_length - 1:
+            following = gate_arrays[:, k + 1, :]
+            redundant = (current >= GateType.HADAMARD) & (current == following)
+            current[redundant] = GateType.IDENTITY
+            following[redundant] = GateType.IDENTITY
+    return gate_arrays
+
+
+def preprocess_gates_batch(gate_arrays: ndarray) -> ndarray:
+    """Canonicalise a (P, T, Q) population; row p equals preprocess_gates(gate_arrays[p])."""
+    processed = np.array(gate_arrays, copy=True)
+    return remove_redundant_gate_series_batch(cnot_two_gate_operation_batch(processed))
+
+
+def canonicalise_gates(gate_array: ndarray) -> ndarray:
+    """Return the layered normal form of a (T, Q) gate array as a (L, Q) uint8 array.
+
+    Gates are taken in simulation order (row by row, qubit by qubit) and
+    each is placed in the earliest layer after every earlier gate sharing
+    a qubit with it. Gates on disjoint qubits commute, so circuits that
+    differ only in how such gates are ordered across rows, or in blank
+    rows, get the same normal form and the same unitary. Identities and
+    CNOTs the simulator skips are dropped.
+    """
+    gate_array = np.asarray(gate_array)
+    row_length = gate_array.shape[-1]
+    # (low, high) qubit span of each gate value per slot; None where the simulator skips it
+    spans = []
+    for qubit_index in range(row_length):
+        span = [None, (qubit_index, qubit_index), (qubit_index, qubit_index), None, None]
+        if qubit_index < row_length - 1:
+            span[GateType.CNOT_DOWN] = (qubit_index, qubit_index + 1)
+        if qubit_index > 0:
+            span[GateType.CNOT_UP] = (qubit_index - 1, qubit_index)
+        spans.append(span)
+
+    depth = [0] * row_length
+    layers: list[list[int]] = []
+    for row in gate_array.reshape((-1, row_length)).tolist():
+        for qubit_index, gate in enumerate(row):
+            span = spans[qubit_index][gate]
+            if span is None:
+                continue
+            low, high = span
+            layer = max(depth[low], depth[high])
+            if layer == len(layers):
+                layers.append([0] * row_length)
+            layers[layer][qubit_index] = gate
+            depth[low] = depth[high] = layer + 1
+    return np.array(layers, dtype=np.uint8).reshape((len(layers), row_length))
+
+
+def canonicalise_gates_batch(gate_arrays: ndarray) -> ndarray:
+    """Vectorised canonicalise_gates over a (P, T, Q) population.
+
+    Returns a (P, L, Q) uint8 array, L being the deepest normal form in the
+    batch (at least one layer); shallower circuits are padded with blank
+    layers at the end.
+    """
+    gate_arrays = np.asarray(gate_arrays)
+    num_circuits, time_steps, row_length = gate_arrays.shape
+    # low[q, g] / high[q, g]: qubit span of gate value g in slot q, -1 where the simulator skips it
+    low = np.full((row_length, len(GateType)), -1, dtype=np.intp)
+    high = np.full((row_length, len(GateType)), -1, dtype=np.intp)
+    for qubit_index in range(row_length):
+        low[qubit_index, [GateType.T_GATE, GateType.HADAMARD]] = qubit_index
+        high[qubit_index, [GateType.T_GATE, GateType.HADAMARD]] = qubit_index
+        if qubit_index < row_length - 1:
+            low[qubit_index, GateType.CNOT_DOWN] = qubit_index
+            high[qubit_index, GateType.CNOT_DOWN] = qubit_index + 1
+        if qubit_index > 0:
+            low[qubit_index, GateType.CNOT_UP] = qubit_index - 1
+            high[qubit_index, GateType.CNOT_UP] = qubit_index
+
+    canonical = np.zeros((num_circuits, max(time_steps, 1), row_length), dtype=np.uint8)
+    depth = np.zeros((num_circuits, row_length), dtype=np.intp)
+    slots = np.ascontiguousarray(np.moveaxis(gate_arrays, 0, -1), dtype=np.intp)
+    for t in range(time_steps):
+        for qubit_index in range(row_length):
+            gate = slots[t, qubit_index]
+            span_low = low[qubit_index, gate]
+            rows = np.flatnonzero(span_low >= 0)
+            if len(rows) == 0:
+                continue
+            span_low, span_high = span_low[rows], high[qubit_index, gate[rows]]
+            layer = np.maximum(depth[rows, span_low], depth[rows, span_high])
+            # Rows with gates that overlap inside one row can outgrow T layers
+            if layer.max() >= canonical.shape[1]:
+                padding = np.zeros((num_circuits, canonical.shape[1], row_length), dtype=np.uint8)
+                canonical = np.concatenate([canonical, padding], axis=1)
+            canonical[rows, layer, qubit_index] = gate[rows]
+            depth[rows, span_low] = layer + 1
+            depth[rows, span_high] = layer + 1
+    return canonical[:, :max(int(depth.max(initial=0)), 1)]
+
+
+def canonical_digest(canonical: ndarray, person: bytes = b"") -> bytes:
+    """Return the 8-byte blake2b digest of a normal form, ignoring trailing blank layers."""
+    canonical = np.asarray(canonical, dtype=np.uint8)
+    num_layers = int(np.count_nonzero(np.any(canonical != 0, axis=1)))
+    h = hashlib.blake2b(digest_size=8, person=person)
+    h.update(canonical.shape[1].to_bytes(2, "little"))
+    h.update(canonical[:num_layers].tobytes())
+    return h.digest()
+
+
+def canonical_hash(gate_array: ndarray) -> int:
+    """Stable 64-bit hash shared by all gate arrays with the same normal form."""
+    return int.from_bytes(canonical_digest(canonicalise_gates(gate_array)), "little")
@@ -0,0 +1,129 @@
+from collections import OrderedDict
+
+import numpy as np
+from numpy import ndarray
+
+from quantum_ea.circuit import apply_gate_row, compute_probabilities, initialise_statevector, initialise_statevectors
+from quantum_ea.fitness import resolve_fitness_mode, finalise_fitness, get_fitness_cache, marked_item_indices
+from quantum_ea.fitness_cache import _digest
+
+
+class IncrementalEvaluator:
+    """Fitness evaluator that resumes offspring from their parent's statevectors.
+
+    Every evaluated circuit leaves behind checkpoints: the statevector before
+    each checkpoint_interval-th row. When a child is evaluated with its parent,
+    simulation starts from the parent's last checkpoint at or before the first
+    row where the two differ, so a late mutation in a deep circuit only
+    re-simulates the tail. The prefix shared with the parent is recorded for
+    the parent as well, so parents scored in a batch gain checkpoints through
+    their first child. Checkpoints are kept least-recently-used first
+    under max_bytes. Fitness values match run_quantum_algorithm_over_set and
+    go through the shared fitness cache.
+    """
+
+    def __init__(
+        self,
+        input_set: ndarray,
+        target_set: ndarray,
+        num_qubits: int,
+        max_bytes: int = 64 * 2**20,
+        checkpoint_interval: int = 1,
+        fitness_mode: str | None = None,
+    ):
+        if checkpoint_interval < 1:
+            raise ValueError(f"checkpoint_interval must be >= 1, got {checkpoint_interval}")
+        self.input_set = input_set
+        self.target_set = target_set
+        self.num_qubits = num_qubits
+        self.max_bytes = max_bytes
+        self.checkpoint_interval = checkpoint_interval
+        self.fitness_mode = resolve_fitness_mode(fitness_mode)
+        if self.fitness_mode == "mean":
+            self._initial = initialise_statevectors(input_set, num_qubits)
+            self._marked = (np.arange(len(target_set)), marked_item_indices(target_set))
+        else:
+            self._initial = np.array(initialise_statevector(input_set[0, :], num_qubits), dtype=complex)
+            self._marked = int(np.argmax(target_set[0]))
+        # digest -> (gate_array, checkpoints); checkpoints[j] is the state before row j * checkpoint_interval
+        self._checkpoints: OrderedDict[bytes, tuple[ndarray, list[ndarray]]] = OrderedDict()
+        self._bytes = 0
+        self.rows_simulated = 0
+        self.rows_requested = 0
+
+    @property
+    def stored_bytes(self) -> int:
+        return self._bytes
+
+    @property
+    def row_savings(self) -> float:
+        """Fraction of requested rows that were served from checkpoints."""
+        if not self.rows_requested:
+            return 0.0
+        return 1.0 - self.rows_simulated / self.rows_requested
+
+    def evaluate(self, gate_array: ndarray, parent: ndarray | None = None) -> float:
+        """Return the fitness of gate_array, resuming from parent's checkpoints when possible."""
+        cache = get_fitness_cache()
+        if cache is not None:
+            cache_key = cache.key(self.input_set, self.target_set, gate_array, mode=self.fitness_mode)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return finalise_fitness(cached[0], gate_array)
+
+        num_rows = len(gate_array)
+        checkpoints = [self._initial]
+        shared = 0
+        if parent is not None:
+            changed = np.flatnonzero(np.any(parent != gate_array, axis=1))
+            first_changed = int(changed[0]) if len(changed) else num_rows
+            shared = first_changed // self.checkpoint_interval + 1
+            stored = self._lookup(parent)
+            if stored is not None:
+                checkpoints = stored[:shared]
+
+        start_row = (len(checkpoints) - 1) * self.checkpoint_interval
+        sv = checkpoints[-1].copy()
+        checkpoints = list(checkpoints)
+        for row_index in range(start_row, num_rows):
+            apply_gate_row(sv, self.num_qubits, gate_array[row_index])
+            if (row_index + 1) % self.checkpoint_interval == 0 and row_index + 1 < num_rows:
+                checkpoints.append(sv.copy())
+        self.rows_requested += num_rows
+        self.rows_simulated += num_rows - start_row
+        self._store(gate_array, checkpoints)
+        if parent is not None:
+            # The shared prefix is also the parent's, which seeds it for its next offspring
+            self._store(parent, checkpoints[:shared])
+
+        score = float(np.mean(compute_probabilities(sv[self._marked])))
+        if cache is not None:
+            cache.put(cache_key, (score,))
+        return finalise_fitness(score, gate_array)
+
+    def clear(self) -> None:
+        self._checkpoints.clear()
+        self._bytes = 0
+
+    def _lookup(self, gate_array: ndarray) -> list[ndarray] | None:
+        key = _digest(gate_array)
+        entry = self._checkpoints.get(key)
+        if entry is None or not np.array_equal(entry[0], gate_array):
+            return None
+        self._checkpoints.move_to_end(key)
+        return entry[1]
+
+    def _store(self, gate_array: ndarray, checkpoints: list[ndarray]) -> None:
+        key = _digest(gate_array)
+        existing = self._checkpoints.get(key)
+        if existing is not None:
+            self._checkpoints.move_to_end(key)
+            if len(existing[1]) >= len(checkpoints):
+                return
+            self._bytes -= sum(state.nbytes for state in existing[1])
+        # Prefix checkpoints shared with the parent are counted again; the bound is approximate
+        self._checkpoints[key] = (gate_array.copy(), checkpoints)
+        self._bytes += sum(state.nbytes for state in checkpoints)
+        while len(self._checkpoints) > 1 and self._bytes > self.max_bytes:
+            _, (_, evicted) = self._checkpoints.popitem(last=False)
+            self._bytes -= sum(state.nbytes for state in evicted)
@@ -0,0 +1,155 @@
+"""Matrix product state simulation of gate arrays.
+
+Every CNOT in GateType couples neighbouring qubits (i, i+1), so a gate
+array is a nearest-neighbour circuit on a chain, the case matrix product
+states handle directly. Qubit q is site q, held as a (chi_left, 2,
+chi_right) tensor. Single-qubit gates act on one tensor; a CNOT contracts
+its two sites, permutes the pair and splits them again by SVD, keeping at
+most max_bond singular values. A single basis amplitude is then a product
+of n chi x chi matrices, so the 2^n statevector is never formed. Memory
+and time are polynomial in n for as long as the bond dimension stays
+bounded, i.e. while the circuit builds up little entanglement across any
+cut of the chain.
+"""
+import numpy as np
+from numpy import ndarray
+
+from quantum_ea.circuit import _H2, _T2
+from quantum_ea.gates import GateType
+
+DEFAULT_MAX_BOND = 64
+# Singular values below this fraction of the largest are dropped as numerical zeros
+_SINGULAR_VALUE_CUTOFF = 1e-12
+
+
+def bond_dimension_bound(gate_array: ndarray, num_qubits: int) -> int:
+    """Upper bound on the bond dimension gate_array needs from a product state.
+
+    Each CNOT across a cut at most doubles the Schmidt rank there, and the
+    cut between sites q and q+1 can never need more than 2^min(q+1, n-q-1).
+    """
+    gate_array = np.asarray(gate_array)
+    if num_qubits < 2:
+        return 1
+    # Cut q lies between sites q and q+1: crossed by CNOT_DOWN at column q and CNOT_UP at q+1
+    crossings = (
+        np.count_nonzero(gate_array[:, :-1] == GateType.CNOT_DOWN, axis=0)
+        + np.count_nonzero(gate_array[:, 1:] == GateType.CNOT_UP, axis=0)
+    )
+    cuts = np.arange(num_qubits - 1)
+    exponents = np.minimum(crossings, np.minimum(cuts + 1, num_qubits - cuts - 1))
+    return int(2 ** exponents.max())
+
+
+class MatrixProductState:
+    """n-qubit state as a chain of site tensors kept in mixed canonical form.
+
+    tensors[q] has shape (chi_q, 2, chi_q+1) with chi_0 = chi_n = 1. Sites
+    left of center are left-orthonormal and those right of it
+    right-orthonormal, so an SVD at the center is the optimal truncation.
+    truncation_error sums the weight discarded by the max_bond cap, so it
+    stays 0.0 while the state is exact; the state is renormalised after
+    each truncation.
+    """
+
+    def __init__(self, site_vectors: list[ndarray], max_bond: int = DEFAULT_MAX_BOND):
+        self.num_qubits = len(site_vectors)
+        self.max_bond = max_bond
+        self.tensors = [np.asarray(vector, dtype=complex).reshape(1, 2, 1) for vector in site_vectors]
+        self.center = 0
+        self.truncation_error = 0.0
+
+    @classmethod
+    def from_input_state(
+        cls, input_state: ndarray, num_qubits: int, max_bond: int = DEFAULT_MAX_BOND,
+    ) -> "MatrixProductState":
+        """Product-state MPS of initialise_statevector(input_state, num_qubits).
+
+        An all-zero input is the uniform superposition; otherwise the qubits
+        marked 1 are flipped from |0...0>.
+        """
+        if np.all(np.asarray(input_state) == 0):
+            return cls([np.full(2, 1 / np.sqrt(2))] * num_qubits, max_bond)
+        return cls([np.eye(2)[int(value)] for value in input_state[:num_qubits]], max_bond)
+
+    @property
+    def bond_dimensions(self) -> list[int]:
+        return [tensor.shape[2] for tensor in self.tensors[:-1]]
+
+    def apply_single_qubit_gate(self, gate_2x2: ndarray, qubit: int) -> None:
+        self.tensors[qubit] = np.einsum("ij,ajb->aib", gate_2x2, self.tensors[qubit])
+
+    def cnot(self, control: int) -> None:
+        """CNOT with control site control and target site control + 1."""
+        self._move_center(control)
+        left, right = self.tensors[control], self.tensors[control + 1]
+        chi_left, chi_right = left.shape[0], right.shape[2]
+        theta = np.einsum("aib,bjc->aijc", left, right)
+        theta[:, 1] = theta[:, 1, ::-1].copy()
+
+        u, s, vh = np.linalg.svd(theta.reshape(chi_left * 2, 2 * chi_right), full_matrices=False)
+        nonzero = int(np.count_nonzero(s > _SINGULAR_VALUE_CUTOFF * s[0]))
+        keep = min(self.max_bond, nonzero)
+        total = np.sum(s ** 2)
+        self.truncation_error += float(np.sum(s[keep:nonzero] ** 2) / total)
+        s = s[:keep] * np.sqrt(total / np.sum(s[:keep] ** 2))
+        self.tensors[control] = u[:, :keep].reshape(chi_left, 2, keep)
+        self.tensors[control + 1] = (s[:, np.newaxis] * vh[:keep]).reshape(keep, 2, chi_right)
+        self.center = control + 1
+
+    def _move_center(self, site: int) -> None:
+        """Shift the orthogonality center to site with QR steps along the chain."""
+        while self.center < site:
+            tensor = self.tensors[self.center]
+            chi_left, _, chi_right = tensor.shape
+            q, r = np.linalg.qr(tensor.reshape(chi_left * 2, chi_right))
+            self.tensors[self.center] = q.reshape(chi_left, 2, q.shape[1])
+            self.tensors[self.center + 1] = np.einsum("ab,bjc->ajc", r, self.tensors[self.center + 1])
+            self.center += 1
+        while self.center > site:
+            tensor = self.tensors[self.center]
+            chi_left, _, chi_right = tensor.shape
+            q, r = np.linalg.qr(tensor.reshape(chi_left, 2 * chi_right).T)
+            self.tensors[self.center] = q.T.reshape(q.shape[1], 2, chi_right)
+            self.tensors[self.center - 1] = np.einsum("aib,bc->aic", self.tensors[self.center - 1], r.T)
+            self.center -= 1
+
+    def apply_gate_array(self, gate_array: ndarray) -> None:
+        """Apply gate_array rows/cols like apply_quantum_gates."""
+        num_qubits = self.num_qubits
+        for row in np.asarray(gate_array).tolist():
+            for qubit_index, gate in enumerate(row):
+                if gate == GateType.HADAMARD:
+                    self.apply_single_qubit_gate(_H2, qubit_index)
+                elif gate == GateType.T_GATE:
+                    self.apply_single_qubit_gate(_T2, qubit_index)
+                elif gate == GateType.CNOT_DOWN:
+                    if qubit_index + 1 < num_qubits:
+                        self.cnot(qubit_index)
+                elif gate == GateType.CNOT_UP:
+                    if qubit_index > 0:
+                        self.cnot(qubit_index - 1)
+
+    def amplitude(self, index: int) -> complex:
+        """Amplitude of basis state index, contracting one matrix per site."""
+        row = np.ones(1, dtype=complex)
+        for qubit, tensor in enumerate(self.tensors):
+            row = row @ tensor[:, (index >> qubit) & 1, :]
+        return complex(row[0])
+
+
+def mps_marked_probability(
+    input_state: ndarray,
+    num_qubits: int,
+    gate_array: ndarray,
+    marked_index: int,
+    max_bond: int = DEFAULT_MAX_BOND,
+) -> float:
+    """P(marked_index) after gate_array acts on initialise_statevector(input_state).
+
+    Exact while bond_dimension_bound(gate_array) <= max_bond; beyond that
+    the result is the probability in the truncated, renormalised state.
+    """
+    state = MatrixProductState.from_input_state(input_state, num_qubits, max_bond)
+    state.apply_gate_array(gate_array)
+    return float(abs(state.amplitude(marked_index)) ** 2)
@@ -0,0 +1,83 @@
+import random
+from typing import Sequence
+
+import numpy as np
+from deap import tools
+from numpy import ndarray
+
+from quantum_ea.gates import GateType
+
+# "categorical" resamples a gene's gate type; "flip_bit" is DEAP's mutFlipBit,
+# which maps 0 -> 1 and every other gate -> 0 and so never introduces H or CNOT
+MUTATION_OPERATORS = ("categorical", "flip_bit")
+
+
+def _check_transition_weights(transition_weights: Sequence[Sequence[float]] | None) -> ndarray | None:
+    if transition_weights is None:
+        return None
+    weights = np.asarray(transition_weights, dtype=float)
+    num_gate_types = len(GateType)
+    if weights.shape != (num_gate_types, num_gate_types) or np.any(weights < 0) or np.any(weights.sum(axis=1) <= 0):
+        raise ValueError(
+            f"transition_weights must be a non-negative {num_gate_types}x{num_gate_types} matrix with non-zero rows"
+        )
+    return weights
+
+
+def mut_categorical(individual: list, indpb: float, transition_weights: ndarray | None = None) -> tuple[list]:
+    """DEAP mutation that resamples each gene's gate type with probability indpb.
+
+    Without transition_weights the new gate is drawn uniformly from the other
+    gate types, so every mutated gene changes. Row g of transition_weights
+    gives the relative odds of each new gate type when the current one is g.
+    """
+    num_gate_types = len(GateType)
+    for i, gene in enumerate(individual):
+        if random.random() < indpb:
+            if transition_weights is None:
+                individual[i] = (gene + random.randint(1, num_gate_types - 1)) % num_gate_types
+            else:
+                individual[i] = random.choices(range(num_gate_types), weights=transition_weights[gene])[0]
+    return individual,
+
+
+def register_mutation(
+    toolbox,
+    mutation: str,
+    indpb: float,
+    transition_weights: Sequence[Sequence[float]] | None = None,
+) -> None:
+    """Register the named mutation operator as toolbox.mutate."""
+    if mutation == "categorical":
+        weights = _check_transition_weights(transition_weights)
+        toolbox.register("mutate", mut_categorical, indpb=indpb, transition_weights=weights)
+    elif mutation == "flip_bit":
+        toolbox.register("mutate", tools.mutFlipBit, indpb=indpb)
+    else:
+        raise ValueError(f"Unknown mutation operator: {mutation!r}")
+
+
+def categorical_mutation(
+    population: ndarray,
+    mutation_probability: float,
+    gene_probability: float,
+    rng: np.random.Generator,
+    transition_weights: Sequence[Sequence[float]] | None = None,
+) -> ndarray:
+    """Array counterpart of mut_categorical over a (P, genes) population, in place.
+
+    Each row is mutated with mutation_probability and each of its genes with
+    gene_probability. Returns the mask of mutated rows.
+    """
+    num_gate_types = len(GateType)
+    mutated = rng.random(len(population)) < mutation_probability
+    genes = (rng.random(population.shape) < gene_probability) & mutated[:, np.newaxis]
+    current = population[genes].astype(np.int64)
+    weights = _check_transition_weights(transition_weights)
+    if weights is None:
+        population[genes] = (current + rng.integers(1, num_gate_types, size=len(current))) % num_gate_types
+    else:
+        cdf = np.cumsum(weights / weights.sum(axis=1, keepdims=True), axis=1)
+        draws = rng.random(len(current))
+        population[genes] = np.minimum((draws[:, np.newaxis] >= cdf[current]).sum(axis=1), num_gate_types - 1)
+    return mutated
@@ -0,0 +1,138 @@
+"""Array-backed genetic algorithm used by EAOptimizer(engine="array").
+
+The population is one (P, T*Q) uint8 array and every operator acts on the
+whole population at once. One generation follows DEAP's eaSimple: tournament
+selection, then varAnd-style two-point crossover of consecutive pairs and
+per-gene mutation, then evaluation of the individuals that changed.
+"""
+from dataclasses import dataclass, field
+
+import numpy as np
+from numpy import ndarray
+
+from quantum_ea.fitness import evaluate_population
+from quantum_ea.gates import GateType, preprocess_gates_batch
+from quantum_ea.operators import categorical_mutation
+from quantum_ea.prefix_trie import PrefixTrieEvaluator
+
+
+@dataclass
+class ArrayGAResult:
+    best_individual: ndarray
+    best_fitness: float
+    fitness_history: list[float] = field(default_factory=list)
+    row_savings: float | None = None
+
+
+def tournament_select(fitness: ndarray, tournament_size: int, rng: np.random.Generator) -> ndarray:
+    """Return P winner indices, each the fittest of tournament_size uniform draws."""
+    num_individuals = len(fitness)
+    aspirants = rng.integers(0, num_individuals, size=(num_individuals, tournament_size))
+    return aspirants[np.arange(num_individuals), np.argmax(fitness[aspirants], axis=1)]
+
+
+def two_point_crossover(population: ndarray, crossover_probability: float, rng: np.random.Generator) -> ndarray:
+    """Cross consecutive pairs in place like tools.cxTwoPoint; returns the mask of changed rows."""
+    num_individuals, size = population.shape
+    changed = np.zeros(num_individuals, dtype=bool)
+    num_pairs = num_individuals // 2
+    if num_pairs == 0 or size < 2:
+        return changed
+
+    mated = np.flatnonzero(rng.random(num_pairs) < crossover_probability)
+    first = rng.integers(1, size + 1, size=len(mated))
+    second = rng.integers(1, size, size=len(mated))
+    # Same point distribution as cxTwoPoint: distinct cut points with first < second
+    second = np.where(second >= first, second + 1, second)
+    low, high = np.minimum(first, second), np.maximum(first, second)
+    genes = np.arange(size)
+    swap = (genes >= low[:, np.newaxis]) & (genes < high[:, np.newaxis])
+
+    left, right = population[2 * mated], population[2 * mated + 1]
+    population[2 * mated] = np.where(swap, right, left)
+    population[2 * mated + 1] = np.where(swap, left, right)
+    changed[2 * mated] = True
+    changed[2 * mated + 1] = True
+    return changed
+
+
+def flip_mutation(
+    population: ndarray,
+    mutation_probability: float,
+    gene_probability: float,
+    rng: np.random.Generator,
+) -> ndarray:
+    """Mutate selected rows in place like tools.mutFlipBit; returns the mask of mutated rows."""
+    mutated = rng.random(len(population)) < mutation_probability
+    genes = (rng.random(population.shape) < gene_probability) & mutated[:, np.newaxis]
+    population[genes] = population[genes] == 0
+    return mutated
+
+
+def run_array_ga(
+    input_set: ndarray,
+    target_set: ndarray,
+    num_qubits: int,
+    time_steps: int,
+    population_size: int,
+    generations: int,
+    crossover_probability: float,
+    mutation_probability: float,
+    gene_probability: float,
+    tournament_size: int,
+    rng: np.random.Generator,
+    mutation: str = "categorical",
+    transition_weights: list[list[float]] | None = None,
+    prefix_trie_bytes: int | None = None,
+) -> ArrayGAResult:
+    """Evolve a uint8 population for the given number of generations.
+
+    fitness_history holds the population maximum after initialisation and
+    after every generation, matching the "max" column of eaSimple's logbook.
+    With prefix_trie_bytes set, each generation is scored by a
+    PrefixTrieEvaluator under that memory cap and row_savings reports the
+    fraction of row applications it avoided.
+    """
+    trie = None
+    if prefix_trie_bytes is not None:
+        trie = PrefixTrieEvaluator(input_set, target_set, num_qubits, max_bytes=prefix_trie_bytes)
+
+    def evaluate(individuals: ndarray) -> ndarray:
+        gate_arrays = preprocess_gates_batch(individuals.reshape((-1, time_steps, num_qubits))).astype(int)
+        if trie is not None:
+            return trie.evaluate(gate_arrays)
+        return evaluate_population(input_set, target_set, num_qubits, gate_arrays)
+
+    dna_size = time_steps * num_qubits
+    population = rng.integers(0, len(GateType), size=(population_size, dna_size), dtype=np.uint8)
+    fitness = evaluate(population)
+
+    best_index = int(np.argmax(fitness))
+    best_individual, best_fitness = population[best_index].copy(), float(fitness[best_index])
+    fitness_history = [float(fitness.max())]
+
+    for _ in range(generations):
+        winners = tournament_select(fitness, tournament_size, rng)
+        population, fitness = population[winners], fitness[winners]
+
+        changed = two_point_crossover(population, crossover_probability, rng)
+        if mutation == "flip_bit":
+            changed |= flip_mutation(population, mutation_probability, gene_probability, rng)
+        else:
+            changed |= categorical_mutation(
+                population, mutation_probability, gene_probability, rng, transition_weights,
+            )
+        if changed.any():
+            fitness[changed] = evaluate(population[changed])
+
+        generation_best = int(np.argmax(fitness))
+        if fitness[generation_best] > best_fitness:
+            best_individual, best_fitness = population[generation_best].copy(), float(fitness[generation_best])
+        fitness_history.append(float(fitness.max()))
+
+    return ArrayGAResult(
+        best_individual=best_individual,
+        best_fitness=best_fitness,
+        fitness_history=fitness_history,
+        row_savings=trie.row_savings if trie is not None else None,
+    )
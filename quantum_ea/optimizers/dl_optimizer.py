@@ -3,9 +3,10 @@ import time
 import numpy as np
 from numpy import ndarray
 
-from quantum_ea.gates import GateType, preprocess_gates
-from quantum_ea.fitness import run_quantum_algorithm_over_set, count_non_identity_gates
+from quantum_ea.gates import GateType, preprocess_gates_batch
+from quantum_ea.fitness import evaluate_population, count_non_identity_gates
 from quantum_ea.optimizers.base import OptimizerBase, OptimizationResult
+from quantum_ea.circuit_torch import evaluate_population_torch, preprocess_gates_torch
 
 _TORCH_AVAILABLE = False
 try:
@@ -19,10 +20,22 @@ except ImportError:
 class DLOptimizer(OptimizerBase):
     name = "deep_learning"
 
-    def __init__(self, learning_rate: float = 1e-3, batch_size: int = 16, hidden_size: int = 64):
+    def __init__(
+        self,
+        learning_rate: float = 1e-3,
+        batch_size: int = 16,
+        hidden_size: int = 64,
+        simulator: str = "numpy",
+        num_threads: int | None = None,
+    ):
+        if simulator not in ("numpy", "torch"):
+            raise ValueError(f"Unknown simulator: {simulator!r}")
         self.learning_rate = learning_rate
         self.batch_size = batch_size
         self.hidden_size = hidden_size
+        # "torch" simulates sampled batches with quantum_ea.circuit_torch, bypassing the fitness cache
+        self.simulator = simulator
+        self.num_threads = num_threads
 
     def optimize(
         self,
@@ -49,6 +62,24 @@ class DLOptimizer(OptimizerBase):
             torch.manual_seed(seed)
             np.random.seed(seed)
 
+        # torch's intra-op thread count is process-wide, so only borrow it for this run
+        previous_threads = torch.get_num_threads()
+        if self.num_threads is not None:
+            torch.set_num_threads(self.num_threads)
+        try:
+            return self._train(input_set, target_set, num_qubits, time_steps, evaluation_budget)
+        finally:
+            torch.set_num_threads(previous_threads)
+
+    def _train(
+        self,
+        input_set: ndarray,
+        target_set: ndarray,
+        num_qubits: int,
+        time_steps: int,
+        evaluation_budget: int,
+    ) -> OptimizationResult:
+        """Run the REINFORCE loop on the policy network."""
         num_gate_types = len(GateType)
         dim = 2 ** num_qubits
         total_positions = time_steps * num_qubits
@@ -80,36 +111,32 @@ class DLOptimizer(OptimizerBase):
             logits = net(target_input).reshape(total_positions, num_gate_types)
             dist = torch.distributions.Categorical(logits=logits)
 
-            log_probs_batch = []
-            rewards_batch = []
-
-            for _ in range(self.batch_size):
-                actions = dist.sample()
-                log_prob = dist.log_prob(actions).sum()
-
-                gate_array = actions.detach().numpy().reshape(time_steps, num_qubits).astype(int)
-                gate_array = preprocess_gates(gate_array)
-
-                fitness_val = run_quantum_algorithm_over_set(
-                    input_set, target_set, num_qubits, gate_array
-                )[0]
-                eval_count += 1
+            # Sample the whole batch at once: (batch_size, total_positions)
+            actions = dist.sample((self.batch_size,))
+            log_probs = dist.log_prob(actions).sum(dim=1)
 
-                log_probs_batch.append(log_prob)
-                rewards_batch.append(fitness_val)
+            raw = actions.reshape(self.batch_size, time_steps, num_qubits)
+            if self.simulator == "torch":
+                gate_arrays = preprocess_gates_torch(raw)
+                fitness_values = evaluate_population_torch(input_set, target_set, num_qubits, gate_arrays)
+            else:
+                gate_arrays = preprocess_gates_batch(raw.numpy().astype(int))
+                fitness_values = torch.as_tensor(evaluate_population(input_set, target_set, num_qubits, gate_arrays))
+            eval_count += self.batch_size
 
-                if fitness_val > best_fitness:
-                    best_fitness = fitness_val
-                    best_gates = gate_array.copy()
+            best_index = int(torch.argmax(fitness_values))
+            if fitness_values[best_index] > best_fitness:
+                best_fitness = float(fitness_values[best_index])
+                best_gates = np.asarray(gate_arrays[best_index]).astype(int)
 
             fitness_history.append(best_fitness)
 
             # REINFORCE update
-            rewards = torch.tensor(rewards_batch, dtype=torch.float32)
+            rewards = fitness_values.to(torch.float32)
             baseline = 0.9 * baseline + 0.1 * rewards.mean().item()
             advantages = rewards - baseline
 
-            loss = torch.stack([-lp * adv for lp, adv in zip(log_probs_batch, advantages)]).mean()
+            loss = -(log_probs * advantages).mean()
 
             optimizer.zero_grad()
             loss.backward()
@@ -7,10 +7,13 @@ from numpy import ndarray
 
 from quantum_ea.gates import preprocess_gates
 from quantum_ea.fitness import run_quantum_algorithm_over_set, count_non_identity_gates
+from quantum_ea.operators import MUTATION_OPERATORS, register_mutation
+from quantum_ea.optimizers.array_ga import run_array_ga
 from quantum_ea.optimizers.base import OptimizerBase, OptimizationResult
+from quantum_ea.optimizers.evaluation import EvaluationBackend, GateArrayEvaluator
 
 
-def _dna_to_gates(individual: list[int], num_qubits: int) -> ndarray:
+def _dna_to_gates(individual: list[int] | ndarray, num_qubits: int) -> ndarray:
     gate_array = np.asarray(individual).reshape((-1, num_qubits))
     return preprocess_gates(gate_array)
 
@@ -25,12 +28,34 @@ class EAOptimizer(OptimizerBase):
         mutation_probability: float = 0.2,
         tournament_size: int = 3,
         swap_probability: float = 0.1,
+        evaluation_backend: str = "batched",
+        num_workers: int | None = None,
+        engine: str = "deap",
+        mutation: str = "categorical",
+        transition_weights: list[list[float]] | None = None,
+        prefix_trie_bytes: int | None = None,
     ):
+        if engine not in ("deap", "array"):
+            raise ValueError(f"Unknown EA engine: {engine!r}")
+        if mutation not in MUTATION_OPERATORS:
+            raise ValueError(f"Unknown mutation operator: {mutation!r}")
         self.population_size = population_size
         self.breeding_probability = breeding_probability
         self.mutation_probability = mutation_probability
         self.tournament_size = tournament_size
         self.swap_probability = swap_probability
+        self.evaluation_backend = evaluation_backend
+        self.num_workers = num_workers
+        # "array" evolves a single (P, T*Q) uint8 population with vectorised operators
+        # and always scores it through evaluate_population, ignoring evaluation_backend
+        self.engine = engine
+        self.mutation = mutation
+        self.transition_weights = transition_weights
+        # Score generations through a PrefixTrieEvaluator with this memory cap; the
+        # DEAP engine only uses it with the "batched" evaluation backend
+        self.prefix_trie_bytes = prefix_trie_bytes
+        # Fraction of row applications the prefix trie avoided in the last run
+        self.row_savings: float | None = None
 
     def optimize(
         self,
@@ -48,6 +73,53 @@ class EAOptimizer(OptimizerBase):
         dna_size = time_steps * num_qubits
         ngen = max(1, evaluation_budget // self.population_size - 1)
 
+        start = time.perf_counter()
+        if self.engine == "array":
+            result = run_array_ga(
+                input_set, target_set, num_qubits, time_steps,
+                population_size=self.population_size,
+                generations=ngen,
+                crossover_probability=self.breeding_probability,
+                mutation_probability=self.mutation_probability,
+                gene_probability=self.swap_probability,
+                tournament_size=self.tournament_size,
+                rng=np.random.default_rng(seed),
+                mutation=self.mutation,
+                transition_weights=self.transition_weights,
+                prefix_trie_bytes=self.prefix_trie_bytes,
+            )
+            best_dna = result.best_individual.astype(int)
+            fitness_history = result.fitness_history
+            self.row_savings = result.row_savings
+        else:
+            best_dna, fitness_history = self._run_deap(input_set, target_set, num_qubits, dna_size, ngen)
+        elapsed = time.perf_counter() - start
+
+        best_gates = _dna_to_gates(best_dna, num_qubits)
+        best_fitness = run_quantum_algorithm_over_set(
+            input_set, target_set, num_qubits, best_gates
+        )[0]
+
+        total_evals = self.population_size + ngen * self.population_size
+
+        return OptimizationResult(
+            best_gate_array=best_gates,
+            best_fitness=best_fitness,
+            total_evaluations=total_evals,
+            wall_clock_seconds=elapsed,
+            circuit_complexity=count_non_identity_gates(best_gates),
+            fitness_history=fitness_history,
+        )
+
+    def _run_deap(
+        self,
+        input_set: ndarray,
+        target_set: ndarray,
+        num_qubits: int,
+        dna_size: int,
+        ngen: int,
+    ) -> tuple[list[int], list[float]]:
+        """Run eaSimple; returns the hall-of-fame DNA and the per-generation max fitness."""
         # Build own toolbox
         toolbox = base.Toolbox()
         toolbox.register("attr_gene", random.randint, 0, 4)
@@ -57,15 +129,10 @@ class EAOptimizer(OptimizerBase):
         )
         toolbox.register("population", tools.initRepeat, list, toolbox.individual)
 
-        def evaluate(individual):
-            return run_quantum_algorithm_over_set(
-                input_set, target_set, num_qubits,
-                _dna_to_gates(individual, num_qubits),
-            )
-
-        toolbox.register("evaluate", evaluate)
+        evaluator = GateArrayEvaluator(input_set, target_set, num_qubits, prefix_trie_bytes=self.prefix_trie_bytes)
+        toolbox.register("evaluate", evaluator)
         toolbox.register("mate", tools.cxTwoPoint)
-        toolbox.register("mutate", tools.mutFlipBit, indpb=self.swap_probability)
+        register_mutation(toolbox, self.mutation, self.swap_probability, self.transition_weights)
         toolbox.register("select", tools.selTournament, tournsize=self.tournament_size)
 
         pop = toolbox.population(n=self.population_size)
@@ -73,33 +140,18 @@ class EAOptimizer(OptimizerBase):
         stats = tools.Statistics(lambda ind: ind.fitness.values)
         stats.register("max", np.max)
 
-        start = time.perf_counter()
-        pop, logbook = algorithms.eaSimple(
-            pop, toolbox,
-            cxpb=self.breeding_probability,
-            mutpb=self.mutation_probability,
-            ngen=ngen,
-            stats=stats,
-            halloffame=hof,
-            verbose=False,
-        )
-        elapsed = time.perf_counter() - start
-
-        best_gates = _dna_to_gates(list(hof[0]), num_qubits)
-        best_fitness = run_quantum_algorithm_over_set(
-            input_set, target_set, num_qubits, best_gates
-        )[0]
+        with EvaluationBackend(self.evaluation_backend, self.num_workers) as backend:
+            toolbox.register("map", backend.map)
+            pop, logbook = algorithms.eaSimple(
+                pop, toolbox,
+                cxpb=self.breeding_probability,
+                mutpb=self.mutation_probability,
+                ngen=ngen,
+                stats=stats,
+                halloffame=hof,
+                verbose=False,
+            )
 
+        self.row_savings = evaluator.prefix_trie.row_savings if evaluator.prefix_trie is not None else None
         # Extract fitness history from logbook
-        fitness_history = [record["max"] for record in logbook]
-
-        total_evals = self.population_size + ngen * self.population_size
-
-        return OptimizationResult(
-            best_gate_array=best_gates,
-            best_fitness=best_fitness,
-            total_evaluations=total_evals,
-            wall_clock_seconds=elapsed,
-            circuit_complexity=count_non_identity_gates(best_gates),
-            fitness_history=fitness_history,
-        )
+        return list(hof[0]), [record["max"] for record in logbook]
@@ -0,0 +1,138 @@
+import functools
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Iterable
+
+import numpy as np
+from numpy import ndarray
+
+from quantum_ea.gates import preprocess_gates, preprocess_gates_batch
+from quantum_ea.fitness import (
+    resolve_fitness_mode,
+    evaluate_population,
+    run_quantum_algorithm_over_set,
+    count_non_identity_gates,
+    count_active_depth,
+)
+from quantum_ea.prefix_trie import PrefixTrieEvaluator
+
+EVALUATION_BACKENDS = ("builtin", "thread", "process", "batched")
+
+
+def _batch_method(func: Callable) -> Callable | None:
+    """Return func's batch() method, looking through toolbox.register's partial wrapper."""
+    if isinstance(func, functools.partial) and not func.args and not func.keywords:
+        func = func.func
+    return getattr(func, "batch", None)
+
+
+class GateArrayEvaluator:
+    """Picklable DEAP evaluate function for flat gate-array individuals.
+
+    Called on one individual it returns the fitness tuple; batch() scores a
+    whole list at once through evaluate_population. With objectives="nsga"
+    the tuple is (fidelity, active_depth, gate_count). The fitness mode is
+    fixed at construction so pool workers score the same way as the parent.
+    With prefix_trie_bytes set, batch() goes through a PrefixTrieEvaluator
+    (kept as self.prefix_trie) under that memory cap.
+    """
+
+    def __init__(
+        self,
+        input_set: ndarray,
+        target_set: ndarray,
+        num_qubits: int,
+        objectives: str = "fidelity",
+        fitness_mode: str | None = None,
+        prefix_trie_bytes: int | None = None,
+    ):
+        if objectives not in ("fidelity", "nsga"):
+            raise ValueError(f"Unknown objectives: {objectives!r}")
+        self.input_set = input_set
+        self.target_set = target_set
+        self.num_qubits = num_qubits
+        self.objectives = objectives
+        self.fitness_mode = resolve_fitness_mode(fitness_mode)
+        self.prefix_trie = None
+        if prefix_trie_bytes is not None:
+            self.prefix_trie = PrefixTrieEvaluator(
+                input_set, target_set, num_qubits, max_bytes=prefix_trie_bytes, fitness_mode=self.fitness_mode,
+            )
+
+    def _fitness_tuple(self, fidelity: float, gates: ndarray) -> tuple:
+        if self.objectives == "nsga":
+            return fidelity, count_active_depth(gates), count_non_identity_gates(gates)
+        return fidelity,
+
+    def __call__(self, individual) -> tuple:
+        gates = preprocess_gates(np.asarray(individual).reshape((-1, self.num_qubits)))
+        fidelity = run_quantum_algorithm_over_set(
+            self.input_set, self.target_set, self.num_qubits, gates, fitness_mode=self.fitness_mode,
+        )[0]
+        return self._fitness_tuple(fidelity, gates)
+
+    def batch(self, individuals: list) -> list[tuple]:
+        if not individuals:
+            return []
+        raw = np.asarray(individuals).reshape((len(individuals), -1, self.num_qubits))
+        gates = preprocess_gates_batch(raw)
+        if self.prefix_trie is not None:
+            fidelities = self.prefix_trie.evaluate(gates)
+        else:
+            fidelities = evaluate_population(
+                self.input_set, self.target_set, self.num_qubits, gates, fitness_mode=self.fitness_mode,
+            )
+        return [self._fitness_tuple(float(f), g) for f, g in zip(fidelities, gates)]
+
+
+class EvaluationBackend:
+    """Map-compatible evaluation strategy registered as a DEAP toolbox.map.
+
+    "builtin" is the serial builtin map, "thread" and "process" spread
+    individuals over a pool, and "batched" hands the whole list to the
+    evaluate function's batch() method (falling back to a serial map for
+    functions without one). Pools are created on first use and reused until
+    close(), so worker start-up is paid once per optimisation run rather
+    than once per generation.
+    """
+
+    def __init__(self, kind: str = "builtin", num_workers: int | None = None, chunks_per_worker: int = 4):
+        if kind not in EVALUATION_BACKENDS:
+            raise ValueError(f"Unknown evaluation backend: {kind!r}")
+        self.kind = kind
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.chunks_per_worker = chunks_per_worker
+        self._executor: Executor | None = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "thread":
+                self._executor = ThreadPoolExecutor(max_workers=self.num_workers)
+            else:
+                self._executor = ProcessPoolExecutor(max_workers=self.num_workers)
+        return self._executor
+
+    def map(self, func: Callable, iterable: Iterable) -> list:
+        items = list(iterable)
+        batch = _batch_method(func) if self.kind == "batched" else None
+        if batch is not None:
+            return batch(items)
+        if self.kind in ("builtin", "batched") or len(items) <= 1:
+            return list(map(func, items))
+
+        executor = self._get_executor()
+        if self.kind == "process":
+            chunksize = max(1, len(items) // (self.num_workers * self.chunks_per_worker))
+            return list(executor.map(func, items, chunksize=chunksize))
+        return list(executor.map(func, items))
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> "EvaluationBackend":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -1,4 +1,5 @@
 import time
+from concurrent.futures import ProcessPoolExecutor
 
 import numpy as np
 from numpy import ndarray
@@ -6,27 +7,163 @@ from scipy.optimize import minimize
 from scipy.special import softmax
 
 from quantum_ea.circuit import (
-    _H2, _T2, _I2,
-    _full_single_qubit_gate, _cnot_matrix,
-    initialise_statevector, compute_probabilities,
+    _H2, _T2,
+    _apply_gate_strided, _apply_single_qubit_gate_strided,
+    initialise_statevector,
 )
 from quantum_ea.gates import GateType, preprocess_gates
-from quantum_ea.fitness import run_quantum_algorithm_over_set, count_non_identity_gates
+from quantum_ea.fitness import (
+    count_non_identity_gates,
+    marked_item_indices,
+    resolve_fitness_mode,
+    run_quantum_algorithm_over_set,
+)
 from quantum_ea.optimizers.base import OptimizerBase, OptimizationResult
 
-# 2x2 base matrices for the 5 gate types
-_BASE_MATRICES_2x2 = {
-    GateType.IDENTITY: _I2,
-    GateType.T_GATE: _T2,
-    GateType.HADAMARD: _H2,
-}
+_T2_ADJOINT = _T2.conj().T
+
+
+# How GradientOptimizer runs its L-BFGS-B restarts
+RESTART_MODES = ("sequential", "batched", "process")
+
+
+def _gate_actions(sv: ndarray, qubit_index: int, num_qubits: int, adjoint: bool = False) -> ndarray:
+    """Return the (5, ..., dim) stack G_g sv (or G_g^H sv) over the gate types for one qubit.
+
+    Each action is an O(2^n) strided update; CNOTs that would leave the
+    register act as identity, matching the discrete simulator.
+    """
+    actions = np.repeat(sv[np.newaxis], len(GateType), axis=0)
+    _apply_single_qubit_gate_strided(actions[GateType.T_GATE], _T2_ADJOINT if adjoint else _T2, qubit_index, num_qubits)
+    _apply_single_qubit_gate_strided(actions[GateType.HADAMARD], _H2, qubit_index, num_qubits)
+    # CNOT is its own adjoint
+    _apply_gate_strided(actions[GateType.CNOT_DOWN], GateType.CNOT_DOWN, qubit_index, num_qubits)
+    _apply_gate_strided(actions[GateType.CNOT_UP], GateType.CNOT_UP, qubit_index, num_qubits)
+    return actions
+
+
+def _relaxed_fitness_and_grad_batch(logits: ndarray, sv_init: ndarray, marked_idx: int) -> tuple[ndarray, ndarray]:
+    """Relaxed fitness and logit gradient for an (R, T, Q, 5) stack of restarts.
+
+    Each (t, qubit) slot applies sum_g w_g G_g as a linear combination of
+    the five gate actions on the (R, dim) statevectors, so no 2^n x 2^n
+    matrix is formed. One forward sweep stores the states entering every
+    slot; one adjoint sweep then pulls the marked basis state back through
+    the slots, so the gradient costs about as much as a second forward pass.
+    """
+    num_restarts, time_steps, num_qubits, num_gate_types = logits.shape
+    dim = len(sv_init)
+    weights = softmax(logits, axis=3)
+
+    states = np.empty((time_steps, num_qubits, num_restarts, dim), dtype=complex)
+    sv = np.repeat(sv_init.astype(complex)[np.newaxis], num_restarts, axis=0)
+    for t in range(time_steps):
+        for qi in range(num_qubits):
+            states[t, qi] = sv
+            sv = np.einsum("rg,grd->rd", weights[:, t, qi], _gate_actions(sv, qi, num_qubits))
+
+    amplitude = sv[:, marked_idx]
+    fitness = np.abs(amplitude) ** 2
+
+    # phi is the marked basis state pulled back through the later slots, so
+    # d|a|^2/dw_g = 2 Re(conj(a) phi^H G_g psi) = 2 Re(conj(a) (G_g^H phi)^H psi)
+    grad_weights = np.empty_like(weights)
+    phi = np.zeros((num_restarts, dim), dtype=complex)
+    phi[:, marked_idx] = 1.0
+    for t in reversed(range(time_steps)):
+        for qi in reversed(range(num_qubits)):
+            adjoint_actions = _gate_actions(phi, qi, num_qubits, adjoint=True)
+            overlaps = np.einsum("grd,rd->rg", adjoint_actions.conj(), states[t, qi])
+            grad_weights[:, t, qi] = 2.0 * np.real(np.conj(amplitude)[:, np.newaxis] * overlaps)
+            phi = np.einsum("rg,grd->rd", weights[:, t, qi], adjoint_actions)
+
+    # Chain rule through the softmax over each slot's gate logits
+    weighted_mean = np.sum(weights * grad_weights, axis=3, keepdims=True)
+    return fitness, weights * (grad_weights - weighted_mean)
+
+
+def _relaxed_fitness_and_grad(logits: ndarray, sv_init: ndarray, marked_idx: int) -> tuple[float, ndarray]:
+    """Return the softmax-relaxed circuit's marked-state probability and its (T, Q, 5) logit gradient."""
+    fitness, grad = _relaxed_fitness_and_grad_batch(logits[np.newaxis], sv_init, marked_idx)
+    return float(fitness[0]), grad[0]
+
+
+def _relaxed_set_fitness_and_grad_batch(logits: ndarray, sv_inits: ndarray, marked: ndarray) -> tuple[ndarray, ndarray]:
+    """Mean of _relaxed_fitness_and_grad_batch over the (input statevector, marked state) pairs."""
+    results = [_relaxed_fitness_and_grad_batch(logits, sv_init, int(idx)) for sv_init, idx in zip(sv_inits, marked)]
+    return np.mean([fitness for fitness, _ in results], axis=0), np.mean([grad for _, grad in results], axis=0)
+
+
+def _run_restart(x0: ndarray, shape: tuple, sv_inits: ndarray, marked: ndarray, budget: int) -> tuple:
+    """Run one L-BFGS-B restart; returns (best_fitness, best_logits, fitness_history)."""
+    best_fitness = -1.0
+    best_logits = None
+    fitness_history: list[float] = []
+
+    def neg_fitness_and_grad(params_flat):
+        nonlocal best_fitness, best_logits
+        logits = params_flat.reshape(shape)
+        fitness, grad_logits = _relaxed_set_fitness_and_grad_batch(logits[np.newaxis], sv_inits, marked)
+        fitness, grad_logits = float(fitness[0]), grad_logits[0]
+
+        if fitness > best_fitness:
+            best_fitness = fitness
+            best_logits = logits.copy()
+        fitness_history.append(best_fitness)
+
+        return -fitness, -grad_logits.ravel()
+
+    minimize(
+        neg_fitness_and_grad, x0, method="L-BFGS-B", jac=True,
+        options={"maxfun": budget, "maxiter": budget},
+    )
+    return best_fitness, best_logits, fitness_history
+
+
+def _run_batched_restarts(x0s: ndarray, shape: tuple, sv_inits: ndarray, marked: ndarray, budget: int) -> tuple:
+    """Run all restarts as one L-BFGS-B problem over their stacked logits.
+
+    The objective is the sum of the restarts' relaxed fitnesses, which is
+    separable, so each block of the gradient only depends on its own
+    restart. Every call evaluates all R restarts in one batched sweep and
+    counts as R evaluations.
+    """
+    num_restarts = len(x0s)
+    best_fitness = -1.0
+    best_logits = None
+    fitness_history: list[float] = []
+
+    def neg_fitness_and_grad(params_flat):
+        nonlocal best_fitness, best_logits
+        logits = params_flat.reshape((num_restarts,) + shape)
+        fitness, grad_logits = _relaxed_set_fitness_and_grad_batch(logits, sv_inits, marked)
+
+        for r in range(num_restarts):
+            if fitness[r] > best_fitness:
+                best_fitness = float(fitness[r])
+                best_logits = logits[r].copy()
+            fitness_history.append(best_fitness)
+
+        return -float(np.sum(fitness)), -grad_logits.ravel()
+
+    minimize(
+        neg_fitness_and_grad, x0s.ravel(), method="L-BFGS-B", jac=True,
+        options={"maxfun": budget, "maxiter": budget},
+    )
+    return best_fitness, best_logits, fitness_history
 
 
 class GradientOptimizer(OptimizerBase):
     name = "gradient_based"
 
-    def __init__(self, num_restarts: int = 5):
+    def __init__(self, num_restarts: int = 5, restart_mode: str = "sequential", num_workers: int | None = None):
+        if restart_mode not in RESTART_MODES:
+            raise ValueError(f"Unknown restart mode: {restart_mode!r}")
         self.num_restarts = num_restarts
+        # "batched" advances all restarts together as (R, 2^n) statevectors;
+        # "process" runs each restart in a worker process
+        self.restart_mode = restart_mode
+        self.num_workers = num_workers
 
     def optimize(
         self,
@@ -39,92 +176,40 @@ class GradientOptimizer(OptimizerBase):
     ) -> OptimizationResult:
         rng = np.random.default_rng(seed)
         num_gate_types = len(GateType)
+        shape = (time_steps, num_qubits, num_gate_types)
         num_params = time_steps * num_qubits * num_gate_types
 
         # Budget split across restarts
         budget_per_restart = max(10, evaluation_budget // self.num_restarts)
 
-        # Pre-compute full gate matrices for single-qubit gates
-        full_single_gates = {}
-        for gt in [GateType.IDENTITY, GateType.T_GATE, GateType.HADAMARD]:
-            for qi in range(num_qubits):
-                full_single_gates[(gt, qi)] = _full_single_qubit_gate(
-                    _BASE_MATRICES_2x2[gt], qi, num_qubits
-                )
-
-        # Pre-compute CNOT matrices
-        cnot_down_gates = {}
-        cnot_up_gates = {}
-        for qi in range(num_qubits):
-            if qi + 1 < num_qubits:
-                cnot_down_gates[qi] = _cnot_matrix(qi, qi + 1, num_qubits)
-            if qi > 0:
-                cnot_up_gates[qi] = _cnot_matrix(qi - 1, qi, num_qubits)
-
-        dim = 2 ** num_qubits
-        target_dist = target_set[0]
-        marked_idx = np.argmax(target_dist)
-        sv_init = initialise_statevector(input_set[0], num_qubits)
-
-        eval_count = [0]
-        best_fitness = [-1.0]
-        best_logits = [None]
-        fitness_history: list[float] = []
-
-        def _get_gate_matrices_for_qubit(qi: int) -> list[ndarray]:
-            """Return list of 5 full gate matrices for qubit qi."""
-            matrices = []
-            for gt in range(num_gate_types):
-                if gt <= GateType.HADAMARD:
-                    matrices.append(full_single_gates[(gt, qi)])
-                elif gt == GateType.CNOT_DOWN:
-                    matrices.append(cnot_down_gates.get(qi, np.eye(dim, dtype=complex)))
-                elif gt == GateType.CNOT_UP:
-                    matrices.append(cnot_up_gates.get(qi, np.eye(dim, dtype=complex)))
-                else:
-                    matrices.append(np.eye(dim, dtype=complex))
-            return matrices
-
-        qubit_gate_matrices = [_get_gate_matrices_for_qubit(qi) for qi in range(num_qubits)]
-
-        def neg_fitness(params_flat):
-            eval_count[0] += 1
-            logits = params_flat.reshape(time_steps, num_qubits, num_gate_types)
-            sv = sv_init.copy()
-
-            for t in range(time_steps):
-                for qi in range(num_qubits):
-                    weights = softmax(logits[t, qi])
-                    # Weighted sum of gate matrices
-                    mat = np.zeros((dim, dim), dtype=complex)
-                    for g in range(num_gate_types):
-                        mat += weights[g] * qubit_gate_matrices[qi][g]
-                    sv = mat @ sv
-
-            probs = np.abs(sv) ** 2
-            fitness = float(probs[marked_idx])
-
-            if fitness > best_fitness[0]:
-                best_fitness[0] = fitness
-                best_logits[0] = logits.copy()
-            fitness_history.append(best_fitness[0])
-
-            return -fitness
+        # The relaxed objective scores the same input rows as the discrete fitness mode
+        num_pairs = len(input_set) if resolve_fitness_mode(None) == "mean" else 1
+        marked = marked_item_indices(target_set[:num_pairs])
+        sv_inits = np.stack([initialise_statevector(input_set[k], num_qubits) for k in range(num_pairs)])
 
         start = time.perf_counter()
 
-        for restart in range(self.num_restarts):
-            x0 = rng.standard_normal(num_params) * 0.1
-            minimize(
-                neg_fitness, x0, method="L-BFGS-B",
-                options={"maxfun": budget_per_restart, "maxiter": budget_per_restart},
-            )
+        x0s = np.stack([rng.standard_normal(num_params) * 0.1 for _ in range(self.num_restarts)])
+        if self.restart_mode == "batched":
+            runs = [_run_batched_restarts(x0s, shape, sv_inits, marked, budget_per_restart)]
+        else:
+            args = [(x0, shape, sv_inits, marked, budget_per_restart) for x0 in x0s]
+            if self.restart_mode == "process" and self.num_restarts > 1:
+                with ProcessPoolExecutor(max_workers=self.num_workers) as executor:
+                    runs = list(executor.map(_run_restart, *zip(*args)))
+            else:
+                runs = [_run_restart(*a) for a in args]
+
+        # Per-restart best-so-far histories merged in restart order
+        fitness_history = [float(f) for f in np.maximum.accumulate(np.concatenate([run[2] for run in runs]))]
+        best_run = max(runs, key=lambda run: run[0])
+        best_logits = best_run[1]
 
         elapsed = time.perf_counter() - start
 
         # Discretize best solution
-        if best_logits[0] is not None:
-            discrete = np.argmax(best_logits[0], axis=2).astype(int)
+        if best_logits is not None:
+            discrete = np.argmax(best_logits, axis=2).astype(int)
             discrete = preprocess_gates(discrete)
             disc_fitness = run_quantum_algorithm_over_set(
                 input_set, target_set, num_qubits, discrete
@@ -136,7 +221,7 @@ class GradientOptimizer(OptimizerBase):
         return OptimizationResult(
             best_gate_array=discrete,
             best_fitness=disc_fitness,
-            total_evaluations=eval_count[0],
+            total_evaluations=len(fitness_history),
             wall_clock_seconds=elapsed,
             circuit_complexity=count_non_identity_gates(discrete),
             fitness_history=fitness_history,
@@ -3,13 +3,15 @@ import time
 import numpy as np
 from numpy import ndarray
 
-from quantum_ea.gates import GateType, preprocess_gates
+from quantum_ea.gates import GateType, preprocess_gates_batch
 from quantum_ea.fitness import (
+    evaluate_population,
     run_quantum_algorithm_over_set,
     count_non_identity_gates,
     count_active_depth,
     count_cnot_gates,
 )
+from quantum_ea.incremental import IncrementalEvaluator
 from quantum_ea.optimizers.base import OptimizerBase, OptimizationResult
 
 
@@ -32,11 +34,16 @@ class MAPElitesOptimizer(OptimizerBase):
         density_bins: int = 10,
         initial_population: int = 100,
         mutation_rate: float = 0.15,
+        incremental: bool = False,
+        checkpoint_bytes: int = 64 * 2**20,
     ):
         self.depth_bins = depth_bins
         self.density_bins = density_bins
         self.initial_population = initial_population
         self.mutation_rate = mutation_rate
+        # Resume children from their parent's stored statevectors (see IncrementalEvaluator)
+        self.incremental = incremental
+        self.checkpoint_bytes = checkpoint_bytes
         # Archive: (row, col) -> (fitness, gate_array, (active_depth, entanglement_density))
         self.last_archive: dict[tuple[int, int], tuple[float, ndarray, tuple[int, float]]] = {}
 
@@ -52,7 +59,7 @@ class MAPElitesOptimizer(OptimizerBase):
         num_gate_types = len(GateType)
         mask = rng.random(child.shape) < self.mutation_rate
         child[mask] = rng.integers(0, num_gate_types, size=mask.sum())
-        return preprocess_gates(child)
+        return preprocess_gates_batch(child[np.newaxis])[0]
 
     def optimize(
         self,
@@ -73,15 +80,17 @@ class MAPElitesOptimizer(OptimizerBase):
         evals_used = 0
 
         start = time.perf_counter()
+        evaluator = None
+        if self.incremental:
+            evaluator = IncrementalEvaluator(input_set, target_set, num_qubits, max_bytes=self.checkpoint_bytes)
 
         # Phase 1: Random seeding
         seed_count = min(self.initial_population, evaluation_budget)
-        for _ in range(seed_count):
-            raw = rng.integers(0, num_gate_types, size=(time_steps, num_qubits))
-            gates = preprocess_gates(raw)
-            fitness = run_quantum_algorithm_over_set(
-                input_set, target_set, num_qubits, gates,
-            )[0]
+        raw = rng.integers(0, num_gate_types, size=(seed_count, time_steps, num_qubits))
+        seed_gates = preprocess_gates_batch(raw)
+        seed_fitness = evaluate_population(input_set, target_set, num_qubits, seed_gates)
+        for gates, fitness in zip(seed_gates, seed_fitness):
+            fitness = float(fitness)
             evals_used += 1
 
             depth, density = _compute_descriptors(gates)
@@ -104,9 +113,12 @@ class MAPElitesOptimizer(OptimizerBase):
             parent_gates = archive[parent_cell][1]
 
             child_gates = self._mutate(parent_gates, rng)
-            fitness = run_quantum_algorithm_over_set(
-                input_set, target_set, num_qubits, child_gates,
-            )[0]
+            if evaluator is not None:
+                fitness = evaluator.evaluate(child_gates, parent=parent_gates)
+            else:
+                fitness = run_quantum_algorithm_over_set(
+                    input_set, target_set, num_qubits, child_gates,
+                )[0]
             evals_used += 1
 
             depth, density = _compute_descriptors(child_gates)
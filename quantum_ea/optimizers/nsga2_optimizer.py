@@ -6,12 +6,10 @@ from deap import algorithms, tools, base, creator
 from numpy import ndarray
 
 from quantum_ea.gates import GateType, preprocess_gates
-from quantum_ea.fitness import (
-    run_quantum_algorithm_over_set,
-    count_non_identity_gates,
-    count_active_depth,
-)
+from quantum_ea.fitness import count_non_identity_gates
+from quantum_ea.operators import MUTATION_OPERATORS, register_mutation
 from quantum_ea.optimizers.base import OptimizerBase, OptimizationResult
+from quantum_ea.optimizers.evaluation import EvaluationBackend, GateArrayEvaluator
 
 # Separate DEAP creator classes to avoid conflict with EAOptimizer's FitnessMax
 if not hasattr(creator, "FitnessNSGA"):
@@ -34,11 +32,21 @@ class NSGA2Optimizer(OptimizerBase):
         breeding_probability: float = 0.5,
         mutation_probability: float = 0.2,
         swap_probability: float = 0.1,
+        evaluation_backend: str = "batched",
+        num_workers: int | None = None,
+        mutation: str = "categorical",
+        transition_weights: list[list[float]] | None = None,
     ):
+        if mutation not in MUTATION_OPERATORS:
+            raise ValueError(f"Unknown mutation operator: {mutation!r}")
         self.population_size = population_size
         self.breeding_probability = breeding_probability
         self.mutation_probability = mutation_probability
         self.swap_probability = swap_probability
+        self.evaluation_backend = evaluation_backend
+        self.num_workers = num_workers
+        self.mutation = mutation
+        self.transition_weights = transition_weights
         self.last_pareto_front: list[tuple[float, int, int, ndarray]] = []
 
     def optimize(
@@ -66,54 +74,48 @@ class NSGA2Optimizer(OptimizerBase):
         )
         toolbox.register("population", tools.initRepeat, list, toolbox.individual)
 
-        def evaluate(individual):
-            gates = _dna_to_gates(individual, num_qubits)
-            fidelity = run_quantum_algorithm_over_set(
-                input_set, target_set, num_qubits, gates,
-            )[0]
-            depth = count_active_depth(gates)
-            gate_count = count_non_identity_gates(gates)
-            return fidelity, depth, gate_count
-
-        toolbox.register("evaluate", evaluate)
+        toolbox.register("evaluate", GateArrayEvaluator(input_set, target_set, num_qubits, objectives="nsga"))
         toolbox.register("mate", tools.cxTwoPoint)
-        toolbox.register("mutate", tools.mutFlipBit, indpb=self.swap_probability)
+        register_mutation(toolbox, self.mutation, self.swap_probability, self.transition_weights)
         toolbox.register("select", tools.selNSGA2)
 
-        pop = toolbox.population(n=self.population_size)
+        with EvaluationBackend(self.evaluation_backend, self.num_workers) as backend:
+            toolbox.register("map", backend.map)
+
+            pop = toolbox.population(n=self.population_size)
 
-        # Evaluate initial population
-        fitnesses = list(map(toolbox.evaluate, pop))
-        for ind, fit in zip(pop, fitnesses):
-            ind.fitness.values = fit
+            # Evaluate initial population
+            fitnesses = toolbox.map(toolbox.evaluate, pop)
+            for ind, fit in zip(pop, fitnesses):
+                ind.fitness.values = fit
 
-        # Track best fidelity per generation
-        fitness_history = []
-        best_fidelity_so_far = max(f[0] for f in fitnesses)
-        fitness_history.append(best_fidelity_so_far)
+            # Track best fidelity per generation
+            fitness_history = []
+            best_fidelity_so_far = max(f[0] for f in fitnesses)
+            fitness_history.append(best_fidelity_so_far)
 
-        start = time.perf_counter()
+            start = time.perf_counter()
 
-        for gen in range(ngen):
-            offspring = algorithms.varOr(
-                pop, toolbox,
-                lambda_=self.population_size,
-                cxpb=self.breeding_probability,
-                mutpb=self.mutation_probability,
-            )
+            for gen in range(ngen):
+                offspring = algorithms.varOr(
+                    pop, toolbox,
+                    lambda_=self.population_size,
+                    cxpb=self.breeding_probability,
+                    mutpb=self.mutation_probability,
+                )
 
-            # Evaluate offspring that don't have fitness
-            invalid = [ind for ind in offspring if not ind.fitness.valid]
-            fitnesses = list(map(toolbox.evaluate, invalid))
-            for ind, fit in zip(invalid, fitnesses):
-                ind.fitness.values = fit
+                # Evaluate offspring that don't have fitness
+                invalid = [ind for ind in offspring if not ind.fitness.valid]
+                fitnesses = toolbox.map(toolbox.evaluate, invalid)
+                for ind, fit in zip(invalid, fitnesses):
+                    ind.fitness.values = fit
 
-            # Mu+Lambda selection
-            pop = toolbox.select(pop + offspring, self.population_size)
+                # Mu+Lambda selection
+                pop = toolbox.select(pop + offspring, self.population_size)
 
-            gen_best = max(ind.fitness.values[0] for ind in pop)
-            best_fidelity_so_far = max(best_fidelity_so_far, gen_best)
-            fitness_history.append(best_fidelity_so_far)
+                gen_best = max(ind.fitness.values[0] for ind in pop)
+                best_fidelity_so_far = max(best_fidelity_so_far, gen_best)
+                fitness_history.append(best_fidelity_so_far)
 
         elapsed = time.perf_counter() - start
 
@@ -3,14 +3,17 @@ import time
 import numpy as np
 from numpy import ndarray
 
-from quantum_ea.gates import GateType, preprocess_gates
-from quantum_ea.fitness import run_quantum_algorithm_over_set, count_non_identity_gates
+from quantum_ea.gates import GateType, preprocess_gates_batch
+from quantum_ea.fitness import evaluate_population, count_non_identity_gates
 from quantum_ea.optimizers.base import OptimizerBase, OptimizationResult
 
 
 class RandomSearchOptimizer(OptimizerBase):
     name = "random_search"
 
+    def __init__(self, batch_size: int = 100):
+        self.batch_size = batch_size
+
     def optimize(
         self,
         input_set: ndarray,
@@ -28,18 +31,19 @@ class RandomSearchOptimizer(OptimizerBase):
         fitness_history: list[float] = []
 
         start = time.perf_counter()
-        for i in range(evaluation_budget):
-            raw = rng.integers(0, num_gate_types, size=(time_steps, num_qubits))
-            gate_array = preprocess_gates(raw)
-            fitness_val = run_quantum_algorithm_over_set(
-                input_set, target_set, num_qubits, gate_array
-            )[0]
-
-            if fitness_val > best_fitness:
-                best_fitness = fitness_val
-                best_gates = gate_array.copy()
-
-            fitness_history.append(best_fitness)
+        for batch_start in range(0, evaluation_budget, self.batch_size):
+            batch_size = min(self.batch_size, evaluation_budget - batch_start)
+            raw = rng.integers(0, num_gate_types, size=(batch_size, time_steps, num_qubits))
+            gate_arrays = preprocess_gates_batch(raw)
+            fitness_values = evaluate_population(input_set, target_set, num_qubits, gate_arrays)
+
+            for gate_array, fitness_val in zip(gate_arrays, fitness_values):
+                fitness_val = float(fitness_val)
+                if fitness_val > best_fitness:
+                    best_fitness = fitness_val
+                    best_gates = gate_array.copy()
+
+                fitness_history.append(best_fitness)
 
         elapsed = time.perf_counter() - start
 
@@ -0,0 +1,114 @@
+import numpy as np
+from numpy import ndarray
+
+from quantum_ea.circuit import apply_quantum_gates_batch
+from quantum_ea.fitness import evaluate_population, resolve_fitness_mode
+from quantum_ea.gates import GateType
+
+# Largest row width whose rows are folded into one int64 trie key with the parent node
+_MAX_PACKED_ROW_LENGTH = 16
+
+
+def _child_nodes(parents: ndarray, rows: ndarray) -> tuple[ndarray, ndarray, ndarray]:
+    """Group (parent node, row) pairs; returns the new nodes' parents and rows and each member's node."""
+    row_length = rows.shape[1]
+    if row_length <= _MAX_PACKED_ROW_LENGTH:
+        radix = len(GateType) ** np.arange(row_length, dtype=np.int64)
+        keys = parents.astype(np.int64) * len(GateType) ** row_length + rows.astype(np.int64) @ radix
+        _, first, nodes = np.unique(keys, return_index=True, return_inverse=True)
+    else:
+        keys = np.column_stack([parents, rows])
+        _, first, nodes = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    return parents[first], rows[first], nodes.reshape(-1)
+
+
+def apply_quantum_gates_trie(
+    statevector: ndarray,
+    num_qubits: int,
+    gate_arrays: ndarray,
+    max_bytes: int = 64 * 2**20,
+) -> tuple[ndarray, int]:
+    """Run P gate arrays of shape (P, T, Q) from one shared (..., 2^n) start state.
+
+    Circuits are merged into a row-prefix trie that is simulated level by
+    level: each distinct prefix is advanced once and its statevector is
+    branched to the children that extend it. Circuits are processed in
+    lexicographic order, in chunks small enough that the two live trie
+    levels fit in max_bytes.
+
+    Returns the (P, ..., 2^n) final statevectors and the number of row
+    applications simulated, against P * T for simulating every circuit.
+    """
+    gate_arrays = np.asarray(gate_arrays)
+    statevector = np.asarray(statevector, dtype=complex)
+    num_circuits, time_steps, _ = gate_arrays.shape
+    final = np.empty((num_circuits,) + statevector.shape, dtype=complex)
+    if num_circuits == 0:
+        return final, 0
+
+    # Lexicographic order keeps circuits with shared prefixes in the same chunk
+    order = np.lexsort(gate_arrays.reshape((num_circuits, -1)).T[::-1])
+    chunk = max(1, max_bytes // (2 * statevector.nbytes))
+    rows_simulated = 0
+    for start in range(0, num_circuits, chunk):
+        members = order[start:start + chunk]
+        states = statevector[np.newaxis]
+        nodes = np.zeros(len(members), dtype=np.intp)
+        for t in range(time_steps):
+            parents, rows, nodes = _child_nodes(nodes, gate_arrays[members, t])
+            states = apply_quantum_gates_batch(states[parents], num_qubits, rows[:, np.newaxis, :])
+            rows_simulated += len(parents)
+        final[members] = states[nodes]
+    return final, rows_simulated
+
+
+class PrefixTrieEvaluator:
+    """Population evaluator that simulates each distinct row prefix once.
+
+    evaluate() scores a (P, T, Q) stack like evaluate_population (same
+    fitness cache, duplicate grouping and blank-row penalty), but the
+    circuits left to simulate run through apply_quantum_gates_trie, so
+    offspring of the same tournament winners share the statevectors of
+    their common leading rows. The trie is built on the gate arrays as
+    given rather than their canonical form: crossover and mutation keep
+    gates at their row, while layering can move a late change forward and
+    split a shared prefix. rows_requested counts P * T row applications
+    per call and rows_simulated the ones performed, so row_savings also
+    includes circuits served by the cache or grouped as duplicates.
+    """
+
+    def __init__(
+        self,
+        input_set: ndarray,
+        target_set: ndarray,
+        num_qubits: int,
+        max_bytes: int = 64 * 2**20,
+        fitness_mode: str | None = None,
+    ):
+        self.input_set = input_set
+        self.target_set = target_set
+        self.num_qubits = num_qubits
+        self.max_bytes = max_bytes
+        self.fitness_mode = resolve_fitness_mode(fitness_mode)
+        self.rows_simulated = 0
+        self.rows_requested = 0
+
+    @property
+    def row_savings(self) -> float:
+        """Fraction of requested row applications that were not simulated."""
+        if not self.rows_requested:
+            return 0.0
+        return 1.0 - self.rows_simulated / self.rows_requested
+
+    def evaluate(self, gate_arrays: ndarray) -> ndarray:
+        gate_arrays = np.asarray(gate_arrays)
+        self.rows_requested += gate_arrays.shape[0] * gate_arrays.shape[1]
+        return evaluate_population(
+            self.input_set, self.target_set, self.num_qubits, gate_arrays,
+            fitness_mode=self.fitness_mode, simulator=self._simulate,
+        )
+
+    def _simulate(self, statevector: ndarray, num_qubits: int, gate_arrays: ndarray) -> ndarray:
+        final, rows_simulated = apply_quantum_gates_trie(statevector, num_qubits, gate_arrays, self.max_bytes)
+        self.rows_simulated += rows_simulated
+        return final
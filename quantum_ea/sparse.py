@@ -0,0 +1,137 @@
+"""Sparse-amplitude simulation of gate arrays from basis-state inputs.
+
+A non-zero input row starts the circuit in a single computational basis
+state, and T gates and CNOTs never change the number of non-zero
+amplitudes: T rescales them and a CNOT permutes their indices. Only a
+Hadamard can double them (or merge them again). SparseStatevector keeps
+the non-zero amplitudes as parallel index and amplitude arrays, so a
+circuit with h Hadamards costs O(min(2^h, 2^n)) per gate. Once more than
+density_threshold of the 2^n amplitudes are non-zero the sparse form has
+no advantage left, and the state switches to a dense vector for the
+remaining gates.
+"""
+import numpy as np
+from numpy import ndarray
+
+from quantum_ea.circuit import _apply_gate_strided
+from quantum_ea.gates import GateType
+
+SPARSE_DENSITY_THRESHOLD = 1 / 16
+# Amplitudes smaller than this after a Hadamard are cancellations and are dropped
+_AMPLITUDE_CUTOFF = 1e-12
+_T_PHASE = np.exp(1j * np.pi / 4)
+
+
+class SparseStatevector:
+    """n-qubit state as its non-zero amplitudes, or a dense vector once it fills up.
+
+    While sparse, indices holds distinct basis-state indices (int64, so at
+    most 62 qubits) and amplitudes their values, in no particular order;
+    dense is None. After the switch, dense is the (2^n,) statevector and
+    indices/amplitudes are None.
+    """
+
+    def __init__(
+        self,
+        num_qubits: int,
+        indices: ndarray,
+        amplitudes: ndarray,
+        density_threshold: float = SPARSE_DENSITY_THRESHOLD,
+    ):
+        self.num_qubits = num_qubits
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.amplitudes = np.asarray(amplitudes, dtype=complex)
+        self.density_threshold = density_threshold
+        self.dense = None
+        self._densify_if_full()
+
+    @classmethod
+    def from_input_state(
+        cls, input_state: ndarray, num_qubits: int, density_threshold: float = SPARSE_DENSITY_THRESHOLD,
+    ) -> "SparseStatevector":
+        """Sparse form of initialise_statevector(input_state, num_qubits).
+
+        An all-zero input is the uniform superposition, which is dense from
+        the start; otherwise the qubits marked 1 give the single basis state.
+        """
+        if np.all(np.asarray(input_state) == 0):
+            dim = 2 ** num_qubits
+            return cls(num_qubits, np.arange(dim), np.full(dim, 1.0 / np.sqrt(dim)), density_threshold)
+        index = sum(1 << i for i, value in enumerate(input_state[:num_qubits]) if value == 1)
+        return cls(num_qubits, [index], [1.0], density_threshold)
+
+    @property
+    def nnz(self) -> int:
+        """Number of stored amplitudes: the non-zero ones, or 2^n once dense."""
+        return len(self.dense) if self.dense is not None else len(self.indices)
+
+    def _densify_if_full(self) -> None:
+        if self.dense is None and len(self.indices) > self.density_threshold * 2 ** self.num_qubits:
+            self.dense = self.to_dense()
+            self.indices = self.amplitudes = None
+
+    def to_dense(self) -> ndarray:
+        if self.dense is not None:
+            return self.dense.copy()
+        sv = np.zeros(2 ** self.num_qubits, dtype=complex)
+        sv[self.indices] = self.amplitudes
+        return sv
+
+    def hadamard(self, qubit: int) -> None:
+        bit = np.int64(1) << qubit
+        low = self.indices & ~bit
+        sign = np.where(self.indices & bit, -1.0, 1.0)
+        merged, inverse = np.unique(np.concatenate([low, low | bit]), return_inverse=True)
+        contributions = np.concatenate([self.amplitudes, sign * self.amplitudes]) / np.sqrt(2)
+        inverse = inverse.reshape(-1)
+        amplitudes = (
+            np.bincount(inverse, contributions.real, len(merged))
+            + 1j * np.bincount(inverse, contributions.imag, len(merged))
+        )
+        keep = np.abs(amplitudes) > _AMPLITUDE_CUTOFF
+        self.indices, self.amplitudes = merged[keep], amplitudes[keep]
+
+    def t_gate(self, qubit: int) -> None:
+        self.amplitudes[(self.indices >> qubit) & 1 == 1] *= _T_PHASE
+
+    def cnot(self, control: int, target: int) -> None:
+        self.indices ^= ((self.indices >> control) & 1) << target
+
+    def apply_gate_array(self, gate_array: ndarray) -> None:
+        """Apply gate_array rows/cols like apply_quantum_gates, going dense as soon as the state fills up."""
+        num_qubits = self.num_qubits
+        for row in np.asarray(gate_array).tolist():
+            for qubit_index, gate in enumerate(row):
+                if self.dense is not None:
+                    _apply_gate_strided(self.dense, gate, qubit_index, num_qubits)
+                elif gate == GateType.HADAMARD:
+                    # Only a Hadamard adds amplitudes, so the fill is checked after each one
+                    self.hadamard(qubit_index)
+                    self._densify_if_full()
+                elif gate == GateType.T_GATE:
+                    self.t_gate(qubit_index)
+                elif gate == GateType.CNOT_DOWN:
+                    if qubit_index + 1 < num_qubits:
+                        self.cnot(qubit_index, qubit_index + 1)
+                elif gate == GateType.CNOT_UP:
+                    if qubit_index > 0:
+                        self.cnot(qubit_index - 1, qubit_index)
+
+    def amplitude(self, index: int) -> complex:
+        if self.dense is not None:
+            return complex(self.dense[index])
+        match = self.amplitudes[self.indices == index]
+        return complex(match[0]) if len(match) else 0j
+
+
+def sparse_marked_probability(
+    input_state: ndarray,
+    num_qubits: int,
+    gate_array: ndarray,
+    marked_index: int,
+    density_threshold: float = SPARSE_DENSITY_THRESHOLD,
+) -> float:
+    """P(marked_index) after gate_array acts on initialise_statevector(input_state)."""
+    state = SparseStatevector.from_input_state(input_state, num_qubits, density_threshold)
+    state.apply_gate_array(gate_array)
+    return float(abs(state.amplitude(marked_index)) ** 2)
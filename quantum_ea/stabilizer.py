@@ -0,0 +1,296 @@
+"""Stabilizer-tableau simulation of T-free gate arrays.
+
+Apart from T_GATE, every gate in GateType (H and the two CNOTs) is a
+Clifford gate, so a T-free circuit maps the initial states used by the
+fitness functions (basis states and the uniform superposition) to
+stabilizer states. Those are tracked with the Aaronson-Gottesman tableau
+in O(n^2) memory and O(n) work per gate, and a basis-state probability is
+read off with forced Z measurements in O(n^3), against the O(2^n) of a
+statevector.
+
+Circuits with a few T gates use the stabilizer-rank split
+T = c0 I + c1 Z: the circuit becomes a sum of 2^t Clifford circuits. Each
+inserted Z is moved to the end of the circuit as a Pauli (its Pauli
+frame), so every term is a Pauli applied to the same stabilizer state and
+the marked amplitude is a sum of 2^t relative stabilizer amplitudes.
+"""
+import numpy as np
+from numpy import ndarray
+
+from quantum_ea.gates import GateType
+
+# T = _T_IDENTITY_WEIGHT * I + _T_Z_WEIGHT * Z
+_T_IDENTITY_WEIGHT = (1 + np.exp(1j * np.pi / 4)) / 2
+_T_Z_WEIGHT = (1 - np.exp(1j * np.pi / 4)) / 2
+
+
+def is_clifford(gate_array: ndarray) -> bool:
+    """True if gate_array holds no T gates, i.e. it is a stabilizer circuit."""
+    return not np.any(np.asarray(gate_array) == GateType.T_GATE)
+
+
+class StabilizerTableau:
+    """Aaronson-Gottesman tableau of an n-qubit stabilizer state.
+
+    Rows 0..n-1 are destabilizers and rows n..2n-1 stabilizers; row 2n is
+    scratch space for deterministic measurements. Each row is a Pauli
+    product given by its x and z bits per qubit and a sign bit r. Qubit q
+    is bit q of a basis-state index, as in quantum_ea.circuit.
+    """
+
+    def __init__(self, num_qubits: int):
+        self.num_qubits = num_qubits
+        self.x = np.zeros((2 * num_qubits + 1, num_qubits), dtype=np.uint8)
+        self.z = np.zeros((2 * num_qubits + 1, num_qubits), dtype=np.uint8)
+        self.r = np.zeros(2 * num_qubits + 1, dtype=np.uint8)
+        qubits = np.arange(num_qubits)
+        self.x[qubits, qubits] = 1
+        self.z[num_qubits + qubits, qubits] = 1
+
+    @classmethod
+    def from_input_state(cls, input_state: ndarray, num_qubits: int) -> "StabilizerTableau":
+        """Tableau of initialise_statevector(input_state, num_qubits).
+
+        An all-zero input is the uniform superposition; otherwise the qubits
+        marked 1 are flipped from |0...0>.
+        """
+        tableau = cls(num_qubits)
+        if np.all(np.asarray(input_state) == 0):
+            for qubit in range(num_qubits):
+                tableau.hadamard(qubit)
+        else:
+            for qubit, value in enumerate(input_state[:num_qubits]):
+                if value == 1:
+                    tableau.pauli_x(qubit)
+        return tableau
+
+    def copy(self) -> "StabilizerTableau":
+        tableau = StabilizerTableau.__new__(StabilizerTableau)
+        tableau.num_qubits = self.num_qubits
+        tableau.x, tableau.z, tableau.r = self.x.copy(), self.z.copy(), self.r.copy()
+        return tableau
+
+    def pauli_x(self, qubit: int) -> None:
+        self.r ^= self.z[:, qubit]
+
+    def hadamard(self, qubit: int) -> None:
+        self.r ^= self.x[:, qubit] & self.z[:, qubit]
+        self.x[:, qubit], self.z[:, qubit] = self.z[:, qubit].copy(), self.x[:, qubit].copy()
+
+    def cnot(self, control: int, target: int) -> None:
+        x_c, x_t, z_c, z_t = self.x[:, control], self.x[:, target], self.z[:, control], self.z[:, target]
+        self.r ^= x_c & z_t & (x_t ^ z_c ^ 1)
+        self.x[:, target] ^= x_c
+        self.z[:, control] ^= z_t
+
+    def apply_gate_array(self, gate_array: ndarray) -> None:
+        """Apply gate_array rows/cols like apply_quantum_gates; raises ValueError on T gates."""
+        num_qubits = self.num_qubits
+        for row in np.asarray(gate_array).tolist():
+            for qubit_index, gate in enumerate(row):
+                if gate == GateType.HADAMARD:
+                    self.hadamard(qubit_index)
+                elif gate == GateType.CNOT_DOWN:
+                    if qubit_index + 1 < num_qubits:
+                        self.cnot(qubit_index, qubit_index + 1)
+                elif gate == GateType.CNOT_UP:
+                    if qubit_index > 0:
+                        self.cnot(qubit_index - 1, qubit_index)
+                elif gate == GateType.T_GATE:
+                    raise ValueError("T gates cannot be simulated on a stabilizer tableau")
+
+    def _rowsum(self, targets: ndarray, source: int) -> None:
+        """Multiply each target row by the source row, tracking the phase (the AG rowsum)."""
+        x1, z1 = self.x[source].astype(np.int8), self.z[source].astype(np.int8)
+        x2, z2 = self.x[targets].astype(np.int8), self.z[targets].astype(np.int8)
+        # Exponent of i picked up qubit by qubit when multiplying the Paulis
+        phase = (
+            x1 * z1 * (z2 - x2)
+            + x1 * (1 - z1) * z2 * (2 * x2 - 1)
+            + (1 - x1) * z1 * x2 * (1 - 2 * z2)
+        ).sum(axis=1)
+        total = 2 * self.r[targets].astype(np.int64) + 2 * int(self.r[source]) + phase
+        self.r[targets] = (total % 4 == 2).astype(np.uint8)
+        self.x[targets] ^= self.x[source]
+        self.z[targets] ^= self.z[source]
+
+    def basis_probability(self, index: int) -> float:
+        """Probability of measuring basis state index, by forcing each qubit's Z outcome."""
+        outcomes = ((index >> np.arange(self.num_qubits)) & 1).astype(np.uint8)
+        return self._measure(outcomes)[0]
+
+    def support_state(self) -> ndarray:
+        """Bits (n,) of a basis state with non-zero amplitude: random outcomes are taken as 0."""
+        return self._measure(None)[1]
+
+    def _measure(self, outcomes: ndarray | None) -> tuple[float, ndarray]:
+        """Measure every qubit in Z on a copy, forcing outcomes where given.
+
+        Returns the probability of the resulting bits, 0.0 (and the bits so
+        far) as soon as a deterministic outcome contradicts outcomes.
+        """
+        tableau = self.copy()
+        num_qubits = self.num_qubits
+        scratch = 2 * num_qubits
+        probability = 1.0
+        bits = np.zeros(num_qubits, dtype=np.uint8)
+        for qubit in range(num_qubits):
+            anticommuting = np.flatnonzero(tableau.x[num_qubits:scratch, qubit])
+            if len(anticommuting):
+                # Random outcome: each value has probability 1/2; collapse onto the wanted one
+                bits[qubit] = 0 if outcomes is None else outcomes[qubit]
+                pivot = num_qubits + int(anticommuting[0])
+                rows = np.flatnonzero(tableau.x[:scratch, qubit])
+                tableau._rowsum(rows[rows != pivot], pivot)
+                destabilizer = pivot - num_qubits
+                tableau.x[destabilizer], tableau.z[destabilizer] = tableau.x[pivot], tableau.z[pivot]
+                tableau.r[destabilizer] = tableau.r[pivot]
+                tableau.x[pivot] = 0
+                tableau.z[pivot] = 0
+                tableau.z[pivot, qubit] = 1
+                tableau.r[pivot] = bits[qubit]
+                probability *= 0.5
+            else:
+                # Deterministic outcome: the product of the stabilizers paired with
+                # destabilizers that anticommute with Z_qubit is +-Z_qubit
+                tableau.x[scratch] = 0
+                tableau.z[scratch] = 0
+                tableau.r[scratch] = 0
+                for destabilizer in np.flatnonzero(tableau.x[:num_qubits, qubit]):
+                    tableau._rowsum(np.array([scratch]), num_qubits + int(destabilizer))
+                bits[qubit] = tableau.r[scratch]
+                if outcomes is not None and bits[qubit] != outcomes[qubit]:
+                    return 0.0, bits
+        return probability, bits
+
+    def relative_amplitudes(self, basis_bits: ndarray) -> ndarray:
+        """Amplitudes of the (Q, n) basis states, all up to one shared global phase.
+
+        A reference state y0 from support_state() gets the real amplitude
+        2^(-k/2), k being the rank of the stabilizers' X parts. Another
+        state y is in the support iff y ^ y0 is a product x of those X
+        parts; the stabilizer S = i^e X^x Z^z with that X part fixes the
+        state, so <y|psi> = i^e (-1)^(z.y0) <y0|psi>.
+        """
+        num_qubits = self.num_qubits
+        reference = self.support_state()
+        # Stabilizer generators in i^e X^x Z^z form; AG rows store Y as x = z = 1
+        x = self.x[num_qubits:2 * num_qubits].copy()
+        z = self.z[num_qubits:2 * num_qubits].copy()
+        e = (2 * self.r[num_qubits:2 * num_qubits].astype(np.int64) + np.sum(x & z, axis=1, dtype=np.int64)) % 4
+        # Gauss-Jordan on the X parts; row products keep the phase exact
+        generators = []
+        free = np.ones(num_qubits, dtype=bool)
+        for qubit in range(num_qubits):
+            candidates = np.flatnonzero(free & (x[:, qubit] == 1))
+            if not len(candidates):
+                continue
+            pivot = int(candidates[0])
+            free[pivot] = False
+            for k in np.flatnonzero(x[:, qubit]):
+                if k != pivot:
+                    e[k] = (e[k] + e[pivot] + 2 * np.count_nonzero(z[k] & x[pivot])) % 4
+                    x[k] ^= x[pivot]
+                    z[k] ^= z[pivot]
+            generators.append((pivot, qubit))
+
+        basis_bits = np.asarray(basis_bits, dtype=np.uint8)
+        remainder = basis_bits ^ reference
+        acc_z = np.zeros_like(basis_bits)
+        acc_e = np.zeros(len(basis_bits), dtype=np.int64)
+        for pivot, qubit in generators:
+            use = remainder[:, qubit] == 1
+            acc_e[use] += e[pivot] + 2 * np.count_nonzero(acc_z[use] & x[pivot], axis=1)
+            acc_z[use] ^= z[pivot]
+            remainder[use] ^= x[pivot]
+        in_support = ~remainder.any(axis=1)
+        phase = 1j ** (acc_e % 4) * (-1.0) ** ((acc_z.astype(np.int64) @ reference.astype(np.int64)) % 2)
+        return np.where(in_support, phase * 2.0 ** (-len(generators) / 2), 0.0)
+
+
+def _conjugate_paulis(x: ndarray, z: ndarray, e: ndarray, gate: int, qubit_index: int, num_qubits: int) -> None:
+    """Conjugate (m, n) Paulis i^e X^x Z^z in place by one Clifford gate-array cell."""
+    if gate == GateType.HADAMARD:
+        e += 2 * (x[:, qubit_index] & z[:, qubit_index])
+        x[:, qubit_index], z[:, qubit_index] = z[:, qubit_index].copy(), x[:, qubit_index].copy()
+        return
+    if gate == GateType.CNOT_DOWN and qubit_index + 1 < num_qubits:
+        control, target = qubit_index, qubit_index + 1
+    elif gate == GateType.CNOT_UP and qubit_index > 0:
+        control, target = qubit_index - 1, qubit_index
+    else:
+        return
+    x[:, target] ^= x[:, control]
+    z[:, control] ^= z[:, target]
+
+
+def t_count(gate_array: ndarray) -> int:
+    """Number of T gates in gate_array."""
+    return int(np.count_nonzero(np.asarray(gate_array) == GateType.T_GATE))
+
+
+def stabilizer_rank_marked_probability(
+    input_state: ndarray,
+    num_qubits: int,
+    gate_array: ndarray,
+    marked_index: int,
+) -> float:
+    """P(marked_index) for any gate array, in O(2^t) stabilizer amplitudes for t T gates.
+
+    The Clifford part of the circuit (T gates dropped) is run on a tableau.
+    Each T gate's Z term is conjugated through the gates after it into a
+    Pauli Q_j, so the 2^t-term expansion is sum_b c_b Q_b |phi> with Q_b
+    the ordered product of the chosen Q_j.
+    """
+    gate_array = np.asarray(gate_array)
+    if is_clifford(gate_array):
+        return stabilizer_marked_probability(input_state, num_qubits, gate_array, marked_index)
+
+    # Pauli frames of the T gates, in time order; rows past seen are not yet live
+    num_t = t_count(gate_array)
+    frame_x = np.zeros((num_t, num_qubits), dtype=np.uint8)
+    frame_z = np.zeros((num_t, num_qubits), dtype=np.uint8)
+    frame_e = np.zeros(num_t, dtype=np.int64)
+    seen = 0
+    for row in gate_array.tolist():
+        for qubit_index, gate in enumerate(row):
+            if gate == GateType.T_GATE:
+                frame_z[seen, qubit_index] = 1
+                seen += 1
+            elif seen:
+                _conjugate_paulis(frame_x[:seen], frame_z[:seen], frame_e[:seen], gate, qubit_index, num_qubits)
+
+    tableau = StabilizerTableau.from_input_state(input_state, num_qubits)
+    tableau.apply_gate_array(np.where(gate_array == GateType.T_GATE, GateType.IDENTITY, gate_array))
+
+    # Expand sum_b c_b Q_b; a later T's Pauli multiplies from the left
+    coefficients = np.ones(1, dtype=complex)
+    term_x = np.zeros((1, num_qubits), dtype=np.uint8)
+    term_z = np.zeros((1, num_qubits), dtype=np.uint8)
+    term_e = np.zeros(1, dtype=np.int64)
+    for qx, qz, qe in zip(frame_x, frame_z, frame_e):
+        with_z_e = term_e + qe + 2 * ((term_x.astype(np.int64) @ qz.astype(np.int64)) % 2)
+        coefficients = np.concatenate([coefficients * _T_IDENTITY_WEIGHT, coefficients * _T_Z_WEIGHT])
+        term_x = np.concatenate([term_x, term_x ^ qx])
+        term_z = np.concatenate([term_z, term_z ^ qz])
+        term_e = np.concatenate([term_e, with_z_e])
+
+    # <m| i^e X^x Z^z |phi> = i^e (-1)^(z.(m^x)) <m^x|phi>
+    marked = ((marked_index >> np.arange(num_qubits)) & 1).astype(np.uint8)
+    shifted = term_x ^ marked
+    signs = (-1.0) ** ((term_z.astype(np.int64) * shifted).sum(axis=1) % 2)
+    amplitudes = tableau.relative_amplitudes(shifted)
+    amplitude = np.sum(coefficients * 1j ** (term_e % 4) * signs * amplitudes)
+    return float(abs(amplitude) ** 2)
+
+
+def stabilizer_marked_probability(
+    input_state: ndarray,
+    num_qubits: int,
+    gate_array: ndarray,
+    marked_index: int,
+) -> float:
+    """P(marked_index) after gate_array acts on initialise_statevector(input_state); gate_array must be T-free."""
+    tableau = StabilizerTableau.from_input_state(input_state, num_qubits)
+    tableau.apply_gate_array(gate_array)
+    return tableau.basis_probability(marked_index)
@@ -14,3 +14,7 @@ class StudyConfig:
     ])
     base_seed: int = 42
     qubit_counts: list[int] = field(default_factory=lambda: [3])
+    fitness_cache_entries: int | None = 100_000
+    num_workers: int = 1  # >1 fans trials out over a process pool
+    fitness_cache_path: str | None = None  # SQLite file for a persistent cache shared across runs
+    fitness_mode: str = "first"  # "mean" scores every input row of training-set problems
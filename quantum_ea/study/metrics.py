@@ -13,6 +13,16 @@ class TrialMetrics:
     wall_clock_seconds: float
     circuit_complexity: int
     fitness_history: list[float] = field(default_factory=list)
+    cache_hits: int = 0
+    cache_misses: int = 0
+    cache_evictions: int = 0
+    cache_disk_hits: int = 0
+    dedup_ratio: float = 0.0
+
+    @property
+    def cache_hit_rate(self) -> float:
+        lookups = self.cache_hits + self.cache_misses
+        return self.cache_hits / lookups if lookups else 0.0
 
     @property
     def convergence_eval(self) -> int:
@@ -41,6 +51,8 @@ class AggregatedMetrics:
     convergence_eval_std: float
     num_trials: int
     all_fitness_histories: list[list[float]] = field(default_factory=list)
+    cache_hit_rate_mean: float = 0.0
+    dedup_ratio_mean: float = 0.0
 
 
 def aggregate_trials(trials: list[TrialMetrics]) -> AggregatedMetrics:
@@ -64,4 +76,6 @@ def aggregate_trials(trials: list[TrialMetrics]) -> AggregatedMetrics:
         convergence_eval_std=float(np.std(convergences)),
         num_trials=len(trials),
         all_fitness_histories=[t.fitness_history for t in trials],
+        cache_hit_rate_mean=float(np.mean([t.cache_hit_rate for t in trials])),
+        dedup_ratio_mean=float(np.mean([t.dedup_ratio for t in trials])),
     )
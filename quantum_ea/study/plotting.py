@@ -138,7 +138,10 @@ def plot_complexity_comparison(aggregated: list[AggregatedMetrics], save_path: s
 
 def print_summary_table(aggregated: list[AggregatedMetrics]) -> None:
     """Print a text summary table."""
-    header = f"{'Problem':<20} {'Optimizer':<25} {'Fitness':>12} {'Time (s)':>12} {'Complexity':>12} {'Conv. Eval':>12}"
+    header = (
+        f"{'Problem':<20} {'Optimizer':<25} {'Fitness':>12} {'Time (s)':>12} "
+        f"{'Complexity':>12} {'Conv. Eval':>12} {'Cache hit':>10} {'Dedup':>8}"
+    )
     print(header)
     print("-" * len(header))
     for agg in sorted(aggregated, key=lambda a: (a.problem_name, a.optimizer_name)):
@@ -148,6 +151,8 @@ def print_summary_table(aggregated: list[AggregatedMetrics]) -> None:
             f"{agg.time_mean:>8.4f}±{agg.time_std:<4.3f}"
             f"{agg.complexity_mean:>8.1f}±{agg.complexity_std:<4.1f}"
             f"{agg.convergence_eval_mean:>8.1f}±{agg.convergence_eval_std:<4.1f}"
+            f"{agg.cache_hit_rate_mean:>10.1%}"
+            f"{agg.dedup_ratio_mean:>9.1%}"
         )
 
 
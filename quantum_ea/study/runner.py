@@ -1,11 +1,23 @@
 import json
+import random
 import time
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from dataclasses import asdict
+from typing import Callable, Iterator
 
 import numpy as np
 
-from quantum_ea.fitness import clear_fitness_cache
+from quantum_ea.fitness import (
+    clear_fitness_cache,
+    get_dedup_stats,
+    get_fitness_cache,
+    get_fitness_mode,
+    set_fitness_cache,
+    set_fitness_mode,
+)
+from quantum_ea.fitness_cache import FitnessCache, PersistentFitnessCache
 from quantum_ea.problems.definitions import (
     grover_problem,
     flip_problem,
@@ -14,6 +26,8 @@ from quantum_ea.problems.definitions import (
     deutsch_jozsa_problem,
     bernstein_vazirani_problem,
 )
+from quantum_ea.optimizers.base import OptimizerBase
+from quantum_ea.problems.base import ProblemDefinition
 from quantum_ea.study.config import StudyConfig
 from quantum_ea.study.metrics import TrialMetrics, AggregatedMetrics, aggregate_trials
 
@@ -26,51 +40,156 @@ _PROBLEM_FACTORIES = {
     "bernstein_vazirani": bernstein_vazirani_problem,
 }
 
+# (problem_name, problem, optimizer index into StudyConfig.optimizers, trial)
+_TrialTask = tuple[str, ProblemDefinition, int, int]
+
+# Per-process runner used by pool workers; created once by _init_worker
+_worker_runner: "ExperimentRunner | None" = None
+
+
+def _init_worker(config: StudyConfig) -> None:
+    global _worker_runner
+    _worker_runner = ExperimentRunner(config)
+    _worker_runner._configure_fitness()
+
+
+def _run_trial_in_worker(task: _TrialTask) -> TrialMetrics:
+    problem_name, problem, optimizer_index, trial = task
+    optimizer = _worker_runner.config.optimizers[optimizer_index]
+    metrics = _worker_runner._run_trial(problem_name, problem, optimizer, trial)
+    get_fitness_cache().flush()
+    return metrics
+
 
 class ExperimentRunner:
     def __init__(self, config: StudyConfig):
         self.config = config
 
+    def _configure_fitness(self) -> None:
+        if self.config.fitness_cache_path is not None:
+            cache = PersistentFitnessCache(
+                self.config.fitness_cache_path, max_entries=self.config.fitness_cache_entries,
+            )
+        else:
+            cache = FitnessCache(max_entries=self.config.fitness_cache_entries)
+        set_fitness_cache(cache)
+        set_fitness_mode(self.config.fitness_mode)
+
+    @contextmanager
+    def _configured_fitness(self) -> Iterator[None]:
+        """Install the study's fitness cache and mode for one run, then restore the previous ones.
+
+        A persistent cache is closed on the way out, so its database file is
+        released even when a trial raises.
+        """
+        previous_cache, previous_mode = get_fitness_cache(), get_fitness_mode()
+        self._configure_fitness()
+        cache = get_fitness_cache()
+        try:
+            yield
+        finally:
+            set_fitness_cache(previous_cache)
+            set_fitness_mode(previous_mode)
+            if isinstance(cache, PersistentFitnessCache):
+                cache.close()
+
+    def _run_trial(
+        self,
+        problem_name: str,
+        problem: ProblemDefinition,
+        optimizer: OptimizerBase,
+        trial: int,
+    ) -> TrialMetrics:
+        """Run one seeded trial on a fresh fitness cache and collect its metrics."""
+        seed = self.config.base_seed + trial
+        clear_fitness_cache()
+        get_dedup_stats().clear()
+
+        result = optimizer.optimize(
+            input_set=problem.input_set,
+            target_set=problem.target_set,
+            num_qubits=problem.num_qubits,
+            time_steps=problem.recommended_time_steps,
+            evaluation_budget=self.config.evaluation_budget,
+            seed=seed,
+        )
+
+        cache = get_fitness_cache()
+        cache_stats = cache.stats if cache is not None else None
+        return TrialMetrics(
+            problem_name=problem_name,
+            optimizer_name=optimizer.name,
+            trial=trial,
+            fitness=result.best_fitness,
+            total_evaluations=result.total_evaluations,
+            wall_clock_seconds=result.wall_clock_seconds,
+            circuit_complexity=result.circuit_complexity,
+            fitness_history=result.fitness_history,
+            cache_hits=cache_stats.hits if cache_stats else 0,
+            cache_misses=cache_stats.misses if cache_stats else 0,
+            cache_evictions=cache_stats.evictions if cache_stats else 0,
+            cache_disk_hits=cache_stats.disk_hits if cache_stats else 0,
+            dedup_ratio=get_dedup_stats().ratio,
+        )
+
+    def _build_problem(self, problem_name: str, num_qubits: int) -> ProblemDefinition:
+        """Build a problem with the global RNGs seeded from base_seed.
+
+        Training-set problems draw their inputs from the global RNGs, which
+        optimizers reseed; seeding here makes the instance independent of
+        what ran before, so sequential and parallel runs see the same one.
+        """
+        random.seed(self.config.base_seed)
+        np.random.seed(self.config.base_seed)
+        return _PROBLEM_FACTORIES[problem_name](num_qubits)
+
+    def _build_tasks(self, num_qubits: int) -> list[_TrialTask]:
+        tasks = []
+        for problem_name in self.config.problem_names:
+            problem = self._build_problem(problem_name, num_qubits)
+            for optimizer_index in range(len(self.config.optimizers)):
+                for trial in range(self.config.num_trials):
+                    tasks.append((problem_name, problem, optimizer_index, trial))
+        return tasks
+
+    def _execute(self, tasks: list[_TrialTask], describe: Callable[[int, _TrialTask], str]) -> Iterator[TrialMetrics]:
+        """Yield TrialMetrics for tasks in order, sequentially or over a process pool.
+
+        Every trial is seeded from base_seed + trial and starts on a cleared
+        fitness cache, so both modes produce the same metrics.
+        """
+        if self.config.num_workers <= 1:
+            for i, task in enumerate(tasks):
+                print(describe(i, task))
+                problem_name, problem, optimizer_index, trial = task
+                yield self._run_trial(problem_name, problem, self.config.optimizers[optimizer_index], trial)
+            get_fitness_cache().flush()
+            return
+
+        get_fitness_cache().flush()
+        with ProcessPoolExecutor(
+            max_workers=self.config.num_workers,
+            initializer=_init_worker,
+            initargs=(self.config,),
+        ) as pool:
+            for i, metrics in enumerate(pool.map(_run_trial_in_worker, tasks)):
+                print(f"{describe(i, tasks[i])} (done)")
+                yield metrics
+
+    def _describe_task(self, task: _TrialTask) -> str:
+        problem_name, _, optimizer_index, trial = task
+        return f"{problem_name} / {self.config.optimizers[optimizer_index].name} / trial {trial + 1}"
+
     def run(self) -> list[AggregatedMetrics]:
         all_trials: dict[tuple[str, str], list[TrialMetrics]] = defaultdict(list)
-        total_runs = len(self.config.problem_names) * len(self.config.optimizers) * self.config.num_trials
-        run_count = 0
+        tasks = self._build_tasks(self.config.num_qubits)
 
-        for problem_name in self.config.problem_names:
-            factory = _PROBLEM_FACTORIES[problem_name]
-            problem = factory(self.config.num_qubits)
+        def describe(i: int, task: _TrialTask) -> str:
+            return f"  [{i + 1}/{len(tasks)}] {self._describe_task(task)}"
 
-            for optimizer in self.config.optimizers:
-                for trial in range(self.config.num_trials):
-                    run_count += 1
-                    seed = self.config.base_seed + trial
-                    clear_fitness_cache()
-
-                    print(
-                        f"  [{run_count}/{total_runs}] "
-                        f"{problem_name} / {optimizer.name} / trial {trial + 1}"
-                    )
-
-                    result = optimizer.optimize(
-                        input_set=problem.input_set,
-                        target_set=problem.target_set,
-                        num_qubits=problem.num_qubits,
-                        time_steps=problem.recommended_time_steps,
-                        evaluation_budget=self.config.evaluation_budget,
-                        seed=seed,
-                    )
-
-                    metrics = TrialMetrics(
-                        problem_name=problem_name,
-                        optimizer_name=optimizer.name,
-                        trial=trial,
-                        fitness=result.best_fitness,
-                        total_evaluations=result.total_evaluations,
-                        wall_clock_seconds=result.wall_clock_seconds,
-                        circuit_complexity=result.circuit_complexity,
-                        fitness_history=result.fitness_history,
-                    )
-                    all_trials[(problem_name, optimizer.name)].append(metrics)
+        with self._configured_fitness():
+            for metrics in self._execute(tasks, describe):
+                all_trials[(metrics.problem_name, metrics.optimizer_name)].append(metrics)
 
         aggregated = []
         for key in all_trials:
@@ -95,6 +214,8 @@ class ExperimentRunner:
                 "convergence_eval_mean": agg.convergence_eval_mean,
                 "convergence_eval_std": agg.convergence_eval_std,
                 "num_trials": agg.num_trials,
+                "cache_hit_rate_mean": agg.cache_hit_rate_mean,
+                "dedup_ratio_mean": agg.dedup_ratio_mean,
             }
             data.append(d)
 
@@ -109,47 +230,21 @@ class ExperimentRunner:
         """
         results_by_qubits: dict[int, list[AggregatedMetrics]] = {}
 
-        for nq in self.config.qubit_counts:
-            print(f"\n--- Qubit count: {nq} ---")
-            all_trials: dict[tuple[str, str], list[TrialMetrics]] = defaultdict(list)
-
-            for problem_name in self.config.problem_names:
-                factory = _PROBLEM_FACTORIES[problem_name]
-                problem = factory(nq)
-
-                for optimizer in self.config.optimizers:
-                    for trial in range(self.config.num_trials):
-                        seed = self.config.base_seed + trial
-                        clear_fitness_cache()
-
-                        print(
-                            f"  {nq}q: {problem_name} / {optimizer.name} / trial {trial + 1}"
-                        )
-
-                        result = optimizer.optimize(
-                            input_set=problem.input_set,
-                            target_set=problem.target_set,
-                            num_qubits=problem.num_qubits,
-                            time_steps=problem.recommended_time_steps,
-                            evaluation_budget=self.config.evaluation_budget,
-                            seed=seed,
-                        )
-
-                        metrics = TrialMetrics(
-                            problem_name=problem_name,
-                            optimizer_name=optimizer.name,
-                            trial=trial,
-                            fitness=result.best_fitness,
-                            total_evaluations=result.total_evaluations,
-                            wall_clock_seconds=result.wall_clock_seconds,
-                            circuit_complexity=result.circuit_complexity,
-                            fitness_history=result.fitness_history,
-                        )
-                        all_trials[(problem_name, optimizer.name)].append(metrics)
-
-            aggregated = []
-            for key in all_trials:
-                aggregated.append(aggregate_trials(all_trials[key]))
-            results_by_qubits[nq] = aggregated
+        with self._configured_fitness():
+            for nq in self.config.qubit_counts:
+                print(f"\n--- Qubit count: {nq} ---")
+                all_trials: dict[tuple[str, str], list[TrialMetrics]] = defaultdict(list)
+                tasks = self._build_tasks(nq)
+
+                def describe(i: int, task: _TrialTask) -> str:
+                    return f"  {nq}q: {self._describe_task(task)}"
+
+                for metrics in self._execute(tasks, describe):
+                    all_trials[(metrics.problem_name, metrics.optimizer_name)].append(metrics)
+
+                aggregated = []
+                for key in all_trials:
+                    aggregated.append(aggregate_trials(all_trials[key]))
+                results_by_qubits[nq] = aggregated
 
         return results_by_qubits
@@ -0,0 +1,12 @@
+import pytest
+
+from quantum_ea.fitness import get_fitness_cache, set_fitness_cache
+
+
+@pytest.fixture
+def no_fitness_cache():
+    """Disable the fitness cache, so every score comes from the backend under test."""
+    previous = get_fitness_cache()
+    set_fitness_cache(None)
+    yield
+    set_fitness_cache(previous)
@@ -0,0 +1,46 @@
+import numpy as np
+
+from quantum_ea.optimizers.array_ga import flip_mutation, tournament_select, two_point_crossover
+
+
+def test_tournament_of_whole_population_picks_best():
+    rng = np.random.default_rng(0)
+    fitness = np.array([0.1, 0.9, 0.3, 0.5])
+    winners = tournament_select(fitness, tournament_size=50, rng=rng)
+    assert np.all(winners == 1)
+
+
+def test_tournament_winner_beats_or_ties_aspirants():
+    rng = np.random.default_rng(1)
+    fitness = rng.random(200)
+    winners = tournament_select(fitness, tournament_size=3, rng=rng)
+    assert len(winners) == 200
+    assert fitness[winners].mean() > fitness.mean()
+
+
+def test_two_point_crossover_swaps_one_contiguous_segment():
+    rng = np.random.default_rng(2)
+    population = np.vstack([np.zeros((1, 12)), np.ones((1, 12))]).astype(np.uint8)
+    changed = two_point_crossover(population, crossover_probability=1.0, rng=rng)
+    assert changed.all()
+    assert np.all(population[0] + population[1] == 1)
+    swapped = np.flatnonzero(population[0])
+    assert 0 < len(swapped) < 12
+    assert np.all(np.diff(swapped) == 1)
+
+
+def test_two_point_crossover_without_mating_leaves_population():
+    rng = np.random.default_rng(3)
+    population = rng.integers(0, 5, size=(6, 10), dtype=np.uint8)
+    original = population.copy()
+    changed = two_point_crossover(population, crossover_probability=0.0, rng=rng)
+    assert not changed.any()
+    assert np.array_equal(population, original)
+
+
+def test_flip_mutation_matches_mut_flip_bit():
+    rng = np.random.default_rng(4)
+    population = np.array([[0, 1, 2, 3, 4]], dtype=np.uint8)
+    mutated = flip_mutation(population, mutation_probability=1.0, gene_probability=1.0, rng=rng)
+    assert mutated.all()
+    assert population.tolist() == [[1, 0, 0, 0, 0]]
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from quantum_ea.circuit import apply_quantum_gates, compute_probabilities, initialise_statevector
+from quantum_ea.fitness import SIMULATION_BACKENDS, marked_state_probability, run_quantum_algorithm_over_set
+from quantum_ea.gates import GateType, preprocess_gates_batch
+from quantum_ea.mps import mps_marked_probability
+from quantum_ea.problems.definitions import flip_problem
+from quantum_ea.sparse import sparse_marked_probability
+from quantum_ea.stabilizer import stabilizer_marked_probability
+
+CLIFFORD_GATES = [GateType.IDENTITY, GateType.HADAMARD, GateType.CNOT_DOWN, GateType.CNOT_UP]
+
+
+def _gate_types(backend):
+    return CLIFFORD_GATES if backend == "stabilizer" else list(GateType)
+
+
+@pytest.mark.parametrize("backend", SIMULATION_BACKENDS)
+@pytest.mark.parametrize("num_qubits", [1, 2, 3, 4])
+def test_basis_probabilities_match_statevector(backend, num_qubits):
+    rng = np.random.default_rng(num_qubits)
+    for trial in range(20):
+        gate_array = rng.choice(_gate_types(backend), size=(8, num_qubits))
+        input_state = rng.integers(0, 2, num_qubits) if trial % 2 else np.zeros(num_qubits, dtype=int)
+        sv = apply_quantum_gates(initialise_statevector(input_state, num_qubits), num_qubits, gate_array)
+        expected = compute_probabilities(sv)
+        for index, target in enumerate(np.eye(2 ** num_qubits)):
+            probability = marked_state_probability(
+                input_state[np.newaxis], target[np.newaxis], num_qubits, gate_array, backend=backend,
+            )
+            assert probability == pytest.approx(expected[index], abs=1e-12)
+
+
+@pytest.mark.usefixtures("no_fitness_cache")
+@pytest.mark.parametrize("backend", SIMULATION_BACKENDS)
+@pytest.mark.parametrize("fitness_mode", ["first", "mean"])
+def test_backend_matches_statevector_over_set(backend, fitness_mode):
+    problem = flip_problem(num_qubits=3)
+    rng = np.random.default_rng(7)
+    for gate_array in preprocess_gates_batch(rng.choice(_gate_types(backend), size=(10, 6, 3))):
+        args = (problem.input_set, problem.target_set, 3, gate_array)
+        expected = run_quantum_algorithm_over_set(*args, fitness_mode=fitness_mode, backend="statevector")[0]
+        assert run_quantum_algorithm_over_set(*args, fitness_mode=fitness_mode, backend=backend)[0] == (
+            pytest.approx(expected, abs=1e-12)
+        )
+
+
+@pytest.mark.parametrize(
+    "marked_probability", [stabilizer_marked_probability, mps_marked_probability, sparse_marked_probability],
+)
+def test_ghz_state_on_forty_qubits(marked_probability):
+    # An all-zero input is the uniform superposition, so start from |1> on the last qubit instead;
+    # H and the CNOT chain then leave an equal superposition of indices 2^39 and 2^39 - 1
+    num_qubits = 40
+    input_state = np.zeros(num_qubits, dtype=int)
+    input_state[-1] = 1
+    gate_array = np.zeros((num_qubits, num_qubits), dtype=int)
+    gate_array[0, 0] = GateType.HADAMARD
+    gate_array[np.arange(1, num_qubits), np.arange(num_qubits - 1)] = GateType.CNOT_DOWN
+    assert marked_probability(input_state, num_qubits, gate_array, 2 ** (num_qubits - 1)) == pytest.approx(0.5)
+    assert marked_probability(input_state, num_qubits, gate_array, 2 ** (num_qubits - 1) - 1) == pytest.approx(0.5)
+    assert marked_probability(input_state, num_qubits, gate_array, 0) == 0.0
@@ -1,6 +1,16 @@
 import numpy as np
+import pytest
 
-from quantum_ea.circuit import initialise_statevector, apply_quantum_gates, compute_probabilities
+from quantum_ea.circuit import (
+    initialise_statevector,
+    apply_quantum_gates,
+    apply_quantum_gates_batch,
+    compute_probabilities,
+    compile_circuit,
+    run_program,
+    row_table,
+    ROW_TABLE_MAX_QUBITS,
+)
 from quantum_ea.gates import GateType
 
 
@@ -52,3 +62,96 @@ def test_probabilities_sum_to_one():
     sv_out = apply_quantum_gates(sv, num_qubits=3, gate_array=gate_array)
     probs = compute_probabilities(sv_out)
     assert np.isclose(np.sum(probs), 1.0)
+
+
+def test_strided_engine_matches_dense_amplitudes():
+    rng = np.random.default_rng(0)
+    for num_qubits in (1, 2, 3, 5):
+        gate_array = rng.integers(0, len(GateType), size=(8, num_qubits))
+        sv = initialise_statevector(np.zeros(num_qubits, dtype=int), num_qubits)
+        dense = apply_quantum_gates(sv, num_qubits, gate_array, engine="dense")
+        strided = apply_quantum_gates(sv, num_qubits, gate_array, engine="strided")
+        assert np.allclose(dense, strided, atol=1e-12)
+
+
+def test_strided_engine_does_not_mutate_input():
+    sv = initialise_statevector(np.array([0, 0]), num_qubits=2)
+    original = sv.copy()
+    apply_quantum_gates(sv, 2, np.array([[GateType.HADAMARD, GateType.CNOT_UP]]), engine="strided")
+    assert np.array_equal(sv, original)
+
+
+def test_unknown_engine_raises():
+    sv = initialise_statevector(np.array([0, 0]), num_qubits=2)
+    with pytest.raises(ValueError):
+        apply_quantum_gates(sv, 2, np.array([[0, 0]]), engine="nope")
+
+
+def test_apply_quantum_gates_batch_matches_single():
+    rng = np.random.default_rng(3)
+    num_qubits = 3
+    gate_arrays = rng.integers(0, len(GateType), size=(10, 5, num_qubits))
+    sv = initialise_statevector(np.array([1, 0, 0]), num_qubits)
+    batch = apply_quantum_gates_batch(np.tile(sv, (10, 1)), num_qubits, gate_arrays)
+    for i in range(10):
+        assert np.allclose(batch[i], apply_quantum_gates(sv, num_qubits, gate_arrays[i]), atol=1e-12)
+
+
+def test_compile_circuit_drops_identities_and_fuses_t_gates():
+    T, I, H = GateType.T_GATE, GateType.IDENTITY, GateType.HADAMARD
+    gates = np.array([[T, I], [T, I], [I, I], [T, H]])
+    program = compile_circuit(gates, num_qubits=2)
+    kinds = sorted(op[0] for op in program.ops)
+    assert kinds == ["phase", "unitary"]
+    phase = next(op for op in program.ops if op[0] == "phase")
+    assert phase[1] == 0
+    assert np.isclose(phase[2][1], np.exp(3j * np.pi / 4))
+
+
+def test_compile_circuit_cancels_repeated_cnots_and_hadamards():
+    cnot, hadamard, identity = GateType.CNOT_DOWN, GateType.HADAMARD, GateType.IDENTITY
+    gates = np.array([[cnot, identity], [cnot, identity], [hadamard, identity], [hadamard, identity]])
+    assert compile_circuit(gates, num_qubits=2).ops == ()
+
+
+def test_compiled_program_matches_dense_and_is_reusable():
+    rng = np.random.default_rng(3)
+    gates = rng.integers(0, len(GateType), size=(12, 4))
+    sv = initialise_statevector(np.array([0, 0, 0, 0]), num_qubits=4)
+    program = compile_circuit(gates, num_qubits=4)
+    expected = apply_quantum_gates(sv, 4, gates, engine="dense")
+    assert np.allclose(run_program(program, sv), expected)
+    assert np.allclose(run_program(program, sv), expected)
+    assert np.allclose(apply_quantum_gates(sv, 4, gates, engine="compiled"), expected)
+
+
+@pytest.mark.parametrize("num_qubits", [1, 2, 3, 4])
+def test_table_engine_matches_dense(num_qubits):
+    rng = np.random.default_rng(num_qubits)
+    gate_arrays = rng.integers(0, len(GateType), size=(6, 8, num_qubits))
+    sv = initialise_statevector(np.zeros(num_qubits, dtype=int), num_qubits)
+    stack = np.stack([sv, np.roll(sv * np.arange(len(sv)), 1)])
+    for gate_array in gate_arrays:
+        expected = apply_quantum_gates(stack, num_qubits, gate_array, engine="dense")
+        assert np.allclose(apply_quantum_gates(stack, num_qubits, gate_array, engine="table"), expected, atol=1e-12)
+
+
+@pytest.mark.parametrize("engine", ["strided", "table"])
+def test_batch_engines_match_single(engine):
+    rng = np.random.default_rng(5)
+    num_qubits = 3
+    gate_arrays = rng.integers(0, len(GateType), size=(10, 6, num_qubits))
+    sv = initialise_statevector(np.array([0, 1, 0]), num_qubits)
+    batch = apply_quantum_gates_batch(np.tile(sv, (10, 2, 1)), num_qubits, gate_arrays, engine=engine)
+    for i in range(10):
+        expected = apply_quantum_gates(sv, num_qubits, gate_arrays[i], engine="dense")
+        assert np.allclose(batch[i], expected[np.newaxis], atol=1e-12)
+
+
+def test_row_table_rows_are_unitary():
+    table = row_table(2)
+    assert table.shape == (len(GateType) ** 2, 4, 4)
+    products = table @ table.conj().transpose(0, 2, 1)
+    assert np.allclose(products, np.eye(4))
+    with pytest.raises(ValueError):
+        row_table(ROW_TABLE_MAX_QUBITS + 1)
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from quantum_ea.circuit import apply_quantum_gates_batch, initialise_statevector
+from quantum_ea.circuit_torch import _TORCH_AVAILABLE
+from quantum_ea.fitness import evaluate_population, set_fitness_cache
+from quantum_ea.fitness_cache import FitnessCache
+from quantum_ea.gates import GateType, preprocess_gates_batch
+from quantum_ea.problems.definitions import flip_problem, grover_problem
+
+pytestmark = pytest.mark.skipif(not _TORCH_AVAILABLE, reason="torch not installed")
+
+if _TORCH_AVAILABLE:
+    import torch
+
+    from quantum_ea.circuit_torch import apply_quantum_gates_torch, evaluate_population_torch, preprocess_gates_torch
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    set_fitness_cache(FitnessCache())
+    yield
+    set_fitness_cache(FitnessCache())
+
+
+def test_preprocess_matches_numpy():
+    raw = np.random.default_rng(0).integers(0, len(GateType), size=(20, 9, 4))
+    assert np.array_equal(preprocess_gates_torch(torch.as_tensor(raw)).numpy(), preprocess_gates_batch(raw))
+
+
+def test_apply_matches_numpy_batch():
+    num_qubits = 4
+    gates = preprocess_gates_batch(np.random.default_rng(1).integers(0, len(GateType), size=(16, 10, num_qubits)))
+    sv = np.tile(initialise_statevector(np.array([1, 0, 1, 0]), num_qubits), (16, 1))
+    expected = apply_quantum_gates_batch(sv, num_qubits, gates)
+    actual = apply_quantum_gates_torch(torch.as_tensor(sv), num_qubits, torch.as_tensor(gates)).numpy()
+    assert np.allclose(actual, expected)
+
+
+def test_cnot_ordering_matches_lsb_convention():
+    # CNOT_DOWN on qubit 0 with qubit 0 set flips qubit 1: |01> -> |11>
+    sv = torch.as_tensor(initialise_statevector(np.array([1, 0]), 2)).unsqueeze(0)
+    gates = torch.tensor([[[GateType.CNOT_DOWN, GateType.IDENTITY]]])
+    out = apply_quantum_gates_torch(sv, 2, gates)
+    assert np.allclose(out.abs().numpy()[0], [0, 0, 0, 1])
+
+
+@pytest.mark.parametrize("fitness_mode", ["first", "mean"])
+@pytest.mark.parametrize("problem", [grover_problem(3), flip_problem(3, 4)], ids=["grover", "flip"])
+def test_evaluate_population_matches_numpy(problem, fitness_mode):
+    raw = np.random.default_rng(2).integers(0, len(GateType), size=(24, 8, problem.num_qubits))
+    raw[0] = 0  # blank circuit exercises the penalty path
+    gates = preprocess_gates_batch(raw)
+    expected = evaluate_population(
+        problem.input_set, problem.target_set, problem.num_qubits, gates, fitness_mode=fitness_mode,
+    )
+    actual = evaluate_population_torch(
+        problem.input_set, problem.target_set, problem.num_qubits, torch.as_tensor(gates), fitness_mode=fitness_mode,
+    )
+    assert np.allclose(actual.numpy(), expected)
@@ -1,7 +1,19 @@
 import numpy as np
 import pytest
 
-from quantum_ea.fitness import run_quantum_algorithm, run_quantum_algorithm_over_set, count_blank_rows, clear_fitness_cache
+from quantum_ea.fitness import (
+    run_quantum_algorithm,
+    run_quantum_algorithm_over_set,
+    evaluate_population,
+    count_blank_rows,
+    clear_fitness_cache,
+    get_dedup_stats,
+    get_fitness_cache,
+    set_fitness_cache,
+    set_fitness_mode,
+)
+from quantum_ea.gates import preprocess_gates
+from quantum_ea.problems.definitions import grover_problem, flip_problem
 
 
 @pytest.fixture(autouse=True)
@@ -52,3 +64,123 @@ def test_fitness_caching():
 
     # Exact float equality proves cache hit (deterministic numpy, no stochastic shots)
     assert result1 == result2
+
+
+def test_evaluate_population_matches_single_circuit():
+    problem = grover_problem(num_qubits=3)
+    rng = np.random.default_rng(7)
+    gate_arrays = np.stack([preprocess_gates(g) for g in rng.integers(0, 5, size=(20, 6, 3))])
+
+    batch = evaluate_population(problem.input_set, problem.target_set, 3, gate_arrays)
+    clear_fitness_cache()
+    single = [
+        run_quantum_algorithm_over_set(problem.input_set, problem.target_set, 3, g)[0]
+        for g in gate_arrays
+    ]
+    assert batch.shape == (20,)
+    assert np.allclose(batch, single, atol=1e-12)
+
+
+def test_evaluate_population_applies_blank_row_penalty():
+    # H on every qubit undoes the uniform superposition -> P(|00>) = 1, one blank row
+    input_set = np.array([[0, 0]])
+    target_set = np.array([[1.0, 0.0, 0.0, 0.0]])
+    gate_arrays = np.array([[[2, 2], [0, 0]], [[2, 2], [1, 0]]])
+    scores = evaluate_population(input_set, target_set, 2, gate_arrays)
+    assert np.isclose(scores[0], 1.0 / 1.1)
+    assert np.isclose(scores[1], 1.0)
+
+
+def test_evaluate_population_scores_duplicates_once():
+    problem = grover_problem(num_qubits=3)
+    rng = np.random.default_rng(3)
+    distinct = np.stack([preprocess_gates(g) for g in rng.integers(0, 5, size=(4, 6, 3))])
+    gate_arrays = distinct[[0, 1, 0, 2, 3, 3, 1, 0]]
+    expected = evaluate_population(problem.input_set, problem.target_set, 3, distinct)
+
+    cache = get_fitness_cache()
+    set_fitness_cache(None)
+    stats = get_dedup_stats()
+    stats.clear()
+    try:
+        scores = evaluate_population(problem.input_set, problem.target_set, 3, gate_arrays)
+    finally:
+        set_fitness_cache(cache)
+    assert np.array_equal(scores, expected[[0, 1, 0, 2, 3, 3, 1, 0]])
+    assert stats.submitted == [8] and stats.unique == [4]
+    assert stats.ratios == [0.5]
+
+
+def test_equivalent_circuits_share_a_simulation_but_keep_their_penalty():
+    # Both circuits are H on both qubits; the second spreads them over two rows
+    input_set = np.array([[0, 0]])
+    target_set = np.array([[1.0, 0.0, 0.0, 0.0]])
+    packed = np.array([[2, 2], [0, 0]])
+    spread = np.array([[2, 0], [0, 2]])
+    cache = get_fitness_cache()
+    stats = get_dedup_stats()
+    stats.clear()
+    scores = evaluate_population(input_set, target_set, 2, np.stack([packed, spread]))
+    assert stats.unique == [1]
+    assert np.isclose(scores[0], 1.0 / 1.1)
+    assert np.isclose(scores[1], 1.0)
+
+    hits = cache.hits
+    assert run_quantum_algorithm_over_set(input_set, target_set, 2, spread)[0] == scores[1]
+    assert cache.hits == hits + 1
+
+
+def test_evaluate_population_empty():
+    scores = evaluate_population(np.array([[0, 0]]), np.array([[1.0, 0, 0, 0]]), 2, np.zeros((0, 3, 2), dtype=int))
+    assert scores.shape == (0,)
+
+
+def _per_row_mean(problem, gates):
+    scores = [
+        run_quantum_algorithm_over_set(
+            problem.input_set[k:k + 1], problem.target_set[k:k + 1], problem.num_qubits, gates,
+        )[0]
+        for k in range(len(problem.input_set))
+    ]
+    return np.mean(scores)
+
+
+def test_mean_mode_averages_over_all_input_rows():
+    problem = flip_problem(num_qubits=3, input_size=4)
+    rng = np.random.default_rng(5)
+    for engine in ("dense", "strided", "compiled"):
+        gates = preprocess_gates(rng.integers(0, 5, size=(8, 3)))
+        score = run_quantum_algorithm_over_set(
+            problem.input_set, problem.target_set, problem.num_qubits, gates, engine=engine, fitness_mode="mean",
+        )[0]
+        assert score == pytest.approx(_per_row_mean(problem, gates))
+
+
+def test_evaluate_population_mean_mode_matches_single_circuit():
+    problem = flip_problem(num_qubits=3, input_size=5)
+    rng = np.random.default_rng(6)
+    population = np.stack([preprocess_gates(rng.integers(0, 5, size=(8, 3))) for _ in range(6)])
+    batch = evaluate_population(
+        problem.input_set, problem.target_set, problem.num_qubits, population, fitness_mode="mean",
+    )
+    clear_fitness_cache()
+    for gates, score in zip(population, batch):
+        assert score == pytest.approx(_per_row_mean(problem, gates))
+
+
+def test_fitness_modes_use_separate_cache_entries():
+    problem = flip_problem(num_qubits=2, input_size=4)
+    gates = np.array([[2, 0], [0, 2]])
+    first = run_quantum_algorithm_over_set(problem.input_set, problem.target_set, 2, gates)[0]
+    set_fitness_mode("mean")
+    try:
+        mean = run_quantum_algorithm_over_set(problem.input_set, problem.target_set, 2, gates)[0]
+    finally:
+        set_fitness_mode("first")
+    assert mean == pytest.approx(_per_row_mean(problem, gates))
+    assert run_quantum_algorithm_over_set(problem.input_set, problem.target_set, 2, gates)[0] == first
+
+
+def test_unknown_fitness_mode_raises():
+    with pytest.raises(ValueError):
+        set_fitness_mode("median")
@@ -0,0 +1,137 @@
+import numpy as np
+import pytest
+
+from quantum_ea.fitness import (
+    run_quantum_algorithm_over_set,
+    evaluate_population,
+    get_fitness_cache,
+    set_fitness_cache,
+)
+from quantum_ea.fitness_cache import FitnessCache, PersistentFitnessCache
+from quantum_ea.problems.definitions import grover_problem
+
+
+@pytest.fixture
+def cache():
+    previous = get_fitness_cache()
+    cache = FitnessCache(max_entries=3)
+    set_fitness_cache(cache)
+    yield cache
+    set_fitness_cache(previous)
+
+
+@pytest.fixture
+def problem():
+    return grover_problem(num_qubits=2)
+
+
+def _gates(value: int) -> np.ndarray:
+    gate_array = np.zeros((3, 2), dtype=int)
+    gate_array[0, 0] = value
+    return gate_array
+
+
+def test_hits_and_misses_are_counted(cache, problem):
+    run_quantum_algorithm_over_set(problem.input_set, problem.target_set, 2, _gates(2))
+    run_quantum_algorithm_over_set(problem.input_set, problem.target_set, 2, _gates(2))
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+    assert cache.stats.hit_rate == 0.5
+
+
+def test_lru_eviction(cache, problem):
+    for value in (1, 2, 3):
+        run_quantum_algorithm_over_set(problem.input_set, problem.target_set, 2, _gates(value))
+    # Touch value 1 so value 2 becomes least recently used
+    run_quantum_algorithm_over_set(problem.input_set, problem.target_set, 2, _gates(1))
+    run_quantum_algorithm_over_set(problem.input_set, problem.target_set, 2, _gates(4))
+
+    assert len(cache) == 3
+    assert cache.stats.evictions == 1
+    assert cache.key(problem.input_set, problem.target_set, _gates(2)) not in cache
+    assert cache.key(problem.input_set, problem.target_set, _gates(1)) in cache
+
+
+def test_byte_cap():
+    cache = FitnessCache(max_entries=None, max_bytes=500)
+    for i in range(50):
+        cache.put(i.to_bytes(16, "little"), (float(i),))
+    assert cache.stats.approx_bytes <= 500
+    assert cache.stats.evictions > 0
+
+
+def test_key_is_scoped_per_problem(cache):
+    a = grover_problem(num_qubits=2, marked_item=1)
+    b = grover_problem(num_qubits=2, marked_item=2)
+    assert cache.key(a.input_set, a.target_set, _gates(2)) != cache.key(b.input_set, b.target_set, _gates(2))
+    assert len(cache.key(a.input_set, a.target_set, _gates(2))) == 16
+
+
+def test_equal_problems_share_keys(cache):
+    a = grover_problem(num_qubits=2)
+    b = grover_problem(num_qubits=2)
+    assert cache.key(a.input_set, a.target_set, _gates(2)) == cache.key(b.input_set, b.target_set, _gates(2))
+
+
+def test_batched_evaluation_shares_cache(cache, problem):
+    gate_arrays = np.stack([_gates(1), _gates(2)])
+    evaluate_population(problem.input_set, problem.target_set, 2, gate_arrays)
+    assert cache.stats.misses == 2
+    run_quantum_algorithm_over_set(problem.input_set, problem.target_set, 2, _gates(2))
+    assert cache.stats.hits == 1
+
+
+def test_clear_resets_stats(cache, problem):
+    run_quantum_algorithm_over_set(problem.input_set, problem.target_set, 2, _gates(2))
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.stats.lookups == 0
+
+
+def test_disabled_cache(problem):
+    previous = get_fitness_cache()
+    set_fitness_cache(None)
+    try:
+        score, = run_quantum_algorithm_over_set(problem.input_set, problem.target_set, 2, _gates(2))
+        scores = evaluate_population(problem.input_set, problem.target_set, 2, _gates(2)[np.newaxis])
+        assert np.isclose(score, scores[0])
+    finally:
+        set_fitness_cache(previous)
+
+
+class TestPersistentFitnessCache:
+    def test_entries_survive_reopen(self, tmp_path, problem):
+        path = str(tmp_path / "cache.sqlite")
+        first = PersistentFitnessCache(path)
+        key = first.key(problem.input_set, problem.target_set, _gates(2))
+        first.put(key, (0.25,))
+        first.close()
+
+        second = PersistentFitnessCache(path)
+        assert second.get(key) == (0.25,)
+        assert second.stats.disk_hits == 1
+        second.close()
+
+    def test_clear_keeps_disk_entries(self, tmp_path, problem):
+        cache = PersistentFitnessCache(str(tmp_path / "cache.sqlite"))
+        key = cache.key(problem.input_set, problem.target_set, _gates(2))
+        cache.put(key, (0.5,))
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.disk_entries() == 1
+        assert cache.get(key) == (0.5,)
+        cache.close()
+
+    def test_serves_fitness_evaluations(self, tmp_path, problem):
+        previous = get_fitness_cache()
+        cache = PersistentFitnessCache(str(tmp_path / "cache.sqlite"))
+        set_fitness_cache(cache)
+        try:
+            expected, = run_quantum_algorithm_over_set(problem.input_set, problem.target_set, 2, _gates(2))
+            cache.clear()
+            scores = evaluate_population(problem.input_set, problem.target_set, 2, _gates(2)[np.newaxis])
+            assert scores[0] == expected
+            assert cache.stats.disk_hits == 1
+        finally:
+            set_fitness_cache(previous)
+            cache.close()
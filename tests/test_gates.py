@@ -1,6 +1,17 @@
 import numpy as np
+import pytest
 
-from quantum_ea.gates import GateType, cnot_two_gate_operation, remove_redundant_gate_series, preprocess_gates
+from quantum_ea.gates import (
+    GateType,
+    cnot_two_gate_operation,
+    remove_redundant_gate_series,
+    preprocess_gates,
+    preprocess_gates_batch,
+    canonicalise_gates,
+    canonicalise_gates_batch,
+    canonical_hash,
+)
+from quantum_ea.circuit import apply_quantum_gates, initialise_statevector
 
 
 def test_gate_type_values():
@@ -72,3 +83,72 @@ def test_preprocess_gates_combines_operations():
     result = preprocess_gates(gate_array)
     expected = np.array([[0, 0], [0, 0]])
     assert np.array_equal(result, expected)
+
+
+@pytest.mark.parametrize("num_qubits", range(1, 7))
+@pytest.mark.parametrize("time_steps", [2, 3, 8, 15])
+def test_preprocess_gates_batch_matches_per_circuit(num_qubits, time_steps):
+    rng = np.random.default_rng(num_qubits * 100 + time_steps)
+    population = rng.integers(0, len(GateType), size=(200, time_steps, num_qubits))
+    batch = preprocess_gates_batch(population)
+    expected = np.stack([preprocess_gates(individual) for individual in population])
+    assert batch.dtype == expected.dtype
+    assert np.array_equal(batch, expected)
+
+
+@pytest.mark.parametrize("gate_array", [
+    [[0, 4, 4], [4, 4, 4]],         # chained CNOT_UP shifts
+    [[3, 3, 3, 3], [3, 3, 3, 3]],   # chained CNOT_DOWN kills
+    [[3, 4, 0], [3, 4, 0]],         # CNOT_UP after CNOT_DOWN
+    [[2, 2], [2, 2], [2, 2]],       # odd runs of Hadamards
+    [[1, 1], [1, 1]],               # T gates are never cancelled
+])
+def test_preprocess_gates_batch_edge_cases(gate_array):
+    gate_array = np.array(gate_array)
+    batch = preprocess_gates_batch(gate_array[np.newaxis])
+    assert np.array_equal(batch[0], preprocess_gates(gate_array))
+
+
+def test_preprocess_gates_batch_does_not_mutate():
+    population = np.array([[[3, 1, 0], [2, 2, 0]]])
+    original = population.copy()
+    preprocess_gates_batch(population)
+    assert np.array_equal(population, original)
+
+
+def test_preprocess_gates_batch_empty_population():
+    assert preprocess_gates_batch(np.zeros((0, 4, 3), dtype=int)).shape == (0, 4, 3)
+
+
+def test_canonicalise_gates_packs_commuting_gates_into_layers():
+    # H on qubit 1 commutes past the T on qubit 0; blank rows disappear
+    gate_array = np.array([[1, 0, 0], [0, 0, 0], [0, 2, 0], [3, 0, 0]])
+    expected = np.array([[1, 2, 0], [3, 0, 0]], dtype=np.uint8)
+    assert np.array_equal(canonicalise_gates(gate_array), expected)
+
+
+def test_canonical_hash_ignores_commuting_order_and_blank_rows():
+    a = np.array([[2, 0, 0], [0, 1, 0], [0, 0, 0]])
+    b = np.array([[0, 0, 0], [0, 1, 0], [2, 0, 0]])
+    c = np.array([[0, 1, 0], [0, 0, 0], [0, 2, 0]])
+    assert canonical_hash(a) == canonical_hash(b)
+    assert canonical_hash(a) != canonical_hash(c)
+    # Non-commuting gates keep their order
+    assert canonical_hash(np.array([[2, 0], [3, 0]])) != canonical_hash(np.array([[3, 0], [2, 0]]))
+
+
+def test_canonical_hash_is_stable():
+    assert canonical_hash(np.array([[2, 2], [3, 0]])) == 0x1D0494E618E28A45
+
+
+@pytest.mark.parametrize("num_qubits", [2, 3, 5])
+def test_canonicalise_gates_batch_matches_single_and_preserves_state(num_qubits):
+    rng = np.random.default_rng(num_qubits)
+    population = rng.integers(0, len(GateType), size=(100, 8, num_qubits))
+    batch = canonicalise_gates_batch(population)
+    sv = initialise_statevector(np.zeros(num_qubits, dtype=int), num_qubits)
+    for individual, normal_form in zip(population, batch):
+        single = canonicalise_gates(individual)
+        assert np.array_equal(normal_form[:len(single)], single)
+        assert not normal_form[len(single):].any()
+        assert np.allclose(apply_quantum_gates(sv, num_qubits, individual), apply_quantum_gates(sv, num_qubits, single))
@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from quantum_ea.fitness import run_quantum_algorithm_over_set
+from quantum_ea.gates import GateType, preprocess_gates
+from quantum_ea.incremental import IncrementalEvaluator
+from quantum_ea.problems.definitions import flip_problem, grover_problem
+
+
+pytestmark = pytest.mark.usefixtures("no_fitness_cache")
+
+
+@pytest.fixture
+def problem():
+    return grover_problem(num_qubits=3)
+
+
+def _random_gates(rng, time_steps, num_qubits):
+    return preprocess_gates(rng.integers(0, len(GateType), size=(time_steps, num_qubits)))
+
+
+def test_matches_full_simulation(problem):
+    rng = np.random.default_rng(0)
+    evaluator = IncrementalEvaluator(problem.input_set, problem.target_set, problem.num_qubits)
+    for _ in range(5):
+        gates = _random_gates(rng, 12, problem.num_qubits)
+        expected = run_quantum_algorithm_over_set(problem.input_set, problem.target_set, problem.num_qubits, gates)[0]
+        assert evaluator.evaluate(gates) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("checkpoint_interval", [1, 3])
+def test_child_resumes_from_first_changed_row(problem, checkpoint_interval):
+    rng = np.random.default_rng(1)
+    evaluator = IncrementalEvaluator(
+        problem.input_set, problem.target_set, problem.num_qubits, checkpoint_interval=checkpoint_interval,
+    )
+    parent = _random_gates(rng, 12, problem.num_qubits)
+    evaluator.evaluate(parent)
+
+    child = parent.copy()
+    child[10, 0] = GateType.HADAMARD if child[10, 0] != GateType.HADAMARD else GateType.T_GATE
+    expected = run_quantum_algorithm_over_set(problem.input_set, problem.target_set, problem.num_qubits, child)[0]
+    before = evaluator.rows_simulated
+    assert evaluator.evaluate(child, parent=parent) == pytest.approx(expected)
+    resumed_from = (10 // checkpoint_interval) * checkpoint_interval
+    assert evaluator.rows_simulated - before == 12 - resumed_from
+
+
+def test_unstored_parent_gains_checkpoints_through_child(problem):
+    rng = np.random.default_rng(2)
+    evaluator = IncrementalEvaluator(problem.input_set, problem.target_set, problem.num_qubits)
+    parent = _random_gates(rng, 12, problem.num_qubits)
+    first, second = parent.copy(), parent.copy()
+    first[11, 1] = (first[11, 1] + 1) % len(GateType)
+    second[11, 2] = (second[11, 2] + 1) % len(GateType)
+
+    evaluator.evaluate(first, parent=parent)
+    before = evaluator.rows_simulated
+    evaluator.evaluate(second, parent=parent)
+    assert evaluator.rows_simulated - before == 1
+
+
+def test_memory_bound_evicts_oldest(problem):
+    rng = np.random.default_rng(3)
+    state_bytes = 2 ** problem.num_qubits * 16
+    evaluator = IncrementalEvaluator(
+        problem.input_set, problem.target_set, problem.num_qubits, max_bytes=3 * 12 * state_bytes,
+    )
+    for _ in range(6):
+        evaluator.evaluate(_random_gates(rng, 12, problem.num_qubits))
+    assert evaluator.stored_bytes <= 3 * 12 * state_bytes
+
+
+def test_invalid_checkpoint_interval(problem):
+    with pytest.raises(ValueError):
+        IncrementalEvaluator(problem.input_set, problem.target_set, problem.num_qubits, checkpoint_interval=0)
+
+
+def test_mean_mode_resumes_all_input_rows():
+    problem = flip_problem(num_qubits=3, input_size=4)
+    rng = np.random.default_rng(4)
+    evaluator = IncrementalEvaluator(problem.input_set, problem.target_set, problem.num_qubits, fitness_mode="mean")
+    parent = _random_gates(rng, 10, problem.num_qubits)
+    child = parent.copy()
+    child[7, 1] = (child[7, 1] + 1) % len(GateType)
+    evaluator.evaluate(parent)
+    expected = run_quantum_algorithm_over_set(
+        problem.input_set, problem.target_set, problem.num_qubits, child, fitness_mode="mean",
+    )[0]
+    assert evaluator.evaluate(child, parent=parent) == pytest.approx(expected)
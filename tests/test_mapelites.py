@@ -1,6 +1,8 @@
 import numpy as np
 import pytest
 
+from quantum_ea.fitness import set_fitness_cache
+from quantum_ea.fitness_cache import FitnessCache
 from quantum_ea.optimizers.base import OptimizationResult
 from quantum_ea.optimizers.mapelites_optimizer import MAPElitesOptimizer
 from quantum_ea.problems.definitions import grover_problem
@@ -67,3 +69,16 @@ class TestMAPElitesOptimizer:
         )
         # With 500 evaluations we should fill at least a few cells
         assert len(opt.last_archive) >= 2
+
+    def test_incremental_evaluation_matches_full(self, simple_problem):
+        results = []
+        for incremental in (False, True):
+            set_fitness_cache(FitnessCache())
+            opt = MAPElitesOptimizer(depth_bins=5, density_bins=5, initial_population=20, incremental=incremental)
+            results.append(opt.optimize(
+                simple_problem.input_set, simple_problem.target_set,
+                simple_problem.num_qubits, simple_problem.recommended_time_steps,
+                evaluation_budget=150, seed=7,
+            ))
+        set_fitness_cache(FitnessCache())
+        assert np.allclose(results[0].fitness_history, results[1].fitness_history)
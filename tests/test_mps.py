@@ -0,0 +1,114 @@
+import numpy as np
+import pytest
+
+import quantum_ea.fitness as fitness
+from quantum_ea.circuit import apply_quantum_gates, initialise_statevector
+from quantum_ea.fitness import evaluate_population, get_mps_stats, run_quantum_algorithm_over_set, set_fitness_cache
+from quantum_ea.fitness_cache import FitnessCache
+from quantum_ea.gates import GateType, preprocess_gates_batch
+from quantum_ea.mps import MatrixProductState, bond_dimension_bound, mps_marked_probability
+from quantum_ea.problems.definitions import bernstein_vazirani_problem
+
+
+pytestmark = pytest.mark.usefixtures("no_fitness_cache")
+
+
+def _ghz_gate_array(num_qubits):
+    gate_array = np.zeros((num_qubits, num_qubits), dtype=int)
+    gate_array[0, 0] = GateType.HADAMARD
+    gate_array[np.arange(1, num_qubits), np.arange(num_qubits - 1)] = GateType.CNOT_DOWN
+    return gate_array
+
+
+def test_bond_dimensions_stay_within_the_bound():
+    num_qubits = 5
+    rng = np.random.default_rng(0)
+    for trial, gate_array in enumerate(rng.integers(0, len(GateType), size=(20, 8, num_qubits))):
+        input_state = rng.integers(0, 2, num_qubits) if trial % 2 else np.zeros(num_qubits, dtype=int)
+        state = MatrixProductState.from_input_state(input_state, num_qubits)
+        state.apply_gate_array(gate_array)
+        assert max(state.bond_dimensions) <= bond_dimension_bound(gate_array, num_qubits)
+        assert state.truncation_error == 0.0
+
+
+def test_ghz_chain_keeps_bond_dimension_two():
+    num_qubits = 40
+    gate_array = _ghz_gate_array(num_qubits)
+    state = MatrixProductState([np.array([1, 0])] * num_qubits)
+    state.apply_gate_array(gate_array)
+    assert state.bond_dimensions == [2] * (num_qubits - 1)
+    assert bond_dimension_bound(gate_array, num_qubits) == 2
+
+
+def test_bond_cap_truncates_and_renormalises():
+    num_qubits = 8
+    rng = np.random.default_rng(0)
+    gate_array = rng.integers(0, len(GateType), size=(20, num_qubits))
+    sv = apply_quantum_gates(initialise_statevector(np.zeros(num_qubits), num_qubits), num_qubits, gate_array)
+    state = MatrixProductState.from_input_state(np.zeros(num_qubits), num_qubits, max_bond=2)
+    state.apply_gate_array(gate_array)
+    amplitudes = np.array([state.amplitude(index) for index in range(2 ** num_qubits)])
+    assert max(state.bond_dimensions) == 2
+    assert state.truncation_error > 0.0
+    assert np.linalg.norm(amplitudes) == pytest.approx(1.0)
+    assert not np.allclose(amplitudes, sv)
+
+
+def test_auto_backend_uses_mps_for_wide_shallow_circuits():
+    num_qubits = 30
+    gate_array = _ghz_gate_array(num_qubits)
+    gate_array[-1, :] = GateType.T_GATE
+    assert fitness._backend_routes("auto", num_qubits, gate_array[np.newaxis])[0] == "mps"
+    # H turns qubit 0 of the uniform superposition into |0>, so the CNOTs act on |+> targets
+    input_state = np.zeros(num_qubits, dtype=int)
+    assert mps_marked_probability(input_state, num_qubits, gate_array, 0) == pytest.approx(2.0 ** (1 - num_qubits))
+    assert mps_marked_probability(input_state, num_qubits, gate_array, 1) == 0.0
+
+
+def test_auto_backend_skips_mps_when_the_bond_bound_exceeds_the_cap(monkeypatch):
+    rng = np.random.default_rng(3)
+    gate_arrays = preprocess_gates_batch(rng.integers(0, len(GateType), size=(10, 8, 6)))
+    bounds = np.array([bond_dimension_bound(gate_array, 6) for gate_array in gate_arrays])
+    # Make the MPS free, so only the bond cap can keep a circuit off it
+    monkeypatch.setattr(fitness, "STABILIZER_MIN_QUBITS", 6)
+    monkeypatch.setattr(fitness, "MPS_MAX_BOND", 1)
+    monkeypatch.setattr(fitness, "MPS_CELL_COST", 0)
+    monkeypatch.setattr(fitness, "MPS_CNOT_COST", 0)
+    routes = fitness._backend_routes("auto", 6, gate_arrays)
+    assert (bounds > 1).any()
+    assert not (routes[bounds > 1] == "mps").any()
+
+
+def test_mps_backend_flags_truncated_estimates(monkeypatch):
+    problem = bernstein_vazirani_problem(num_qubits=6)
+    rng = np.random.default_rng(3)
+    gate_arrays = preprocess_gates_batch(rng.integers(0, len(GateType), size=(10, 8, 6)))
+    expected = evaluate_population(problem.input_set, problem.target_set, 6, gate_arrays, backend="statevector")
+    monkeypatch.setattr(fitness, "MPS_MAX_BOND", 1)
+    stats = get_mps_stats()
+    stats.clear()
+    truncated = evaluate_population(problem.input_set, problem.target_set, 6, gate_arrays, backend="mps")
+    assert not np.allclose(truncated, expected, atol=1e-12)
+    assert stats.runs == len(gate_arrays)
+    assert 0 < stats.truncated <= stats.runs
+    assert stats.max_truncation_error > 0.0
+
+
+def test_truncated_scores_are_not_cached(monkeypatch):
+    problem = bernstein_vazirani_problem(num_qubits=6)
+    rng = np.random.default_rng(3)
+    gate_arrays = preprocess_gates_batch(rng.integers(0, len(GateType), size=(10, 8, 6)))
+    args = (problem.input_set, problem.target_set, 6)
+    expected = evaluate_population(*args, gate_arrays, backend="statevector")
+    monkeypatch.setattr(fitness, "MPS_MAX_BOND", 1)
+    set_fitness_cache(FitnessCache())
+    truncated = evaluate_population(*args, gate_arrays, backend="mps")
+    assert not np.allclose(truncated, expected, atol=1e-12)
+    assert np.allclose(evaluate_population(*args, gate_arrays, backend="statevector"), expected, atol=1e-12)
+
+    worst = np.argmax(np.abs(truncated - expected))
+    set_fitness_cache(FitnessCache())
+    estimate = run_quantum_algorithm_over_set(*args, gate_arrays[worst], backend="mps")[0]
+    exact = run_quantum_algorithm_over_set(*args, gate_arrays[worst], backend="statevector")[0]
+    assert estimate != pytest.approx(exact, abs=1e-12)
+    assert exact == pytest.approx(expected[worst], abs=1e-12)
@@ -0,0 +1,56 @@
+import random
+
+import numpy as np
+import pytest
+from deap import base
+
+from quantum_ea.gates import GateType
+from quantum_ea.operators import categorical_mutation, mut_categorical, register_mutation
+
+ALWAYS_HADAMARD = [[0, 0, 1, 0, 0]] * len(GateType)
+
+
+def test_mut_categorical_changes_every_selected_gene():
+    random.seed(0)
+    individual = [0, 1, 2, 3, 4] * 4
+    original = list(individual)
+    mutated, = mut_categorical(individual, indpb=1.0)
+    assert all(new != old for new, old in zip(mutated, original))
+    assert all(0 <= gene < len(GateType) for gene in mutated)
+
+
+def test_mut_categorical_reaches_every_gate_type():
+    random.seed(1)
+    seen = set()
+    for _ in range(200):
+        seen.update(mut_categorical([0], indpb=1.0)[0])
+    assert seen == {1, 2, 3, 4}
+
+
+def test_mut_categorical_follows_transition_weights():
+    random.seed(2)
+    mutated, = mut_categorical([0, 1, 3, 4], indpb=1.0, transition_weights=np.array(ALWAYS_HADAMARD, dtype=float))
+    assert mutated == [GateType.HADAMARD] * 4
+
+
+def test_register_mutation_validates():
+    toolbox = base.Toolbox()
+    with pytest.raises(ValueError):
+        register_mutation(toolbox, "gaussian", indpb=0.1)
+    with pytest.raises(ValueError):
+        register_mutation(toolbox, "categorical", indpb=0.1, transition_weights=[[1.0] * 5] * 4)
+    register_mutation(toolbox, "flip_bit", indpb=1.0)
+    assert toolbox.mutate([0, 2])[0] == [1, 0]
+
+
+def test_categorical_mutation_array():
+    rng = np.random.default_rng(3)
+    population = rng.integers(0, len(GateType), size=(50, 30), dtype=np.uint8)
+    original = population.copy()
+    mutated = categorical_mutation(population, mutation_probability=1.0, gene_probability=1.0, rng=rng)
+    assert mutated.all()
+    assert np.all(population != original)
+    assert population.max() < len(GateType)
+
+    categorical_mutation(population, 1.0, 1.0, rng, transition_weights=ALWAYS_HADAMARD)
+    assert np.all(population == GateType.HADAMARD)
@@ -1,11 +1,22 @@
 import numpy as np
 import pytest
 
+import quantum_ea.fitness as fitness
+import quantum_ea.optimizers.gradient_optimizer as gradient_optimizer
+from quantum_ea.circuit import _H2, _I2, _T2, _cnot_matrix, _full_single_qubit_gate, initialise_statevector
+from quantum_ea.fitness import run_quantum_algorithm_over_set
 from quantum_ea.optimizers.base import OptimizationResult
 from quantum_ea.optimizers.random_search import RandomSearchOptimizer
 from quantum_ea.optimizers.ea_optimizer import EAOptimizer
-from quantum_ea.optimizers.gradient_optimizer import GradientOptimizer
+from quantum_ea.optimizers.gradient_optimizer import (
+    GradientOptimizer,
+    _relaxed_fitness_and_grad,
+    _relaxed_fitness_and_grad_batch,
+    _relaxed_set_fitness_and_grad_batch,
+)
 from quantum_ea.optimizers.dl_optimizer import DLOptimizer, _TORCH_AVAILABLE
+from quantum_ea.optimizers.evaluation import EvaluationBackend, GateArrayEvaluator
+from quantum_ea.optimizers.nsga2_optimizer import NSGA2Optimizer
 from quantum_ea.problems.definitions import grover_problem
 
 
@@ -70,6 +81,98 @@ class TestEAOptimizer:
         assert result.wall_clock_seconds > 0
         assert len(result.fitness_history) > 0
 
+    def test_array_engine(self, simple_problem):
+        args = (
+            simple_problem.input_set, simple_problem.target_set,
+            simple_problem.num_qubits, simple_problem.recommended_time_steps,
+        )
+        r1 = EAOptimizer(population_size=20, engine="array").optimize(*args, evaluation_budget=100, seed=42)
+        r2 = EAOptimizer(population_size=20, engine="array").optimize(*args, evaluation_budget=100, seed=42)
+        assert r1.best_gate_array.shape == (simple_problem.recommended_time_steps, simple_problem.num_qubits)
+        assert 0.0 <= r1.best_fitness <= 1.0
+        assert r1.total_evaluations == 100
+        assert len(r1.fitness_history) == 5
+        assert r1.fitness_history == r2.fitness_history
+        assert np.array_equal(r1.best_gate_array, r2.best_gate_array)
+
+    def test_unknown_engine(self):
+        with pytest.raises(ValueError):
+            EAOptimizer(engine="gpu")
+
+    @pytest.mark.parametrize("engine", ["deap", "array"])
+    def test_flip_bit_mutation_still_available(self, simple_problem, engine):
+        result = EAOptimizer(population_size=10, engine=engine, mutation="flip_bit").optimize(
+            simple_problem.input_set, simple_problem.target_set,
+            simple_problem.num_qubits, simple_problem.recommended_time_steps,
+            evaluation_budget=40, seed=0,
+        )
+        assert 0.0 <= result.best_fitness <= 1.0
+        with pytest.raises(ValueError):
+            EAOptimizer(mutation="gaussian")
+
+
+class TestEvaluationBackend:
+    @pytest.mark.parametrize("kind", ["builtin", "thread", "process", "batched"])
+    def test_backends_agree(self, simple_problem, kind):
+        evaluator = GateArrayEvaluator(simple_problem.input_set, simple_problem.target_set, simple_problem.num_qubits)
+        rng = np.random.default_rng(0)
+        individuals = [list(row) for row in rng.integers(0, 5, size=(12, simple_problem.recommended_time_steps * 2))]
+        expected = [evaluator(ind) for ind in individuals]
+        with EvaluationBackend(kind, num_workers=2) as backend:
+            results = backend.map(evaluator, individuals)
+        assert np.allclose(results, expected, atol=1e-12)
+
+    def test_pool_reused_across_calls(self, simple_problem):
+        evaluator = GateArrayEvaluator(simple_problem.input_set, simple_problem.target_set, simple_problem.num_qubits)
+        individuals = [[2] * 20, [0] * 20, [1] * 20]
+        with EvaluationBackend("thread", num_workers=2) as backend:
+            backend.map(evaluator, individuals)
+            executor = backend._executor
+            backend.map(evaluator, individuals)
+            assert backend._executor is executor
+        assert backend._executor is None
+
+    def test_batched_sees_through_toolbox_partial(self, simple_problem, monkeypatch):
+        from deap import base
+        evaluator = GateArrayEvaluator(simple_problem.input_set, simple_problem.target_set, simple_problem.num_qubits)
+        toolbox = base.Toolbox()
+        toolbox.register("evaluate", evaluator)
+        calls = []
+        monkeypatch.setattr(evaluator, "batch", lambda items: calls.append(items) or [(0.0,)] * len(items))
+        with EvaluationBackend("batched") as backend:
+            backend.map(toolbox.evaluate, [[0] * 20, [1] * 20])
+        assert len(calls) == 1
+
+    def test_batched_falls_back_for_plain_functions(self):
+        with EvaluationBackend("batched") as backend:
+            assert backend.map(lambda x: x * 2, [1, 2, 3]) == [2, 4, 6]
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            EvaluationBackend("gpu")
+
+    @pytest.mark.parametrize("kind", ["thread", "batched"])
+    def test_ea_optimizer_backends_match(self, simple_problem, kind):
+        results = []
+        for backend in ("builtin", kind):
+            opt = EAOptimizer(population_size=10, evaluation_backend=backend, num_workers=2)
+            results.append(opt.optimize(
+                simple_problem.input_set, simple_problem.target_set,
+                simple_problem.num_qubits, simple_problem.recommended_time_steps,
+                evaluation_budget=60, seed=5,
+            ))
+        assert np.isclose(results[0].best_fitness, results[1].best_fitness)
+        assert np.allclose(results[0].fitness_history, results[1].fitness_history)
+
+    def test_nsga2_process_backend(self, simple_problem):
+        opt = NSGA2Optimizer(population_size=10, evaluation_backend="process", num_workers=2)
+        result = opt.optimize(
+            simple_problem.input_set, simple_problem.target_set,
+            simple_problem.num_qubits, simple_problem.recommended_time_steps,
+            evaluation_budget=40, seed=1,
+        )
+        assert 0.0 <= result.best_fitness <= 1.0
+
 
 class TestGradientOptimizer:
     def test_returns_valid_result(self, simple_problem):
@@ -85,6 +188,109 @@ class TestGradientOptimizer:
         assert result.total_evaluations > 0
         assert len(result.fitness_history) > 0
 
+    def test_relaxed_forward_matches_dense_mixture(self):
+        num_qubits, time_steps = 3, 2
+        eye = np.eye(2 ** num_qubits, dtype=complex)
+        logits = np.random.default_rng(1).standard_normal((time_steps, num_qubits, 5))
+        weights = np.exp(logits) / np.exp(logits).sum(axis=2, keepdims=True)
+        sv = initialise_statevector(np.array([0, 0, 0]), num_qubits)
+        fitness, _ = _relaxed_fitness_and_grad(logits, sv, marked_idx=5)
+        for t in range(time_steps):
+            for qi in range(num_qubits):
+                gates = [
+                    _full_single_qubit_gate(_I2, qi, num_qubits),
+                    _full_single_qubit_gate(_T2, qi, num_qubits),
+                    _full_single_qubit_gate(_H2, qi, num_qubits),
+                    _cnot_matrix(qi, qi + 1, num_qubits) if qi + 1 < num_qubits else eye,
+                    _cnot_matrix(qi - 1, qi, num_qubits) if qi > 0 else eye,
+                ]
+                sv = sum(w * g for w, g in zip(weights[t, qi], gates)) @ sv
+        assert fitness == pytest.approx(abs(sv[5]) ** 2)
+
+    def test_adjoint_gradient_matches_finite_differences(self):
+        num_qubits, time_steps = 2, 3
+        sv_init = initialise_statevector(np.array([1, 0]), num_qubits)
+        logits = np.random.default_rng(0).standard_normal((time_steps, num_qubits, 5))
+
+        _, grad = _relaxed_fitness_and_grad(logits, sv_init, marked_idx=2)
+        eps = 1e-6
+        numeric = np.zeros_like(logits)
+        for idx in np.ndindex(logits.shape):
+            shifted = logits.copy()
+            shifted[idx] += eps
+            plus, _ = _relaxed_fitness_and_grad(shifted, sv_init, marked_idx=2)
+            shifted[idx] -= 2 * eps
+            minus, _ = _relaxed_fitness_and_grad(shifted, sv_init, marked_idx=2)
+            numeric[idx] = (plus - minus) / (2 * eps)
+        assert np.allclose(grad, numeric, atol=1e-6)
+
+    def test_evaluations_are_objective_calls(self, simple_problem):
+        opt = GradientOptimizer(num_restarts=1)
+        result = opt.optimize(
+            simple_problem.input_set, simple_problem.target_set,
+            simple_problem.num_qubits, simple_problem.recommended_time_steps,
+            evaluation_budget=30, seed=0,
+        )
+        # With analytic gradients each L-BFGS-B function call is one evaluation
+        assert result.total_evaluations <= 31
+        assert len(result.fitness_history) == result.total_evaluations
+
+    def test_batched_relaxation_matches_single_restarts(self):
+        sv_init = initialise_statevector(np.array([0, 0, 0]), 3)
+        logits = np.random.default_rng(2).standard_normal((4, 3, 3, 5))
+        fitness, grad = _relaxed_fitness_and_grad_batch(logits, sv_init, marked_idx=6)
+        for r in range(4):
+            single_fitness, single_grad = _relaxed_fitness_and_grad(logits[r], sv_init, marked_idx=6)
+            assert fitness[r] == pytest.approx(single_fitness)
+            assert np.allclose(grad[r], single_grad)
+
+    @pytest.mark.parametrize("fitness_mode", ["first", "mean"])
+    def test_relaxed_objective_follows_fitness_mode(self, monkeypatch, fitness_mode):
+        input_set = np.array([[1, 0], [0, 1], [1, 1]])
+        target_set = np.eye(4)[[2, 1, 0]]
+        seen = []
+        relax = gradient_optimizer._relaxed_fitness_and_grad_batch
+
+        def recording_relax(logits, sv_init, marked_idx):
+            seen.append(marked_idx)
+            return relax(logits, sv_init, marked_idx)
+
+        monkeypatch.setattr(gradient_optimizer, "_relaxed_fitness_and_grad_batch", recording_relax)
+        monkeypatch.setattr(fitness, "_fitness_mode", fitness_mode)
+        GradientOptimizer(num_restarts=1).optimize(input_set, target_set, 2, 3, evaluation_budget=10, seed=0)
+        assert set(seen) == ({0, 1, 2} if fitness_mode == "mean" else {2})
+
+    def test_relaxed_set_objective_is_the_pair_mean(self):
+        sv_inits = np.stack([initialise_statevector(np.array(bits), 2) for bits in ([1, 0], [0, 1], [1, 1])])
+        marked = np.array([2, 1, 0])
+        logits = np.random.default_rng(5).standard_normal((2, 3, 2, 5))
+        fitness, grad = _relaxed_set_fitness_and_grad_batch(logits, sv_inits, marked)
+        singles = [_relaxed_fitness_and_grad_batch(logits, sv, idx) for sv, idx in zip(sv_inits, marked)]
+        assert np.allclose(fitness, np.mean([f for f, _ in singles], axis=0))
+        assert np.allclose(grad, np.mean([g for _, g in singles], axis=0))
+
+    @pytest.mark.parametrize("restart_mode", ["batched", "process"])
+    def test_restart_modes(self, simple_problem, restart_mode):
+        kwargs = dict(num_restarts=3)
+        args = (
+            simple_problem.input_set, simple_problem.target_set,
+            simple_problem.num_qubits, simple_problem.recommended_time_steps,
+        )
+        result = GradientOptimizer(restart_mode=restart_mode, num_workers=2, **kwargs).optimize(
+            *args, evaluation_budget=60, seed=4,
+        )
+        assert 0.0 <= result.best_fitness <= 1.0
+        assert len(result.fitness_history) == result.total_evaluations
+        assert np.all(np.diff(result.fitness_history) >= 0)
+        if restart_mode == "process":
+            sequential = GradientOptimizer(**kwargs).optimize(*args, evaluation_budget=60, seed=4)
+            assert result.fitness_history == sequential.fitness_history
+            assert np.array_equal(result.best_gate_array, sequential.best_gate_array)
+
+    def test_unknown_restart_mode(self):
+        with pytest.raises(ValueError):
+            GradientOptimizer(restart_mode="threads")
+
 
 @pytest.mark.skipif(not _TORCH_AVAILABLE, reason="torch not installed")
 class TestDLOptimizer:
@@ -101,6 +307,46 @@ class TestDLOptimizer:
         assert result.total_evaluations > 0
         assert len(result.fitness_history) > 0
 
+    def test_best_gates_match_best_fitness(self, simple_problem):
+        opt = DLOptimizer(batch_size=8, hidden_size=16)
+        result = opt.optimize(
+            simple_problem.input_set, simple_problem.target_set,
+            simple_problem.num_qubits, simple_problem.recommended_time_steps,
+            evaluation_budget=40, seed=1,
+        )
+        assert result.total_evaluations == 40
+        assert len(result.fitness_history) == 5
+        rescored = run_quantum_algorithm_over_set(
+            simple_problem.input_set, simple_problem.target_set, simple_problem.num_qubits, result.best_gate_array,
+        )[0]
+        assert rescored == pytest.approx(result.best_fitness)
+
+    def test_torch_simulator_matches_numpy(self, simple_problem):
+        args = (
+            simple_problem.input_set, simple_problem.target_set,
+            simple_problem.num_qubits, simple_problem.recommended_time_steps,
+        )
+        numpy_result = DLOptimizer(batch_size=8, hidden_size=16).optimize(*args, evaluation_budget=32, seed=3)
+        torch_optimizer = DLOptimizer(batch_size=8, hidden_size=16, simulator="torch")
+        torch_result = torch_optimizer.optimize(*args, evaluation_budget=32, seed=3)
+        assert np.allclose(torch_result.fitness_history, numpy_result.fitness_history)
+        assert np.array_equal(torch_result.best_gate_array, numpy_result.best_gate_array)
+
+    def test_thread_count_is_restored(self, simple_problem):
+        import torch
+        previous = torch.get_num_threads()
+        threads = 1 if previous > 1 else 2
+        DLOptimizer(batch_size=4, hidden_size=16, simulator="torch", num_threads=threads).optimize(
+            simple_problem.input_set, simple_problem.target_set,
+            simple_problem.num_qubits, simple_problem.recommended_time_steps,
+            evaluation_budget=8, seed=0,
+        )
+        assert torch.get_num_threads() == previous
+
+    def test_unknown_simulator(self):
+        with pytest.raises(ValueError):
+            DLOptimizer(simulator="gpu")
+
     def test_graceful_without_torch(self):
         """Test the fallback path when torch is absent (simulated)."""
         import quantum_ea.optimizers.dl_optimizer as mod
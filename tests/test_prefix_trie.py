@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from quantum_ea.circuit import apply_quantum_gates_batch, initialise_statevector, initialise_statevectors
+from quantum_ea.fitness import evaluate_population
+from quantum_ea.gates import GateType, preprocess_gates_batch
+from quantum_ea.optimizers import EAOptimizer
+from quantum_ea.prefix_trie import PrefixTrieEvaluator, apply_quantum_gates_trie
+from quantum_ea.problems.definitions import flip_problem, grover_problem
+
+
+pytestmark = pytest.mark.usefixtures("no_fitness_cache")
+
+
+def _population_with_shared_prefixes(rng, num_qubits, time_steps=8):
+    """Four parents, each followed by children that differ from it in the last two rows only."""
+    parents = rng.integers(0, len(GateType), size=(4, time_steps, num_qubits))
+    children = np.repeat(parents, 5, axis=0)
+    children[:, -2:] = rng.integers(0, len(GateType), size=(len(children), 2, num_qubits))
+    return preprocess_gates_batch(np.concatenate([parents, children]))
+
+
+def test_trie_matches_batch_simulation():
+    rng = np.random.default_rng(0)
+    gate_arrays = _population_with_shared_prefixes(rng, 3)
+    sv = initialise_statevector(np.array([0, 0, 0]), 3)
+    expected = apply_quantum_gates_batch(np.tile(sv, (len(gate_arrays), 1)), 3, gate_arrays)
+    final, rows_simulated = apply_quantum_gates_trie(sv, 3, gate_arrays)
+    assert np.allclose(final, expected, atol=1e-12)
+    # Each parent's first six rows are simulated once for it and its five children
+    assert rows_simulated <= 4 * 6 + len(gate_arrays) * 2
+    assert rows_simulated < gate_arrays.shape[0] * gate_arrays.shape[1]
+
+
+def test_trie_memory_cap_only_changes_sharing():
+    rng = np.random.default_rng(1)
+    gate_arrays = _population_with_shared_prefixes(rng, 3)
+    sv = initialise_statevectors(np.array([[0, 0, 0], [1, 0, 1]]), 3)
+    full, shared_rows = apply_quantum_gates_trie(sv, 3, gate_arrays)
+    capped, capped_rows = apply_quantum_gates_trie(sv, 3, gate_arrays, max_bytes=4 * sv.nbytes)
+    assert np.allclose(capped, full, atol=1e-12)
+    assert shared_rows <= capped_rows <= gate_arrays.shape[0] * gate_arrays.shape[1]
+
+
+@pytest.mark.parametrize("fitness_mode", ["first", "mean"])
+def test_evaluator_matches_evaluate_population(fitness_mode):
+    problem = flip_problem(num_qubits=3)
+    rng = np.random.default_rng(2)
+    gate_arrays = _population_with_shared_prefixes(rng, 3)
+    evaluator = PrefixTrieEvaluator(problem.input_set, problem.target_set, 3, fitness_mode=fitness_mode)
+    scores = evaluator.evaluate(gate_arrays)
+    expected = evaluate_population(problem.input_set, problem.target_set, 3, gate_arrays, fitness_mode=fitness_mode)
+    assert np.allclose(scores, expected, atol=1e-12)
+    assert evaluator.rows_requested == gate_arrays.shape[0] * gate_arrays.shape[1]
+    assert 0.0 < evaluator.row_savings < 1.0
+
+
+@pytest.mark.parametrize("engine", ["deap", "array"])
+def test_ea_optimizer_reports_row_savings(engine):
+    problem = grover_problem(num_qubits=3)
+    optimizer = EAOptimizer(population_size=20, engine=engine, prefix_trie_bytes=2**20)
+    result = optimizer.optimize(
+        problem.input_set, problem.target_set, problem.num_qubits,
+        problem.recommended_time_steps, evaluation_budget=100, seed=0,
+    )
+    assert 0.0 <= result.best_fitness <= 1.0
+    assert 0.0 < optimizer.row_savings < 1.0
@@ -4,24 +4,27 @@ import pytest
 from qiskit import QuantumCircuit
 from qiskit.quantum_info import Statevector
 
-from quantum_ea.circuit import initialise_statevector, apply_quantum_gates, compute_probabilities
+from quantum_ea.circuit import initialise_statevector, apply_quantum_gates, compute_probabilities, SIMULATION_ENGINES
 from quantum_ea.gates import GateType
 
 NUM_QUBITS = 3
 
+engines = pytest.mark.parametrize("engine", sorted(SIMULATION_ENGINES))
+
 
 def qiskit_probabilities(qc: QuantumCircuit) -> np.ndarray:
     return Statevector.from_instruction(qc).probabilities()
 
 
+@engines
 @pytest.mark.parametrize("qubit", range(NUM_QUBITS))
-def test_hadamard_each_qubit(qubit):
+def test_hadamard_each_qubit(qubit, engine):
     # Numpy path
     sv = initialise_statevector(np.zeros(NUM_QUBITS, dtype=int), NUM_QUBITS)
     gate_row = [GateType.IDENTITY] * NUM_QUBITS
     gate_row[qubit] = GateType.HADAMARD
     gate_array = np.array([gate_row])
-    numpy_probs = compute_probabilities(apply_quantum_gates(sv, NUM_QUBITS, gate_array))
+    numpy_probs = compute_probabilities(apply_quantum_gates(sv, NUM_QUBITS, gate_array, engine=engine))
 
     # Qiskit path: uniform superposition then extra H on qubit collapses it
     qc = QuantumCircuit(NUM_QUBITS)
@@ -32,12 +35,13 @@ def test_hadamard_each_qubit(qubit):
     assert np.allclose(numpy_probs, qiskit_probs, atol=1e-10)
 
 
-def test_t_gate_on_one_state():
+@engines
+def test_t_gate_on_one_state(engine):
     # Prepare |1> on qubit 0, apply T gate
     input_state = np.array([1, 0, 0])
     sv = initialise_statevector(input_state, NUM_QUBITS)
     gate_array = np.array([[GateType.T_GATE, GateType.IDENTITY, GateType.IDENTITY]])
-    numpy_probs = compute_probabilities(apply_quantum_gates(sv, NUM_QUBITS, gate_array))
+    numpy_probs = compute_probabilities(apply_quantum_gates(sv, NUM_QUBITS, gate_array, engine=engine))
 
     # Qiskit path
     qc = QuantumCircuit(NUM_QUBITS)
@@ -48,11 +52,12 @@ def test_t_gate_on_one_state():
     assert np.allclose(numpy_probs, qiskit_probs, atol=1e-10)
 
 
-def test_cnot_down():
+@engines
+def test_cnot_down(engine):
     # |01> on 2 qubits: qubit 0 is |1>, CNOT_DOWN control=0 target=1
     sv = initialise_statevector(np.array([1, 0]), 2)
     gate_array = np.array([[GateType.CNOT_DOWN, GateType.IDENTITY]])
-    numpy_probs = compute_probabilities(apply_quantum_gates(sv, 2, gate_array))
+    numpy_probs = compute_probabilities(apply_quantum_gates(sv, 2, gate_array, engine=engine))
 
     qc = QuantumCircuit(2)
     qc.x(0)
@@ -62,13 +67,14 @@ def test_cnot_down():
     assert np.allclose(numpy_probs, qiskit_probs, atol=1e-10)
 
 
-def test_cnot_up():
+@engines
+def test_cnot_up(engine):
     # |10> on 2 qubits: qubit 1 is |1>, CNOT_UP at index 1 means control=0, target=1
     # Wait — CNOT_UP at index i means control=i-1, target=i
     # So we need control qubit (i-1)=0 to be |1>
     sv = initialise_statevector(np.array([1, 0]), 2)
     gate_array = np.array([[GateType.IDENTITY, GateType.CNOT_UP]])
-    numpy_probs = compute_probabilities(apply_quantum_gates(sv, 2, gate_array))
+    numpy_probs = compute_probabilities(apply_quantum_gates(sv, 2, gate_array, engine=engine))
 
     # CNOT_UP at qubit 1: control=qubit0, target=qubit1
     qc = QuantumCircuit(2)
@@ -79,7 +85,8 @@ def test_cnot_up():
     assert np.allclose(numpy_probs, qiskit_probs, atol=1e-10)
 
 
-def test_bell_state():
+@engines
+def test_bell_state(engine):
     # H on qubit 0, then CNOT_DOWN from qubit 0 to qubit 1
     # Starting from |00>: H|0> = (|0>+|1>)/sqrt(2), CNOT -> (|00>+|11>)/sqrt(2)
     sv = initialise_statevector(np.array([0, 0]), 2)
@@ -92,7 +99,7 @@ def test_bell_state():
         [GateType.HADAMARD, GateType.IDENTITY],
         [GateType.CNOT_DOWN, GateType.IDENTITY],
     ])
-    numpy_probs = compute_probabilities(apply_quantum_gates(sv, 2, gate_array))
+    numpy_probs = compute_probabilities(apply_quantum_gates(sv, 2, gate_array, engine=engine))
 
     qc = QuantumCircuit(2)
     qc.h(0)
@@ -102,3 +109,31 @@ def test_bell_state():
     assert np.allclose(numpy_probs, qiskit_probs, atol=1e-10)
     # Bell state: 50% |00>, 50% |11>
     assert np.allclose(numpy_probs, [0.5, 0.0, 0.0, 0.5], atol=1e-10)
+
+
+@engines
+@pytest.mark.parametrize("seed", range(5))
+def test_random_circuit(seed, engine):
+    # Random 4-qubit circuit from a basis input, all gate types mixed
+    num_qubits = 4
+    rng = np.random.default_rng(seed)
+    gate_array = rng.integers(0, len(GateType), size=(6, num_qubits))
+    sv = initialise_statevector(np.array([1, 0, 1, 0]), num_qubits)
+    numpy_probs = compute_probabilities(apply_quantum_gates(sv, num_qubits, gate_array, engine=engine))
+
+    qc = QuantumCircuit(num_qubits)
+    qc.x(0)
+    qc.x(2)
+    for row in gate_array:
+        for qubit, gate in enumerate(row):
+            if gate == GateType.HADAMARD:
+                qc.h(qubit)
+            elif gate == GateType.T_GATE:
+                qc.t(qubit)
+            elif gate == GateType.CNOT_DOWN and qubit + 1 < num_qubits:
+                qc.cx(qubit, qubit + 1)
+            elif gate == GateType.CNOT_UP and qubit > 0:
+                qc.cx(qubit - 1, qubit)
+    qiskit_probs = qiskit_probabilities(qc)
+
+    assert np.allclose(numpy_probs, qiskit_probs, atol=1e-10)
@@ -0,0 +1,118 @@
+import numpy as np
+import pytest
+
+import quantum_ea.fitness as fitness
+from quantum_ea.circuit import apply_quantum_gates, initialise_statevector
+from quantum_ea.fitness import evaluate_population, run_quantum_algorithm, run_quantum_algorithm_over_set
+from quantum_ea.gates import GateType, preprocess_gates_batch
+from quantum_ea.problems.definitions import flip_problem, grover_problem
+from quantum_ea.sparse import SparseStatevector
+
+
+pytestmark = pytest.mark.usefixtures("no_fitness_cache")
+
+
+@pytest.mark.parametrize("num_qubits", [2, 3, 4])
+def test_matches_statevector_without_densifying(num_qubits):
+    # The default threshold densifies these small registers almost at once; 1.0 keeps them sparse throughout
+    rng = np.random.default_rng(num_qubits)
+    for gate_array in rng.integers(0, len(GateType), size=(10, 8, num_qubits)):
+        input_state = rng.integers(0, 2, num_qubits)
+        sv = apply_quantum_gates(initialise_statevector(input_state, num_qubits), num_qubits, gate_array)
+        state = SparseStatevector.from_input_state(input_state, num_qubits, density_threshold=1.0)
+        state.apply_gate_array(gate_array)
+        assert state.dense is None
+        assert np.allclose(state.to_dense(), sv, atol=1e-12)
+
+
+def test_stays_sparse_on_forty_qubits():
+    num_qubits = 40
+    input_state = np.zeros(num_qubits, dtype=int)
+    input_state[[0, 5]] = 1
+    gate_array = np.zeros((4, num_qubits), dtype=int)
+    gate_array[0, 0] = GateType.HADAMARD
+    gate_array[1, :-1] = GateType.CNOT_DOWN
+    gate_array[2, 0] = GateType.T_GATE
+    gate_array[3, 0] = GateType.HADAMARD
+    state = SparseStatevector.from_input_state(input_state, num_qubits)
+    state.apply_gate_array(gate_array)
+    assert state.dense is None
+    assert state.nnz == 4
+    assert sum(abs(state.amplitude(index)) ** 2 for index in state.indices) == pytest.approx(1.0)
+
+
+def test_hadamard_pairs_cancel_back_to_one_amplitude():
+    state = SparseStatevector.from_input_state(np.array([1, 0, 1]), 3, density_threshold=1.0)
+    state.apply_gate_array(np.array([[GateType.HADAMARD] * 3, [GateType.HADAMARD] * 3]))
+    assert state.nnz == 1
+    assert state.amplitude(0b101) == pytest.approx(1.0)
+
+
+def test_switches_to_dense_above_threshold():
+    state = SparseStatevector.from_input_state(np.array([1, 0, 0, 0]), 4, density_threshold=0.25)
+    state.apply_gate_array(np.array([[GateType.HADAMARD, GateType.HADAMARD, 0, 0]]))
+    assert state.dense is None and state.nnz == 4
+    state.apply_gate_array(np.array([[0, 0, GateType.HADAMARD, 0]]))
+    assert state.dense is not None and state.nnz == 16
+    assert state.amplitude(0b0111) == pytest.approx(-1 / np.sqrt(8))
+    assert state.amplitude(0b1000) == 0
+
+
+def test_switches_to_dense_within_a_row(monkeypatch):
+    num_qubits = 8
+    sizes = []
+    hadamard = SparseStatevector.hadamard
+
+    def recording_hadamard(state, qubit):
+        hadamard(state, qubit)
+        sizes.append(len(state.indices))
+
+    monkeypatch.setattr(SparseStatevector, "hadamard", recording_hadamard)
+    input_state = np.zeros(num_qubits, dtype=int)
+    input_state[0] = 1
+    gate_array = np.full((1, num_qubits), GateType.HADAMARD)
+    state = SparseStatevector.from_input_state(input_state, num_qubits, density_threshold=1 / 16)
+    state.apply_gate_array(gate_array)
+    # The fifth Hadamard passes 16 of 256 amplitudes; the last three act on the dense vector
+    assert sizes == [2, 4, 8, 16, 32]
+    expected = apply_quantum_gates(initialise_statevector(input_state, num_qubits), num_qubits, gate_array)
+    assert np.allclose(state.to_dense(), expected, atol=1e-12)
+
+
+def test_run_quantum_algorithm_sparse_engine():
+    input_state = np.array([1, 1, 0])
+    gate_array = np.array([[GateType.HADAMARD, GateType.T_GATE, 0], [GateType.CNOT_DOWN, GateType.CNOT_DOWN, 0]])
+    expected = run_quantum_algorithm(input_state, 3, gate_array, engine="strided")
+    assert np.allclose(run_quantum_algorithm(input_state, 3, gate_array, engine="sparse"), expected, atol=1e-12)
+
+
+def test_auto_backend_uses_sparse_only_for_basis_inputs():
+    num_qubits = 12
+    rng = np.random.default_rng(4)
+    raw = rng.choice([GateType.IDENTITY, GateType.T_GATE, GateType.CNOT_DOWN], size=(10, 12, num_qubits))
+    raw[:, 0, :2] = GateType.HADAMARD
+    gate_arrays = preprocess_gates_batch(raw)
+    routes = fitness._backend_routes("auto", num_qubits, gate_arrays, basis_inputs=True)
+    assert (routes == "sparse").all()
+    routes = fitness._backend_routes("auto", num_qubits, gate_arrays, basis_inputs=False)
+    assert not (routes == "sparse").any()
+
+    problem = flip_problem(num_qubits=num_qubits)
+    args = (problem.input_set, problem.target_set, num_qubits, gate_arrays)
+    expected = evaluate_population(*args, backend="statevector")
+    scores = evaluate_population(*args, backend="auto")
+    assert np.allclose(scores, expected, atol=1e-12)
+    # Grover starts from the uniform superposition, so its circuits never go sparse
+    assert not fitness._basis_inputs(grover_problem(num_qubits=3).input_set, 1)
+
+
+def test_small_basis_input_circuits_skip_the_cost_model(monkeypatch):
+    def unexpected(*args):
+        raise AssertionError("bond dimensions priced for a circuit the statevector always wins")
+
+    monkeypatch.setattr(fitness, "bond_dimension_bound", unexpected)
+    gate_arrays = preprocess_gates_batch(np.random.default_rng(0).integers(0, len(GateType), size=(10, 6, 3)))
+    assert (fitness._backend_routes("auto", 3, gate_arrays, basis_inputs=True) == "statevector").all()
+    problem = flip_problem(num_qubits=3)
+    args = (problem.input_set, problem.target_set, 3, gate_arrays[0])
+    assert run_quantum_algorithm_over_set(*args) == run_quantum_algorithm_over_set(*args, backend="statevector")
@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+import quantum_ea.fitness as fitness
+from quantum_ea.circuit import apply_quantum_gates, initialise_statevector
+from quantum_ea.fitness import evaluate_population, run_quantum_algorithm_over_set
+from quantum_ea.gates import GateType, preprocess_gates_batch
+from quantum_ea.problems.definitions import bernstein_vazirani_problem, flip_problem
+from quantum_ea.stabilizer import (
+    StabilizerTableau,
+    is_clifford,
+    stabilizer_rank_marked_probability,
+    t_count,
+)
+
+CLIFFORD_GATES = [GateType.IDENTITY, GateType.HADAMARD, GateType.CNOT_DOWN, GateType.CNOT_UP]
+
+
+pytestmark = pytest.mark.usefixtures("no_fitness_cache")
+
+
+def test_t_gates_are_rejected():
+    gate_array = np.array([[GateType.HADAMARD, GateType.T_GATE]])
+    assert not is_clifford(gate_array)
+    with pytest.raises(ValueError):
+        StabilizerTableau(2).apply_gate_array(gate_array)
+    problem = flip_problem(num_qubits=2)
+    with pytest.raises(ValueError):
+        run_quantum_algorithm_over_set(problem.input_set, problem.target_set, 2, gate_array, backend="stabilizer")
+
+
+def test_evaluate_population_routes_clifford_circuits(monkeypatch):
+    problem = bernstein_vazirani_problem(num_qubits=4)
+    rng = np.random.default_rng(3)
+    raw = rng.integers(0, len(GateType), size=(30, 6, 4))
+    raw[::2][raw[::2] == GateType.T_GATE] = GateType.IDENTITY
+    gate_arrays = preprocess_gates_batch(raw)
+    assert 0 < sum(is_clifford(g) for g in gate_arrays) < len(gate_arrays)
+    expected = evaluate_population(problem.input_set, problem.target_set, 4, gate_arrays, backend="statevector")
+    monkeypatch.setattr(fitness, "STABILIZER_MIN_QUBITS", 4)
+    scores = evaluate_population(problem.input_set, problem.target_set, 4, gate_arrays, backend="auto")
+    assert np.allclose(scores, expected, atol=1e-12)
+    with pytest.raises(ValueError):
+        evaluate_population(problem.input_set, problem.target_set, 4, gate_arrays, backend="clifford")
+
+
+@pytest.mark.parametrize("num_qubits", [2, 3, 4])
+def test_relative_amplitudes_match_statevector_up_to_global_phase(num_qubits):
+    rng = np.random.default_rng(10 + num_qubits)
+    basis = ((np.arange(2 ** num_qubits)[:, np.newaxis] >> np.arange(num_qubits)) & 1).astype(np.uint8)
+    for trial in range(10):
+        gate_array = rng.choice(CLIFFORD_GATES, size=(8, num_qubits))
+        input_state = rng.integers(0, 2, num_qubits) if trial % 2 else np.zeros(num_qubits, dtype=int)
+        sv = apply_quantum_gates(initialise_statevector(input_state, num_qubits), num_qubits, gate_array)
+        tableau = StabilizerTableau.from_input_state(input_state, num_qubits)
+        tableau.apply_gate_array(gate_array)
+        amplitudes = tableau.relative_amplitudes(basis)
+        reference = np.argmax(np.abs(amplitudes))
+        assert np.allclose(amplitudes * sv[reference] / amplitudes[reference], sv, atol=1e-12)
+
+
+def test_t_gates_on_thirty_qubits():
+    # H T T H on qubit 0 is H S H, which sends |0> to (1+i)/2 |0> + (1-i)/2 |1>
+    num_qubits = 30
+    gate_array = np.zeros((4, num_qubits), dtype=int)
+    gate_array[:, 0] = [GateType.HADAMARD, GateType.T_GATE, GateType.T_GATE, GateType.HADAMARD]
+    input_state = np.zeros(num_qubits, dtype=int)
+    input_state[1] = 1
+    assert t_count(gate_array) == 2
+    assert stabilizer_rank_marked_probability(input_state, num_qubits, gate_array, 0b10) == pytest.approx(0.5)
+    assert stabilizer_rank_marked_probability(input_state, num_qubits, gate_array, 0b11) == pytest.approx(0.5)
+    assert stabilizer_rank_marked_probability(input_state, num_qubits, gate_array, 0b00) == 0.0
+
+
+def test_auto_backend_picks_by_estimated_cost(monkeypatch):
+    problem = bernstein_vazirani_problem(num_qubits=4)
+    rng = np.random.default_rng(5)
+    raw = rng.choice(CLIFFORD_GATES, size=(20, 6, 4))
+    raw[:10, 0, 0] = GateType.T_GATE
+    raw[10:] = np.where(rng.random((10, 6, 4)) < 0.5, GateType.T_GATE, raw[10:])
+    gate_arrays = preprocess_gates_batch(raw)
+    monkeypatch.setattr(fitness, "STABILIZER_MIN_QUBITS", 4)
+    # 6 rows * 2^4 amplitudes against 3 * 4 * 2^t: the rank sum only pays off for t <= 3
+    mask = fitness._backend_routes("auto", 4, gate_arrays) == "stabilizer_rank"
+    assert np.array_equal(mask, [t_count(g) <= 3 for g in gate_arrays])
+    assert mask[:10].all() and not mask[10:].any()
+    expected = evaluate_population(problem.input_set, problem.target_set, 4, gate_arrays, backend="statevector")
+    for backend in ["auto", "stabilizer_rank"]:
+        scores = evaluate_population(problem.input_set, problem.target_set, 4, gate_arrays, backend=backend)
+        assert np.allclose(scores, expected, atol=1e-12)
@@ -5,10 +5,13 @@ import tempfile
 import numpy as np
 import pytest
 
+from quantum_ea.fitness import get_fitness_cache, get_fitness_mode, set_fitness_cache
+from quantum_ea.fitness_cache import FitnessCache, PersistentFitnessCache
 from quantum_ea.study.config import StudyConfig
 from quantum_ea.study.metrics import TrialMetrics, AggregatedMetrics, aggregate_trials
 from quantum_ea.study.runner import ExperimentRunner
 from quantum_ea.optimizers.random_search import RandomSearchOptimizer
+from quantum_ea.optimizers.ea_optimizer import EAOptimizer
 
 
 class TestTrialMetrics:
@@ -83,3 +86,93 @@ class TestExperimentRunner:
             assert data[0]["problem_name"] == "grover"
         finally:
             os.unlink(path)
+
+
+class TestCacheInstrumentation:
+    def test_trial_metrics_record_cache_stats(self):
+        config = StudyConfig(
+            num_qubits=2,
+            evaluation_budget=40,
+            num_trials=1,
+            optimizers=[EAOptimizer(population_size=10)],
+            problem_names=["grover"],
+            fitness_cache_entries=50,
+        )
+        results = ExperimentRunner(config).run()
+        # The final re-evaluation of the hall-of-fame individual is always a hit
+        assert 0.0 < results[0].cache_hit_rate_mean < 1.0
+
+    def test_persistent_cache_reused_across_runs(self, tmp_path):
+        config = StudyConfig(
+            num_qubits=2,
+            evaluation_budget=30,
+            num_trials=2,
+            optimizers=[RandomSearchOptimizer()],
+            problem_names=["grover"],
+            fitness_cache_path=str(tmp_path / "cache.sqlite"),
+        )
+        first = ExperimentRunner(config).run()
+        second = ExperimentRunner(config).run()
+        assert second[0].fitness_mean == first[0].fitness_mean
+        # Every circuit of the rerun was simulated by the first run
+        assert second[0].cache_hit_rate_mean == 1.0
+
+    def test_run_restores_the_previous_cache_and_closes_its_own(self, tmp_path, monkeypatch):
+        closed = []
+        close = PersistentFitnessCache.close
+        monkeypatch.setattr(PersistentFitnessCache, "close", lambda cache: (closed.append(cache), close(cache)))
+        previous = FitnessCache()
+        set_fitness_cache(previous)
+        config = StudyConfig(
+            num_qubits=2,
+            evaluation_budget=30,
+            num_trials=1,
+            optimizers=[RandomSearchOptimizer()],
+            problem_names=["grover"],
+            fitness_cache_path=str(tmp_path / "cache.sqlite"),
+        )
+        ExperimentRunner(config).run()
+        assert get_fitness_cache() is previous
+        assert len(closed) == 1 and closed[0].path == config.fitness_cache_path
+
+    def test_run_restores_the_previous_fitness_mode(self):
+        config = StudyConfig(
+            num_qubits=2,
+            evaluation_budget=20,
+            num_trials=1,
+            optimizers=[RandomSearchOptimizer()],
+            problem_names=["flip"],
+            fitness_mode="mean",
+        )
+        ExperimentRunner(config).run()
+        assert get_fitness_mode() == "first"
+
+
+class TestParallelRunner:
+    def _config(self, num_workers: int) -> StudyConfig:
+        return StudyConfig(
+            num_qubits=2,
+            evaluation_budget=40,
+            num_trials=3,
+            optimizers=[RandomSearchOptimizer(), EAOptimizer(population_size=10)],
+            problem_names=["grover", "flip"],
+            num_workers=num_workers,
+        )
+
+    def test_parallel_matches_sequential(self):
+        sequential = ExperimentRunner(self._config(num_workers=1)).run()
+        parallel = ExperimentRunner(self._config(num_workers=2)).run()
+
+        assert len(parallel) == len(sequential)
+        for seq, par in zip(sequential, parallel):
+            assert (par.problem_name, par.optimizer_name) == (seq.problem_name, seq.optimizer_name)
+            assert par.fitness_mean == seq.fitness_mean
+            assert par.complexity_mean == seq.complexity_mean
+            assert par.all_fitness_histories == seq.all_fitness_histories
+
+    def test_parallel_scaling(self):
+        config = self._config(num_workers=2)
+        config.qubit_counts = [2, 3]
+        results = ExperimentRunner(config).run_scaling()
+        assert sorted(results) == [2, 3]
+        assert all(agg.num_trials == 3 for agg in results[3])